@@ -65,6 +65,8 @@ class AppConfig:
         db_pool_size: 连接池大小。
         db_max_overflow: 连接池最大溢出连接数。
         db_pool_recycle: 连接回收时间（秒）。
+        fast_model_construct: 是否跳过可信数据的响应模型校验。
+        detection_max_inflight: 同时进行的钓鱼检测数量上限。
         api_key: API 密钥，仅从环境读取。
     """
 
@@ -88,6 +90,8 @@ class AppConfig:
     db_pool_size: int = 10
     db_max_overflow: int = 20
     db_pool_recycle: int = 3600
+    fast_model_construct: bool = True
+    detection_max_inflight: int = 8
     api_key: str | None = None
 
     def get_database_url(self) -> str:
@@ -142,6 +146,12 @@ class AppConfigLoader:
             db_pool_size=self._env_reader.get_int("DB_POOL_SIZE", 10),
             db_max_overflow=self._env_reader.get_int("DB_MAX_OVERFLOW", 20),
             db_pool_recycle=self._env_reader.get_int("DB_POOL_RECYCLE", 3600),
+            fast_model_construct=self._env_reader.get_bool(
+                "FAST_MODEL_CONSTRUCT", True
+            ),
+            detection_max_inflight=self._env_reader.get_int(
+                "DETECTION_MAX_INFLIGHT", 8
+            ),
             api_key=self._env_reader.get_str("API_KEY"),
         )
 
@@ -4,6 +4,7 @@ from app.core.config import AppConfig
 from app.core.database import DatabaseManager
 from app.crud.user_crud import UserCrud
 from app.crud.email_crud import EmailCrud
+from app.crud.email_body_crud import EmailBodyCrud
 from app.crud.email_account_crud import EmailAccountCrud
 from app.crud.email_sync_crud import EmailSyncCrud
 from app.crud.mailbox_crud import MailboxCrud
@@ -29,6 +30,7 @@ from app.utils.logging.logger_factory import LoggerFactory
 from app.utils.password_hasher import PasswordHasher
 from app.utils.validators import AuthValidator
 from app.utils.crypto.password_encryptor import PasswordEncryptor
+from app.utils.imap import ImapConnectionPool, SmtpConnectionPool
 from app.utils.phishing import (
     MLPhishingDetector,
     LongUrlDetector,
@@ -124,6 +126,15 @@ class AppContainer:
             self.email_crud_logger,
         )
 
+        # 邮件正文与检测结果CRUD（钓鱼检测与邮件服务需要）
+        self.email_body_crud_logger = self._logger_factory.create_crud_logger(
+            "app.crud.email_body", "邮件正文"
+        )
+        self.email_body_crud = EmailBodyCrud(
+            self.db_manager,
+            self.email_body_crud_logger,
+        )
+
         # 文件夹CRUD
         self.mailbox_crud_logger = self._logger_factory.create_crud_logger(
             "app.crud.mailbox", "邮箱文件夹"
@@ -147,18 +158,25 @@ class AppContainer:
             "app.services.phishing_detection"
         )
         self.phishing_detection_service = PhishingDetectionService(
-            self.email_crud,
+            self.email_body_crud,
             self.phishing_detector,
             self.phishing_event_service,
             self.url_whitelist_matcher,
             self.sender_whitelist_matcher,
             self.phishing_detection_logger,
+            max_inflight=self._config.detection_max_inflight,
         )
 
         # 服务层
         self.email_account_logger = self._logger_factory.create_logger(
             "app.services.email_account"
         )
+        self.imap_connection_pool = ImapConnectionPool(
+            logger=self._logger_factory.create_logger("app.utils.imap_pool")
+        )
+        self.smtp_connection_pool = SmtpConnectionPool(
+            logger=self._logger_factory.create_logger("app.utils.smtp_pool")
+        )
         self.email_account_service = EmailAccountService(
             self.email_account_crud,
             self.mailbox_crud,
@@ -166,6 +184,8 @@ class AppContainer:
             self.phishing_detector,
             self.phishing_detection_service,
             self.email_account_logger,
+            self.imap_connection_pool,
+            self.smtp_connection_pool,
         )
 
         # 路由层
@@ -184,9 +204,11 @@ class AppContainer:
         self.email_logger = self._logger_factory.create_logger("app.services.email")
         self.email_service = EmailService(
             self.email_crud,
+            self.email_body_crud,
             self.email_account_crud,
-            self.mailbox_crud,
             self.email_logger,
+            self.smtp_connection_pool,
+            fast_model_construct=self._config.fast_model_construct,
         )
 
         # 路由层
@@ -208,6 +230,8 @@ class AppContainer:
 
     async def close(self) -> None:
         """关闭容器中的资源。"""
+        await self.imap_connection_pool.close()
+        await self.smtp_connection_pool.close()
         await self.db_manager.close()
 
     def _init_whitelist_components(self) -> None:
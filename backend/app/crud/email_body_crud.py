@@ -0,0 +1,231 @@
+"""邮件正文与钓鱼检测结果数据访问层。"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from app.core.database import DatabaseManager
+from app.entities.email_body_entity import EmailBodyEntity
+from app.entities.email_entity import EmailEntity, PhishingLevel, PhishingStatus
+from app.entities.mailbox_message_entity import MailboxMessageEntity
+from app.utils.logging.crud_logger import CrudLogger
+
+
+class EmailBodyCrud:
+    """邮件正文与钓鱼检测CRUD操作类。
+
+    提供正文批量查询、检测所需数据的预加载查询与检测结果写入操作。
+    """
+
+    # 批量写入检测结果时每个事务提交的行数
+    _BULK_UPDATE_CHUNK_SIZE = 50
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        crud_logger: CrudLogger,
+    ) -> None:
+        """初始化邮件正文CRUD。
+
+        Args:
+            db_manager: 数据库管理器实例。
+            crud_logger: CRUD日志记录器。
+        """
+        self._db_manager = db_manager
+        self._crud_logger = crud_logger
+
+    async def get_bodies_by_message_ids(
+        self, message_ids: List[int]
+    ) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+        """批量获取邮件正文。
+
+        Args:
+            message_ids: 邮件元数据ID列表（email_messages表的id）。
+
+        Returns:
+            邮件元数据ID到 (纯文本正文, HTML正文) 的映射。
+        """
+        if not message_ids:
+            return {}
+
+        async with self._db_manager.get_session() as session:
+            query = select(
+                EmailBodyEntity.message_id,
+                EmailBodyEntity.content_text,
+                EmailBodyEntity.content_html,
+            ).where(EmailBodyEntity.message_id.in_(message_ids))
+            result = await session.execute(query)
+            bodies = {
+                message_id: (content_text, content_html)
+                for message_id, content_text, content_html in result.all()
+            }
+
+            self._crud_logger.log_read(
+                "批量查询邮件正文",
+                {"requested": len(message_ids), "count": len(bodies)},
+            )
+
+            return bodies
+
+    async def get_with_body_and_account(
+        self, mailbox_message_id: int
+    ) -> Optional[MailboxMessageEntity]:
+        """根据ID获取检测所需的邮件数据。
+
+        仅预加载钓鱼检测需要的邮件元数据、正文与邮箱账户，
+        不加载收件人与文件夹等无关关联。
+
+        Args:
+            mailbox_message_id: 邮箱文件夹邮件ID。
+
+        Returns:
+            邮箱文件夹邮件实体或None。
+        """
+        async with self._db_manager.get_session() as session:
+            query = (
+                select(MailboxMessageEntity)
+                .where(MailboxMessageEntity.id == mailbox_message_id)
+                .options(*self._detection_load_options())
+            )
+            result = await session.execute(query)
+            mailbox_message = result.scalar_one_or_none()
+
+            self._crud_logger.log_read(
+                "查询待检测邮件",
+                {
+                    "mailbox_message_id": mailbox_message_id,
+                    "found": bool(mailbox_message),
+                },
+            )
+
+            return mailbox_message
+
+    async def get_many_with_body_and_account(
+        self, mailbox_message_ids: List[int]
+    ) -> List[MailboxMessageEntity]:
+        """批量获取检测所需的邮件数据。
+
+        使用单条 ``WHERE id IN (...)`` 查询取回整批邮件，
+        并预加载邮件元数据、正文与邮箱账户。
+
+        Args:
+            mailbox_message_ids: 邮箱文件夹邮件ID列表。
+
+        Returns:
+            邮箱文件夹邮件实体列表（不保证与入参顺序一致）。
+        """
+        if not mailbox_message_ids:
+            return []
+
+        async with self._db_manager.get_session() as session:
+            query = (
+                select(MailboxMessageEntity)
+                .where(MailboxMessageEntity.id.in_(mailbox_message_ids))
+                .options(*self._detection_load_options())
+            )
+            result = await session.execute(query)
+            mailbox_messages = list(result.scalars().all())
+
+            self._crud_logger.log_read(
+                "批量查询待检测邮件",
+                {
+                    "requested": len(mailbox_message_ids),
+                    "count": len(mailbox_messages),
+                },
+            )
+
+            return mailbox_messages
+
+    @staticmethod
+    def _detection_load_options() -> tuple:
+        """构建钓鱼检测场景的预加载选项。
+
+        Returns:
+            SQLAlchemy加载选项元组。
+        """
+        return (
+            selectinload(MailboxMessageEntity.message).selectinload(EmailEntity.body),
+            selectinload(MailboxMessageEntity.message).selectinload(
+                EmailEntity.email_account
+            ),
+        )
+
+    async def update_phishing_result(
+        self,
+        message_id: int,
+        phishing_level: PhishingLevel,
+        phishing_score: float,
+        phishing_reason: Optional[str] = None,
+        phishing_status: PhishingStatus = PhishingStatus.COMPLETED,
+    ) -> bool:
+        """更新邮件的钓鱼检测结果。
+
+        Args:
+            message_id: 邮件消息ID（email_messages表的id）。
+            phishing_level: 钓鱼危险等级。
+            phishing_score: 钓鱼评分。
+            phishing_reason: 钓鱼判定原因。
+            phishing_status: 钓鱼检测状态。
+
+        Returns:
+            是否更新成功。
+        """
+        async with self._db_manager.get_session() as session:
+            query = select(EmailEntity).where(EmailEntity.id == message_id)
+            result = await session.execute(query)
+            email_message = result.scalar_one_or_none()
+
+            if not email_message:
+                return False
+
+            email_message.phishing_level = phishing_level
+            email_message.phishing_score = phishing_score
+            email_message.phishing_reason = phishing_reason
+            email_message.phishing_status = phishing_status
+            await session.flush()
+
+            self._crud_logger.log_update(
+                "更新钓鱼检测结果",
+                {
+                    "message_id": message_id,
+                    "phishing_level": phishing_level.value,
+                    "phishing_score": phishing_score,
+                    "phishing_status": phishing_status.value,
+                },
+            )
+
+            return True
+
+    async def bulk_update_phishing_results(
+        self, results: List[Dict[str, Any]]
+    ) -> int:
+        """批量更新邮件的钓鱼检测结果。
+
+        以主键为条件使用 executemany 写入检测结果，将逐封UPDATE的多次往返
+        合并为少量批次；每批单独提交，缩短大批量写入时的行锁持有时间。
+
+        Args:
+            results: 检测结果列表，每项包含 ``id``（email_messages表的id）、
+                ``phishing_level``、``phishing_score``、``phishing_reason``
+                与 ``phishing_status``。
+
+        Returns:
+            提交更新的记录数量。
+        """
+        if not results:
+            return 0
+
+        chunk_size = self._BULK_UPDATE_CHUNK_SIZE
+        for start in range(0, len(results), chunk_size):
+            async with self._db_manager.get_session() as session:
+                await session.execute(
+                    update(EmailEntity), results[start : start + chunk_size]
+                )
+
+        self._crud_logger.log_update(
+            "批量更新钓鱼检测结果",
+            {"count": len(results)},
+        )
+
+        return len(results)
@@ -3,11 +3,13 @@
 from datetime import datetime
 from typing import List, Optional, Tuple
 
-from sqlalchemy import and_, desc, select
+from sqlalchemy import Select, and_, desc, func, select, update
 from sqlalchemy.orm import selectinload
 
 from app.core.database import DatabaseManager
-from app.entities.email_entity import EmailEntity, PhishingLevel, PhishingStatus
+from app.entities.email_account_entity import EmailAccountEntity
+from app.entities.email_entity import EmailEntity
+from app.entities.mailbox_entity import MailboxEntity
 from app.entities.mailbox_message_entity import MailboxMessageEntity
 from app.utils.logging.crud_logger import CrudLogger
 
@@ -18,6 +20,20 @@ class EmailCrud:
     提供邮件列表与详情的查询操作，支持游标分页优化。
     """
 
+    # 列表视图所需的邮件元数据列
+    _LIST_MESSAGE_COLUMNS = (
+        EmailEntity.id,
+        EmailEntity.email_account_id,
+        EmailEntity.subject,
+        EmailEntity.sender_name,
+        EmailEntity.sender_address,
+        EmailEntity.snippet,
+        EmailEntity.received_at,
+        EmailEntity.phishing_level,
+        EmailEntity.phishing_score,
+        EmailEntity.phishing_status,
+    )
+
     def __init__(
         self,
         db_manager: DatabaseManager,
@@ -32,43 +48,131 @@ class EmailCrud:
         self._db_manager = db_manager
         self._crud_logger = crud_logger
 
-    async def get_by_mailbox_ids(
+    async def list_for_user(
         self,
-        mailbox_ids: List[int],
+        user_id: int,
+        account_id: Optional[int] = None,
+        mailbox_id: Optional[int] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> List[MailboxMessageEntity]:
-        """按文件夹获取邮件列表（兼容旧接口）。
+    ) -> List[Tuple[MailboxMessageEntity, str, str]]:
+        """按用户范围获取邮件列表。
+
+        通过文件夹与邮箱账户的联表查询，一次完成归属校验、文件夹解析与列表查询，
+        并同时返回文件夹名称与邮箱地址。
 
         Args:
-            mailbox_ids: 文件夹ID列表。
+            user_id: 用户ID。
+            account_id: 邮箱账户ID（可选，不指定则聚合该用户所有邮箱）。
+            mailbox_id: 文件夹ID（可选，不指定则使用INBOX）。
             limit: 返回数量限制。
             offset: 偏移量。
 
         Returns:
-            邮箱文件夹邮件实体列表。
+            (邮箱文件夹邮件实体, 文件夹名称, 邮箱地址) 元组列表。
         """
-        if not mailbox_ids:
-            return []
-
         async with self._db_manager.get_session() as session:
             query = (
-                select(MailboxMessageEntity)
-                .where(MailboxMessageEntity.mailbox_id.in_(mailbox_ids))
-                .options(selectinload(MailboxMessageEntity.message))
+                self._scope_to_user(
+                    select(
+                        MailboxMessageEntity,
+                        MailboxEntity.name,
+                        EmailAccountEntity.email_address,
+                    ),
+                    user_id,
+                    account_id,
+                    mailbox_id,
+                )
+                .options(
+                    selectinload(MailboxMessageEntity.message).load_only(
+                        *self._LIST_MESSAGE_COLUMNS
+                    )
+                )
                 .order_by(desc(MailboxMessageEntity.internal_date))
                 .limit(limit)
                 .offset(offset)
             )
             result = await session.execute(query)
-            mailbox_messages = result.scalars().all()
+            rows = [tuple(row) for row in result.all()]
 
             self._crud_logger.log_read(
-                "查询邮件列表",
-                {"mailbox_ids": mailbox_ids, "count": len(mailbox_messages)},
+                "按用户查询邮件列表",
+                {
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "mailbox_id": mailbox_id,
+                    "count": len(rows),
+                },
             )
 
-            return list(mailbox_messages)
+            return rows
+
+    async def count_for_user(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        mailbox_id: Optional[int] = None,
+    ) -> int:
+        """按用户范围统计邮件数量。
+
+        筛选条件与 :meth:`list_for_user` 一致。
+
+        Args:
+            user_id: 用户ID。
+            account_id: 邮箱账户ID（可选）。
+            mailbox_id: 文件夹ID（可选，不指定则使用INBOX）。
+
+        Returns:
+            邮件数量。
+        """
+        async with self._db_manager.get_session() as session:
+            query = self._scope_to_user(
+                select(func.count(MailboxMessageEntity.id)).select_from(
+                    MailboxMessageEntity
+                ),
+                user_id,
+                account_id,
+                mailbox_id,
+            )
+            result = await session.execute(query)
+            return result.scalar() or 0
+
+    @staticmethod
+    def _scope_to_user(
+        query: Select,
+        user_id: int,
+        account_id: Optional[int],
+        mailbox_id: Optional[int],
+    ) -> Select:
+        """为查询添加用户范围的联表与筛选条件。
+
+        Args:
+            query: 以邮箱文件夹邮件为主表的查询。
+            user_id: 用户ID。
+            account_id: 邮箱账户ID（可选）。
+            mailbox_id: 文件夹ID（可选，不指定则使用INBOX）。
+
+        Returns:
+            添加条件后的查询。
+        """
+        query = (
+            query.join(
+                MailboxEntity, MailboxEntity.id == MailboxMessageEntity.mailbox_id
+            )
+            .join(
+                EmailAccountEntity,
+                EmailAccountEntity.id == MailboxEntity.email_account_id,
+            )
+            .where(
+                EmailAccountEntity.user_id == user_id,
+                EmailAccountEntity.is_active == True,  # noqa: E712
+            )
+        )
+        if account_id:
+            query = query.where(EmailAccountEntity.id == account_id)
+        if mailbox_id:
+            return query.where(MailboxEntity.id == mailbox_id)
+        return query.where(MailboxEntity.name == "INBOX")
 
     async def get_by_mailbox_ids_cursor(
         self,
@@ -151,32 +255,37 @@ class EmailCrud:
             return messages_list, next_cursor
 
     async def get_by_id(
-        self, mailbox_message_id: int
+        self, mailbox_message_id: int, include_body: bool = True
     ) -> Optional[MailboxMessageEntity]:
         """根据ID获取邮件详情。
 
         Args:
             mailbox_message_id: 邮箱文件夹邮件ID。
+            include_body: 是否预加载正文；为False时不得访问 ``message.body``。
 
         Returns:
             邮箱文件夹邮件实体或None。
         """
         async with self._db_manager.get_session() as session:
-            query = (
-                select(MailboxMessageEntity)
-                .where(MailboxMessageEntity.id == mailbox_message_id)
-                .options(
+            options = [
+                selectinload(MailboxMessageEntity.message).selectinload(
+                    EmailEntity.recipients
+                ),
+                selectinload(MailboxMessageEntity.message).selectinload(
+                    EmailEntity.email_account
+                ),
+                selectinload(MailboxMessageEntity.mailbox),
+            ]
+            if include_body:
+                options.append(
                     selectinload(MailboxMessageEntity.message).selectinload(
                         EmailEntity.body
-                    ),
-                    selectinload(MailboxMessageEntity.message).selectinload(
-                        EmailEntity.recipients
-                    ),
-                    selectinload(MailboxMessageEntity.message).selectinload(
-                        EmailEntity.email_account
-                    ),
-                    selectinload(MailboxMessageEntity.mailbox),
+                    )
                 )
+            query = (
+                select(MailboxMessageEntity)
+                .where(MailboxMessageEntity.id == mailbox_message_id)
+                .options(*options)
             )
             result = await session.execute(query)
             mailbox_message = result.scalar_one_or_none()
@@ -220,83 +329,54 @@ class EmailCrud:
 
             return True
 
-    async def get_count_by_mailbox_ids(
-        self,
-        mailbox_ids: List[int],
-        unread_only: bool = False,
-    ) -> int:
-        """获取邮件数量（用于统计）。
-
-        Args:
-            mailbox_ids: 文件夹ID列表。
-            unread_only: 是否只统计未读邮件。
-
-        Returns:
-            邮件数量。
-        """
-        if not mailbox_ids:
-            return 0
-
-        from sqlalchemy import func
-
-        async with self._db_manager.get_session() as session:
-            query = select(func.count(MailboxMessageEntity.id)).where(
-                MailboxMessageEntity.mailbox_id.in_(mailbox_ids)
-            )
-
-            if unread_only:
-                query = query.where(MailboxMessageEntity.is_read == False)  # noqa: E712
-
-            result = await session.execute(query)
-            count = result.scalar() or 0
-
-            return count
-
-    async def update_phishing_result(
-        self,
-        message_id: int,
-        phishing_level: PhishingLevel,
-        phishing_score: float,
-        phishing_reason: Optional[str] = None,
-        phishing_status: PhishingStatus = PhishingStatus.COMPLETED,
+    async def mark_as_read_for_user(
+        self, mailbox_message_id: int, user_id: int
     ) -> bool:
-        """更新邮件的钓鱼检测结果。
+        """校验归属并标记邮件为已读。
+
+        归属校验作为UPDATE的条件，一条语句完成校验与更新。
 
         Args:
-            message_id: 邮件消息ID（email_messages表的id）。
-            phishing_level: 钓鱼危险等级。
-            phishing_score: 钓鱼评分。
-            phishing_reason: 钓鱼判定原因。
-            phishing_status: 钓鱼检测状态。
+            mailbox_message_id: 邮箱文件夹邮件ID。
+            user_id: 用户ID。
 
         Returns:
-            是否更新成功。
+            邮件存在且属于该用户时返回True。
         """
+        owned = (
+            select(EmailEntity.id)
+            .join(
+                EmailAccountEntity,
+                EmailAccountEntity.id == EmailEntity.email_account_id,
+            )
+            .where(
+                EmailEntity.id == MailboxMessageEntity.message_id,
+                EmailAccountEntity.user_id == user_id,
+            )
+        )
         async with self._db_manager.get_session() as session:
-            query = select(EmailEntity).where(EmailEntity.id == message_id)
-            result = await session.execute(query)
-            email_message = result.scalar_one_or_none()
-
-            if not email_message:
-                return False
-
-            email_message.phishing_level = phishing_level
-            email_message.phishing_score = phishing_score
-            email_message.phishing_reason = phishing_reason
-            email_message.phishing_status = phishing_status
-            await session.flush()
+            statement = (
+                update(MailboxMessageEntity)
+                .where(
+                    MailboxMessageEntity.id == mailbox_message_id,
+                    owned.exists(),
+                )
+                .values(is_read=True)
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.execute(statement)
+            marked = result.rowcount > 0
 
             self._crud_logger.log_update(
-                "更新钓鱼检测结果",
+                "标记邮件已读",
                 {
-                    "message_id": message_id,
-                    "phishing_level": phishing_level.value,
-                    "phishing_score": phishing_score,
-                    "phishing_status": phishing_status.value,
+                    "mailbox_message_id": mailbox_message_id,
+                    "user_id": user_id,
+                    "marked": marked,
                 },
             )
 
-            return True
+            return marked
 
     async def get_all_email_ids(self) -> List[int]:
         """获取所有邮件的mailbox_message ID（用于重新检测）。
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 from sqlalchemy import select
 
@@ -11,7 +11,11 @@ from app.entities.email_body_entity import EmailBodyEntity
 from app.entities.email_entity import EmailEntity, PhishingLevel, PhishingStatus
 from app.entities.email_recipient_entity import EmailRecipientEntity
 from app.entities.mailbox_message_entity import MailboxMessageEntity
-from app.utils.imap.imap_flag_utils import flags_to_status, normalize_flags
+from app.utils.imap.imap_flag_utils import (
+    bits_to_status,
+    flags_to_bits,
+    normalize_flags,
+)
 from app.utils.imap.imap_models import ParsedRecipient
 from app.utils.logging.crud_logger import CrudLogger
 
@@ -107,7 +111,6 @@ class EmailSyncCrud:
                         processed_message_ids.add(message_id)
 
                 flags = payload.get("flags", [])
-                flag_status = flags_to_status(flags)
                 new_mailbox_messages.append(
                     MailboxMessageEntity(
                         mailbox_id=mailbox_id,
@@ -115,11 +118,7 @@ class EmailSyncCrud:
                         uid=uid,
                         flags=normalize_flags(flags),
                         internal_date=payload.get("internal_date"),
-                        is_read=flag_status["is_read"],
-                        is_flagged=flag_status["is_flagged"],
-                        is_answered=flag_status["is_answered"],
-                        is_deleted=flag_status["is_deleted"],
-                        is_draft=flag_status["is_draft"],
+                        **bits_to_status(flags_to_bits(flags)),
                     )
                 )
 
@@ -220,7 +219,7 @@ class EmailSyncCrud:
         return message
 
     def _build_recipient_entities(
-        self, message: EmailEntity, recipients: List[ParsedRecipient]
+        self, message: EmailEntity, recipients: Sequence[ParsedRecipient]
     ) -> List[EmailRecipientEntity]:
         """构建收件人实体列表。"""
         entities: List[EmailRecipientEntity] = []
@@ -241,10 +240,6 @@ class EmailSyncCrud:
         flags: List[str],
     ) -> None:
         """更新邮件标志位状态。"""
-        status = flags_to_status(flags)
         mailbox_message.flags = normalize_flags(flags)
-        mailbox_message.is_read = status["is_read"]
-        mailbox_message.is_flagged = status["is_flagged"]
-        mailbox_message.is_answered = status["is_answered"]
-        mailbox_message.is_deleted = status["is_deleted"]
-        mailbox_message.is_draft = status["is_draft"]
+        for field, value in bits_to_status(flags_to_bits(flags)).items():
+            setattr(mailbox_message, field, value)
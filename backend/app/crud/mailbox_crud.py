@@ -185,6 +185,44 @@ class MailboxCrud:
 
             return mailbox, False
 
+    async def rename_legacy_mailbox(self, account_id: int, name: str) -> bool:
+        """将旧版LIST解析保存的转义名称迁移为实际名称。
+
+        旧版解析不还原引号字符串中的转义，含 '"' 或 '\\' 的文件夹
+        以转义形式保存（例如 'a\\"b'）。按实际名称同步前先重命名旧记录，
+        保留其UID游标与邮件映射，避免产生重复文件夹。
+
+        Args:
+            account_id: 邮箱账户ID。
+            name: 文件夹实际名称。
+
+        Returns:
+            是否重命名了旧记录。
+        """
+        legacy_name = name.replace("\\", "\\\\").replace('"', '\\"')
+        if legacy_name == name:
+            return False
+
+        async with self._db_manager.get_session() as session:
+            query = select(MailboxEntity).where(
+                MailboxEntity.email_account_id == account_id,
+                MailboxEntity.name.in_([legacy_name, name]),
+            )
+            result = await session.execute(query)
+            mailboxes = {mailbox.name: mailbox for mailbox in result.scalars()}
+            legacy = mailboxes.get(legacy_name)
+            if legacy is None or name in mailboxes:
+                return False
+
+            legacy.name = name
+            await session.flush()
+
+            self._crud_logger.log_update(
+                "迁移旧版文件夹名称",
+                {"account_id": account_id, "legacy_name": legacy_name, "name": name},
+            )
+            return True
+
     async def update_sync_state(
         self,
         mailbox_id: int,
@@ -28,6 +28,13 @@ class SenderWhitelistCrud:
         """
         self._db_manager = db_manager
         self._crud_logger = crud_logger
+        # 规则写入次数，匹配器据此判断规则缓存是否过期
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """规则版本号，每次创建、更新或删除规则提交后递增。"""
+        return self._version
 
     async def create(
         self,
@@ -60,7 +67,8 @@ class SenderWhitelistCrud:
                 {"rule_type": rule_type, "rule_value": rule_value},
             )
 
-            return rule
+        self._version += 1
+        return rule
 
     async def get_all_active(self) -> List[SenderWhitelistEntity]:
         """获取所有启用的发件人白名单规则。
@@ -176,7 +184,8 @@ class SenderWhitelistCrud:
                 {"rule_id": rule_id, "success": True},
             )
 
-            return rule
+        self._version += 1
+        return rule
 
     async def delete(self, rule_id: int) -> bool:
         """删除发件人白名单规则。
@@ -209,4 +218,5 @@ class SenderWhitelistCrud:
                 {"rule_id": rule_id, "success": True},
             )
 
-            return True
+        self._version += 1
+        return True
@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
+from typing import Optional
 
 from app.crud.email_account_crud import EmailAccountCrud
 from app.crud.email_sync_crud import EmailSyncCrud
 from app.crud.mailbox_crud import MailboxCrud
-from app.entities.email_entity import PhishingLevel, PhishingStatus
+from app.entities.email_entity import PhishingLevel
 from app.schemas.email_account_schema import (
     AddEmailAccountRequest,
     AddEmailAccountResponse,
@@ -19,9 +19,15 @@ from app.schemas.email_account_schema import (
     TestConnectionRequest,
     TestConnectionResponse,
 )
-from app.utils.imap import ImapClient, ImapConfigFactory, SmtpClient
-from app.utils.imap.email_parser import EmailParser
-from app.utils.imap.imap_models import MailboxInfo
+from app.services.mailbox_sync_service import MailboxSyncService
+from app.utils.imap import (
+    ImapClient,
+    ImapConfigFactory,
+    ImapConnectionPool,
+    SmtpClient,
+    SmtpConnectionPool,
+)
+from app.utils.imap.keyed_connection_pool import PoolKey
 from app.utils.imap.providers import ProviderFactory
 from app.utils.phishing import PhishingDetectorInterface
 
@@ -40,6 +46,8 @@ class EmailAccountService:
         phishing_detector: PhishingDetectorInterface,
         phishing_detection_service,  # 避免循环导入，使用类型提示的字符串形式
         logger: logging.Logger,
+        imap_pool: Optional[ImapConnectionPool] = None,
+        smtp_pool: Optional[SmtpConnectionPool] = None,
     ) -> None:
         """初始化邮箱账户服务。
 
@@ -50,6 +58,8 @@ class EmailAccountService:
             phishing_detector: 钓鱼检测器。
             phishing_detection_service: 钓鱼检测服务（后台异步检测）。
             logger: 日志记录器。
+            imap_pool: IMAP连接池，为None时使用服务自有的连接池。
+            smtp_pool: SMTP连接池，删除账户时从中驱逐该账户的会话。
         """
         self._email_account_crud = email_account_crud
         self._mailbox_crud = mailbox_crud
@@ -57,7 +67,15 @@ class EmailAccountService:
         self._phishing_detector = phishing_detector
         self._phishing_detection_service = phishing_detection_service
         self._logger = logger
-        self._email_parser = EmailParser(logger)
+        self._mailbox_sync = MailboxSyncService(
+            email_account_crud,
+            mailbox_crud,
+            email_sync_crud,
+            phishing_detection_service,
+            logger,
+        )
+        self._imap_pool = imap_pool or ImapConnectionPool(logger=logger)
+        self._smtp_pool = smtp_pool
 
     async def add_email_account(
         self, user_id: int, request: AddEmailAccountRequest
@@ -110,38 +128,54 @@ class EmailAccountService:
         )
 
         imap_client = ImapClient(config, self._logger, provider=provider)
-        connected = await imap_client.connect(
-            request.email_address, request.auth_password
-        )
-        await imap_client.disconnect()
+        pooled = False
+        try:
+            connected = await imap_client.connect(
+                request.email_address, request.auth_password
+            )
+            if not connected:
+                return AddEmailAccountResponse(
+                    success=False,
+                    message="邮箱连接失败，请检查邮箱地址和授权密码。",
+                )
 
-        if not connected:
-            return AddEmailAccountResponse(
-                success=False,
-                message="邮箱连接失败，请检查邮箱地址和授权密码。",
+            smtp_client = SmtpClient(config, self._logger)
+            smtp_connected = await smtp_client.test_connection(
+                request.email_address, request.auth_password
             )
+            if not smtp_connected:
+                return AddEmailAccountResponse(
+                    success=False,
+                    message="SMTP连接失败，请检查SMTP服务器和授权密码。",
+                )
 
-        smtp_client = SmtpClient(config, self._logger)
-        smtp_connected = await smtp_client.test_connection(
-            request.email_address, request.auth_password
-        )
-        if not smtp_connected:
-            return AddEmailAccountResponse(
-                success=False,
-                message="SMTP连接失败，请检查SMTP服务器和授权密码。",
+            account = await self._email_account_crud.create(
+                user_id=user_id,
+                email_address=request.email_address,
+                email_type=request.email_type,
+                auth_password=request.auth_password,
+                imap_host=config.imap_host,
+                imap_port=config.imap_port,
+                smtp_host=config.smtp_host,
+                smtp_port=config.smtp_port,
+                use_ssl=config.use_ssl,
             )
 
-        account = await self._email_account_crud.create(
-            user_id=user_id,
-            email_address=request.email_address,
-            email_type=request.email_type,
-            auth_password=request.auth_password,
-            imap_host=config.imap_host,
-            imap_port=config.imap_port,
-            smtp_host=config.smtp_host,
-            smtp_port=config.smtp_port,
-            use_ssl=config.use_ssl,
-        )
+            # 添加成功后前端会立即发起首次同步，已登录的连接交给连接池复用
+            await self._imap_pool.release(
+                PoolKey.build(
+                    account.id,
+                    config.imap_host,
+                    config.imap_port,
+                    account.email_address,
+                    request.auth_password,
+                ),
+                imap_client,
+            )
+            pooled = True
+        finally:
+            if not pooled:
+                await imap_client.disconnect()
 
         self._logger.info(
             "添加邮箱成功: user_id=%s, email=%s", user_id, request.email_address
@@ -220,148 +254,52 @@ class EmailAccountService:
             logger=self._logger,
         )
 
-        imap_client = ImapClient(config, self._logger, provider=provider)
-        connected = await imap_client.connect(account.email_address, password)
-
-        if not connected:
+        pool_key = PoolKey.build(
+            account_id,
+            config.imap_host,
+            config.imap_port,
+            account.email_address,
+            password,
+        )
+        try:
+            async with self._imap_pool.acquire(
+                pool_key,
+                lambda: self._open_imap_client(
+                    config, provider, account.email_address, password
+                ),
+            ) as imap_client:
+                return await self._mailbox_sync.sync_mailboxes(imap_client, account_id)
+        except ConnectionError as exc:
+            self._logger.warning(
+                "邮箱同步连接失败: account_id=%s, %s", account_id, exc
+            )
             return SyncEmailsResponse(
                 success=False,
                 message="邮箱连接失败。",
             )
 
-        synced_total = 0
-        # 首次同步时的总邮件数量限制（每个服务商总共只拉取30封邮件）
-        initial_sync_limit = 30
-        remaining_quota = initial_sync_limit  # 剩余可拉取配额
-        is_initial_sync = False  # 是否为首次同步
+    async def _open_imap_client(
+        self, config, provider, username: str, password: str
+    ) -> ImapClient:
+        """建立并登录IMAP客户端，供连接池创建新连接。
 
-        try:
-            mailboxes = await imap_client.list_mailboxes()
-            if not mailboxes:
-                mailboxes = [MailboxInfo(name="INBOX", delimiter=None, attributes=None)]
-
-            # 首先检查是否为首次同步（任意文件夹的last_uid为0即为首次同步）
-            for mailbox in mailboxes:
-                if mailbox.attributes and "\\NOSELECT" in mailbox.attributes.upper():
-                    continue
-                mailbox_entity_check = await self._mailbox_crud.get_by_account_and_name(
-                    account_id, mailbox.name
-                )
-                if (
-                    not mailbox_entity_check
-                    or (mailbox_entity_check.last_uid or 0) == 0
-                ):
-                    is_initial_sync = True
-                    break
-
-            for mailbox in mailboxes:
-                if mailbox.attributes and "\\NOSELECT" in mailbox.attributes.upper():
-                    continue
-
-                # 首次同步且配额已用完，跳过剩余文件夹
-                if is_initial_sync and remaining_quota <= 0:
-                    self._logger.info(
-                        "首次同步配额已用完，跳过文件夹: %s", mailbox.name
-                    )
-                    continue
-
-                status = await imap_client.get_mailbox_status(mailbox.name)
-                mailbox_entity, uid_changed = await self._mailbox_crud.upsert_mailbox(
-                    account_id=account_id,
-                    name=mailbox.name,
-                    delimiter=mailbox.delimiter,
-                    attributes=mailbox.attributes,
-                    uid_validity=status.uid_validity,
-                )
+        Args:
+            config: IMAP配置。
+            provider: 邮箱服务商提供者。
+            username: 邮箱地址。
+            password: 授权密码。
 
-                if uid_changed:
-                    # UIDVALIDITY变化意味着UID游标失效，需清空文件夹映射后重新同步。
-                    await self._mailbox_crud.reset_mailbox_messages(mailbox_entity.id)
-
-                selected = await imap_client.select_mailbox(mailbox.name)
-                if not selected:
-                    self._logger.warning("无法选择文件夹，跳过: %s", mailbox.name)
-                    continue
-
-                last_uid = mailbox_entity.last_uid or 0
-                start_uid = last_uid + 1
-
-                # 首次同步时，使用高效方法直接获取最新的N封邮件
-                if last_uid == 0 and is_initial_sync and remaining_quota > 0:
-                    # 使用 fetch_latest_uids 直接获取最新的邮件，避免获取全部UID列表
-                    uids = await imap_client.fetch_latest_uids(remaining_quota)
-                else:
-                    # 非首次同步：增量获取新邮件
-                    uids = await imap_client.fetch_uids_since(start_uid)
-                    if uids:
-                        uids = sorted(uids)
-
-                if not uids:
-                    await self._mailbox_crud.update_sync_state(
-                        mailbox_entity.id, last_uid
-                    )
-                    continue
-
-                # 收集所有新邮件的ID，用于后台异步检测
-                new_email_ids = []
-
-                for chunk in self._chunk_list(uids, 20):
-                    # 分批拉取邮件与批量写入，避免单次内存占用过高。
-                    fetched_emails = await imap_client.fetch_emails_by_uid(chunk)
-                    payloads = self._build_payloads(fetched_emails, mailbox.name)
-                    if not payloads:
-                        continue
-
-                    # 先保存邮件，不进行检测（默认为NORMAL），避免阻塞用户
-                    # 钓鱼检测将在后台异步执行
-                    for payload in payloads:
-                        payload["phishing_level"] = PhishingLevel.NORMAL
-                        payload["phishing_score"] = 0.0
-                        payload["phishing_reason"] = None
-                        payload["phishing_status"] = PhishingStatus.PENDING.value
-
-                    synced_count, batch_email_ids = (
-                        await self._email_sync_crud.save_mailbox_emails(
-                            account_id=account_id,
-                            mailbox_id=mailbox_entity.id,
-                            payloads=payloads,
-                        )
-                    )
-                    synced_total += synced_count
-
-                    # 首次同步时，更新剩余配额
-                    if is_initial_sync:
-                        remaining_quota -= synced_count
-
-                    # 收集新邮件ID用于后台检测
-                    new_email_ids.extend(batch_email_ids)
-
-                    await self._mailbox_crud.update_sync_state(
-                        mailbox_entity.id, max(chunk)
-                    )
-
-                # 启动后台异步检测任务（不等待完成）
-                if new_email_ids:
-                    self._logger.info(
-                        "启动后台钓鱼检测任务: account_id=%d, mailbox=%s, count=%d",
-                        account_id,
-                        mailbox.name,
-                        len(new_email_ids),
-                    )
-                    # 异步检测邮件，不阻塞主流程
-                    await self._phishing_detection_service.detect_emails_async(
-                        new_email_ids
-                    )
-
-            await self._email_account_crud.update_last_sync(account_id)
+        Returns:
+            已登录的IMAP客户端。
 
-            return SyncEmailsResponse(
-                success=True,
-                message=f"同步成功，获取{synced_total}封新邮件。",
-                synced_count=synced_total,
-            )
-        finally:
+        Raises:
+            ConnectionError: 连接或登录失败。
+        """
+        imap_client = ImapClient(config, self._logger, provider=provider)
+        if not await imap_client.connect(username, password):
             await imap_client.disconnect()
+            raise ConnectionError(f"IMAP登录失败: {username}")
+        return imap_client
 
     async def delete_email_account(
         self, user_id: int, account_id: int
@@ -383,6 +321,10 @@ class EmailAccountService:
             )
 
         await self._email_account_crud.delete(account_id)
+        # 账户删除后不再复用其已登录的连接
+        await self._imap_pool.evict_account(account_id)
+        if self._smtp_pool is not None:
+            await self._smtp_pool.evict_account(account_id)
 
         self._logger.info("删除邮箱成功: account_id=%s", account_id)
 
@@ -441,44 +383,6 @@ class EmailAccountService:
             message="连接失败，请检查邮箱地址和授权密码。",
         )
 
-    def _build_payloads(self, fetched_emails, mailbox_name: str) -> List[dict]:
-        """构建同步写入的数据载荷。"""
-        payloads: List[dict] = []
-        for fetched in fetched_emails:
-            parsed = self._email_parser.parse(fetched.raw_bytes)
-            if not parsed:
-                continue
-            message_id = parsed.message_id or self._fallback_message_id(
-                mailbox_name, fetched.uid
-            )
-            payloads.append(
-                {
-                    "uid": fetched.uid,
-                    "flags": fetched.flags,
-                    "internal_date": fetched.internal_date,
-                    "size": fetched.size,
-                    "message_id": message_id,
-                    "subject": parsed.subject,
-                    "sender_name": parsed.sender_name,
-                    "sender_address": parsed.sender_address,
-                    "recipients": parsed.recipients,
-                    "content_text": parsed.content_text,
-                    "content_html": parsed.content_html,
-                    "snippet": parsed.snippet,
-                    "received_at": parsed.received_at or fetched.internal_date,
-                }
-            )
-        return payloads
-
-    def _fallback_message_id(self, mailbox_name: str, uid: int) -> str:
-        """生成缺失Message-ID时的替代值。"""
-        message_id = f"missing-{mailbox_name}-{uid}"
-        return message_id[:255]
-
-    def _chunk_list(self, values: List[int], chunk_size: int) -> List[List[int]]:
-        """将列表按指定大小切分为子列表。"""
-        return [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
-
     def _map_phishing_level(self, level: str) -> PhishingLevel:
         """映射钓鱼检测等级到数据库枚举。"""
         level_map = {
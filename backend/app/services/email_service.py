@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import List, Optional
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
 
 from app.crud.email_account_crud import EmailAccountCrud
 from app.crud.email_crud import EmailCrud
-from app.crud.mailbox_crud import MailboxCrud
+from app.crud.email_body_crud import EmailBodyCrud
 from app.schemas.email_schema import (
     EmailListResponse,
     EmailItem,
@@ -18,7 +31,14 @@ from app.schemas.email_schema import (
     SendEmailResponse,
     MarkAsReadResponse,
 )
-from app.utils.imap import SmtpClient, ImapConfigFactory
+from app.utils.imap import SmtpClient, SmtpConnectionPool, ImapConfigFactory
+from app.utils.json_codec import JsonCodec
+from app.utils.ttl_cache import TtlLruCache
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# 收件人序列化所需字段，一次性绑定以减少逐项属性查找
+_RECIPIENT_FIELDS = attrgetter("recipient_type", "display_name", "email_address")
 
 
 class EmailService:
@@ -27,25 +47,50 @@ class EmailService:
     负责邮件的获取、发送等业务逻辑。
     """
 
+    # 每次列表查询后预取正文的邮件数量
+    _BODY_PREFETCH_COUNT = 5
+    # 正文缓存的总字符数上限，以及可缓存的单封正文字符数上限；
+    # 超大正文（内嵌图片的HTML等）直接从数据库读取，避免挤占缓存
+    _BODY_CACHE_MAX_CHARS = 8 * 1024 * 1024
+    _BODY_CACHE_ENTRY_MAX_CHARS = 256 * 1024
+
     def __init__(
         self,
         email_crud: EmailCrud,
+        email_body_crud: EmailBodyCrud,
         email_account_crud: EmailAccountCrud,
-        mailbox_crud: MailboxCrud,
         logger: logging.Logger,
+        smtp_pool: Optional[SmtpConnectionPool] = None,
+        fast_model_construct: bool = True,
     ) -> None:
         """初始化邮件服务。
 
         Args:
             email_crud: 邮件数据访问对象。
+            email_body_crud: 邮件正文数据访问对象。
             email_account_crud: 邮箱账户数据访问对象。
-            mailbox_crud: 邮箱文件夹数据访问对象。
             logger: 日志记录器。
+            smtp_pool: SMTP连接池，为None时每次发信单独建立连接。
+            fast_model_construct: 是否使用 model_construct 构建列表与详情响应。
+                字段均来自ORM实体与枚举值等可信数据，可安全跳过Pydantic校验。
         """
         self._email_crud = email_crud
+        self._email_body_crud = email_body_crud
         self._email_account_crud = email_account_crud
-        self._mailbox_crud = mailbox_crud
         self._logger = logger
+        self._smtp_pool = smtp_pool
+        self._fast_model_construct = fast_model_construct
+        # 邮件正文预取缓存：邮箱文件夹邮件ID -> (纯文本正文, HTML正文)
+        self._body_cache: TtlLruCache[Tuple[Optional[str], Optional[str]]] = (
+            TtlLruCache(
+                maxsize=512,
+                ttl=300,
+                max_cost=self._BODY_CACHE_MAX_CHARS,
+                cost=self._body_size,
+            )
+        )
+        # 后台任务（正文预取、已读标记），持有引用避免被垃圾回收
+        self._background_tasks: Set[asyncio.Task] = set()
 
     async def get_emails(
         self,
@@ -67,58 +112,57 @@ class EmailService:
         Returns:
             邮件列表响应。
         """
-        accounts = await self._email_account_crud.get_by_user_id(user_id)
-        account_map = {acc.id: acc.email_address for acc in accounts}
-
-        if not accounts:
-            return EmailListResponse(success=True, emails=[], total=0)
-
-        if account_id and account_id not in account_map:
-            return EmailListResponse(success=True, emails=[], total=0)
-
-        mailbox_ids, mailbox_name_map = await self._resolve_mailboxes(
-            account_ids=[account_id] if account_id else list(account_map.keys()),
-            mailbox_id=mailbox_id,
+        # 归属校验、文件夹解析与列表查询合并为一次联表查询，与总数统计并发执行
+        rows, total = await asyncio.gather(
+            self._email_crud.list_for_user(
+                user_id, account_id, mailbox_id, limit, offset
+            ),
+            self._email_crud.count_for_user(user_id, account_id, mailbox_id),
         )
-        if not mailbox_ids:
-            return EmailListResponse(success=True, emails=[], total=0)
 
-        mailbox_messages = await self._email_crud.get_by_mailbox_ids(
-            mailbox_ids, limit, offset
-        )
+        # 先过滤无效记录；日期格式化直接内联
+        rows = [row for row in rows if row[0].message]
+        build_item = self._model_factory(EmailItem)
+
+        items = [
+            build_item(
+                id=mm.id,
+                email_account_id=mm.message.email_account_id,
+                email_address=email_address,
+                mailbox_id=mm.mailbox_id,
+                mailbox_name=mailbox_name,
+                subject=mm.message.subject,
+                sender=self._format_sender(
+                    mm.message.sender_name, mm.message.sender_address
+                ),
+                snippet=mm.message.snippet,
+                received_at=(
+                    received.isoformat()
+                    if (received := mm.internal_date or mm.message.received_at)
+                    else None
+                ),
+                is_read=mm.is_read,
+                phishing_level=mm.message.phishing_level.value,
+                phishing_score=mm.message.phishing_score,
+                phishing_status=(
+                    mm.message.phishing_status.value
+                    if mm.message.phishing_status
+                    else "COMPLETED"
+                ),
+            )
+            for mm, mailbox_name, email_address in rows
+        ]
 
-        items = []
-        for mailbox_message in mailbox_messages:
-            message = mailbox_message.message
-            if not message:
-                continue
-            items.append(
-                EmailItem(
-                    id=mailbox_message.id,
-                    email_account_id=message.email_account_id,
-                    email_address=account_map.get(message.email_account_id),
-                    mailbox_id=mailbox_message.mailbox_id,
-                    mailbox_name=mailbox_name_map.get(mailbox_message.mailbox_id),
-                    subject=message.subject,
-                    sender=self._format_sender(
-                        message.sender_name, message.sender_address
-                    ),
-                    snippet=message.snippet,
-                    received_at=self._format_datetime(
-                        mailbox_message.internal_date or message.received_at
-                    ),
-                    is_read=mailbox_message.is_read,
-                    phishing_level=message.phishing_level.value,
-                    phishing_score=message.phishing_score,
-                    phishing_status=(
-                        message.phishing_status.value
-                        if message.phishing_status
-                        else "COMPLETED"
-                    ),
-                )
+        # 用户通常很快会打开第一页顶部的邮件，后台预取这些邮件的正文；
+        # 翻页请求多为浏览，不再预取
+        if offset == 0:
+            self._schedule_body_prefetch(
+                [mm for mm, _, _ in rows[: self._BODY_PREFETCH_COUNT]]
             )
 
-        return EmailListResponse(success=True, emails=items, total=len(items))
+        return self._model_factory(EmailListResponse)(
+            success=True, emails=items, total=total
+        )
 
     async def get_email_detail(
         self, user_id: int, email_id: int
@@ -132,24 +176,33 @@ class EmailService:
         Returns:
             邮件详情响应。
         """
-        mailbox_message = await self._email_crud.get_by_id(email_id)
+        # 命中预取缓存时无需再加载正文
+        cached_body = self._body_cache.get(email_id)
+        mailbox_message = await self._email_crud.get_by_id(
+            email_id, include_body=cached_body is None
+        )
         if not mailbox_message or not mailbox_message.message:
             return EmailDetailResponse(success=False, email=None)
 
-        account = await self._email_account_crud.get_by_id(
-            mailbox_message.message.email_account_id
-        )
+        # 邮箱账户随邮件一并预加载，无需额外查询即可校验归属
+        account = mailbox_message.message.email_account
         if not account or account.user_id != user_id:
             return EmailDetailResponse(success=False, email=None)
 
+        # 归属已校验，已读标记在后台写入，不阻塞详情响应
         if not mailbox_message.is_read:
-            await self._email_crud.mark_as_read(email_id)
+            self._run_in_background(self._mark_as_read_quietly(email_id))
 
         message = mailbox_message.message
-        body = message.body
+        if cached_body is not None:
+            content_text, content_html = cached_body
+        else:
+            body = message.body
+            content_text = body.content_text if body else None
+            content_html = body.content_html if body else None
         recipients_json = self._serialize_recipients(message.recipients)
 
-        detail = EmailDetail(
+        detail = self._model_factory(EmailDetail)(
             id=mailbox_message.id,
             email_account_id=message.email_account_id,
             email_address=account.email_address,
@@ -161,8 +214,8 @@ class EmailService:
             subject=message.subject,
             sender=self._format_sender(message.sender_name, message.sender_address),
             recipients=recipients_json,
-            content_text=body.content_text if body else None,
-            content_html=body.content_html if body else None,
+            content_text=content_text,
+            content_html=content_html,
             received_at=self._format_datetime(
                 mailbox_message.internal_date or message.received_at
             ),
@@ -177,7 +230,7 @@ class EmailService:
             ),
         )
 
-        return EmailDetailResponse(success=True, email=detail)
+        return self._model_factory(EmailDetailResponse)(success=True, email=detail)
 
     async def send_email(
         self, user_id: int, request: SendEmailRequest
@@ -226,6 +279,8 @@ class EmailService:
             content=request.content,
             content_html=request.content_html,
             cc_addresses=request.cc_addresses,
+            pool=self._smtp_pool,
+            account_id=account.id,
         )
 
         if success:
@@ -254,46 +309,102 @@ class EmailService:
         Returns:
             标记已读响应。
         """
-        mailbox_message = await self._email_crud.get_by_id(email_id)
-        if not mailbox_message or not mailbox_message.message:
+        marked = await self._email_crud.mark_as_read_for_user(email_id, user_id)
+        if not marked:
             return MarkAsReadResponse(success=False, message="邮件不存在。")
 
-        account = await self._email_account_crud.get_by_id(
-            mailbox_message.message.email_account_id
-        )
-        if not account or account.user_id != user_id:
-            return MarkAsReadResponse(success=False, message="邮件不存在。")
+        return MarkAsReadResponse(success=True, message="标记成功。")
 
-        await self._email_crud.mark_as_read(email_id)
+    def _schedule_body_prefetch(self, mailbox_messages: list) -> None:
+        """在后台预取邮件正文到缓存。
 
-        return MarkAsReadResponse(success=True, message="标记成功。")
+        Args:
+            mailbox_messages: 待预取的邮箱文件夹邮件实体列表。
+        """
+        targets = {
+            mm.id: mm.message_id
+            for mm in mailbox_messages
+            if mm.id not in self._body_cache
+        }
+        if not targets:
+            return
+        self._run_in_background(self._warm_body_cache(targets))
+
+    async def _mark_as_read_quietly(self, email_id: int) -> None:
+        """标记邮件已读，失败时仅记录日志。
+
+        Args:
+            email_id: 邮件ID。
+        """
+        try:
+            await self._email_crud.mark_as_read(email_id)
+        except Exception as exc:
+            self._logger.warning("标记邮件已读失败: email_id=%s, %s", email_id, exc)
+
+    def _run_in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """在后台执行协程，并持有任务引用直到完成。
+
+        Args:
+            coro: 待执行的协程。
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _warm_body_cache(self, targets: Dict[int, int]) -> None:
+        """查询并缓存邮件正文。
+
+        Args:
+            targets: 邮箱文件夹邮件ID到邮件元数据ID的映射。
+        """
+        try:
+            bodies = await self._email_body_crud.get_bodies_by_message_ids(
+                list(set(targets.values()))
+            )
+        except Exception as exc:
+            self._logger.warning("预取邮件正文失败: %s", exc)
+            return
+        empty_body = (None, None)
+        for email_id, message_id in targets.items():
+            body = bodies.get(message_id, empty_body)
+            if self._body_size(body) <= self._BODY_CACHE_ENTRY_MAX_CHARS:
+                self._body_cache.set(email_id, body)
+
+    @staticmethod
+    def _body_size(body: Tuple[Optional[str], Optional[str]]) -> int:
+        """计算正文缓存条目的字符数。
+
+        Args:
+            body: (纯文本正文, HTML正文) 元组。
+
+        Returns:
+            两部分正文的字符数之和。
+        """
+        content_text, content_html = body
+        return len(content_text or "") + len(content_html or "")
+
+    def _model_factory(self, model_cls: Type[ModelT]) -> Callable[..., ModelT]:
+        """获取响应模型的构建方法。
 
-    async def _resolve_mailboxes(
-        self, account_ids: List[int], mailbox_id: Optional[int]
-    ) -> tuple[List[int], dict]:
-        """解析文件夹范围。"""
-        if mailbox_id:
-            mailbox = await self._mailbox_crud.get_by_id(mailbox_id)
-            if not mailbox or mailbox.email_account_id not in account_ids:
-                return [], {}
-            return [mailbox.id], {mailbox.id: mailbox.name}
+        Args:
+            model_cls: Pydantic模型类。
 
-        mailboxes = await self._mailbox_crud.get_inbox_by_account_ids(account_ids)
-        return [mb.id for mb in mailboxes], {mb.id: mb.name for mb in mailboxes}
+        Returns:
+            启用快速构建时返回跳过校验的 model_construct，否则返回模型类本身。
+        """
+        if self._fast_model_construct:
+            return model_cls.model_construct
+        return model_cls
 
     def _serialize_recipients(self, recipients) -> Optional[str]:
         """序列化收件人列表为JSON字符串。"""
         if not recipients:
             return None
         payload = [
-            {
-                "type": recipient.recipient_type.value,
-                "name": recipient.display_name,
-                "address": recipient.email_address,
-            }
-            for recipient in recipients
+            {"type": recipient_type.value, "name": name, "address": address}
+            for recipient_type, name, address in map(_RECIPIENT_FIELDS, recipients)
         ]
-        return json.dumps(payload, ensure_ascii=True)
+        return JsonCodec.dumps(payload)
 
     def _format_sender(self, name: Optional[str], address: Optional[str]) -> str:
         """格式化发件人展示名称。"""
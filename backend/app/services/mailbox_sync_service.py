@@ -0,0 +1,270 @@
+"""邮箱文件夹同步服务。
+
+负责使用已登录的IMAP客户端逐个文件夹增量拉取新邮件并写入数据库。
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import AsyncIterator, List, TYPE_CHECKING
+
+from app.crud.email_account_crud import EmailAccountCrud
+from app.crud.email_sync_crud import EmailSyncCrud
+from app.crud.mailbox_crud import MailboxCrud
+from app.entities.email_entity import PhishingLevel, PhishingStatus
+from app.schemas.email_account_schema import SyncEmailsResponse
+from app.utils.imap.email_parser import EmailParser
+from app.utils.imap.imap_models import MailboxInfo, MailboxStatus
+
+if TYPE_CHECKING:
+    from app.utils.imap.imap_client import ImapClient
+
+
+class MailboxSyncService:
+    """邮箱文件夹同步服务类。
+
+    首次同步按配额拉取最新邮件，之后按UID游标分页增量同步，
+    新邮件保存后交给钓鱼检测服务在后台检测。
+    """
+
+    def __init__(
+        self,
+        email_account_crud: EmailAccountCrud,
+        mailbox_crud: MailboxCrud,
+        email_sync_crud: EmailSyncCrud,
+        phishing_detection_service,  # 避免循环导入，不标注类型
+        logger: logging.Logger,
+    ) -> None:
+        """初始化文件夹同步服务。
+
+        Args:
+            email_account_crud: 邮箱账户数据访问对象。
+            mailbox_crud: 邮箱文件夹数据访问对象。
+            email_sync_crud: 邮件同步写入对象。
+            phishing_detection_service: 钓鱼检测服务（后台异步检测）。
+            logger: 日志记录器。
+        """
+        self._email_account_crud = email_account_crud
+        self._mailbox_crud = mailbox_crud
+        self._email_sync_crud = email_sync_crud
+        self._phishing_detection_service = phishing_detection_service
+        self._logger = logger
+        self._email_parser = EmailParser(logger)
+
+    async def sync_mailboxes(
+        self, imap_client: ImapClient, account_id: int
+    ) -> SyncEmailsResponse:
+        """使用已登录的客户端同步账户下的全部文件夹。
+
+        Args:
+            imap_client: 已登录的IMAP客户端。
+            account_id: 邮箱账户ID。
+
+        Returns:
+            同步邮件响应。
+        """
+        synced_total = 0
+        # 首次同步时的总邮件数量限制（每个服务商总共只拉取30封邮件）
+        initial_sync_limit = 30
+        remaining_quota = initial_sync_limit  # 剩余可拉取配额
+        is_initial_sync = False  # 是否为首次同步
+
+        mailboxes = await imap_client.list_mailboxes()
+        if not mailboxes:
+            mailboxes = [MailboxInfo(name="INBOX", delimiter=None, attributes=None)]
+
+        # 首先检查是否为首次同步（任意文件夹的last_uid为0即为首次同步）
+        for mailbox in mailboxes:
+            if mailbox.attributes and "\\NOSELECT" in mailbox.attributes.upper():
+                continue
+            mailbox_entity_check = await self._mailbox_crud.get_by_account_and_name(
+                account_id, mailbox.name
+            )
+            if (
+                not mailbox_entity_check
+                or (mailbox_entity_check.last_uid or 0) == 0
+            ):
+                is_initial_sync = True
+                break
+
+        for mailbox in mailboxes:
+            if mailbox.attributes and "\\NOSELECT" in mailbox.attributes.upper():
+                continue
+
+            # 首次同步且配额已用完，跳过剩余文件夹
+            if is_initial_sync and remaining_quota <= 0:
+                self._logger.info(
+                    "首次同步配额已用完，跳过文件夹: %s", mailbox.name
+                )
+                continue
+
+            status = await imap_client.get_mailbox_status(mailbox.name)
+            await self._mailbox_crud.rename_legacy_mailbox(account_id, mailbox.name)
+            mailbox_entity, uid_changed = await self._mailbox_crud.upsert_mailbox(
+                account_id=account_id,
+                name=mailbox.name,
+                delimiter=mailbox.delimiter,
+                attributes=mailbox.attributes,
+                uid_validity=status.uid_validity,
+            )
+
+            if uid_changed:
+                # UIDVALIDITY变化意味着UID游标失效，需清空文件夹映射后重新同步。
+                await self._mailbox_crud.reset_mailbox_messages(mailbox_entity.id)
+
+            last_uid = mailbox_entity.last_uid or 0
+            start_uid = last_uid + 1
+
+            # STATUS返回的UIDNEXT未超过游标说明没有新邮件，跳过SELECT与UID查询
+            uid_next = status.uid_next
+            if last_uid and uid_next is not None and uid_next <= start_uid:
+                await self._mailbox_crud.update_sync_state(mailbox_entity.id, last_uid)
+                continue
+
+            selected = await imap_client.select_mailbox(mailbox.name)
+            if not selected:
+                self._logger.warning("无法选择文件夹，跳过: %s", mailbox.name)
+                continue
+
+            # 首次同步时，使用高效方法直接获取最新的N封邮件
+            latest_count = (
+                remaining_quota
+                if last_uid == 0 and is_initial_sync and remaining_quota > 0
+                else 0
+            )
+
+            # 收集所有新邮件的ID，用于后台异步检测
+            new_email_ids = []
+            has_uids = False
+
+            async for uids in self._iter_uid_pages(
+                imap_client, start_uid, status, latest_count
+            ):
+                has_uids = True
+                for chunk in self._chunk_list(uids, 20):
+                    # 分批拉取邮件与批量写入，避免单次内存占用过高。
+                    fetched_emails = await imap_client.fetch_emails_by_uid(chunk)
+                    payloads = self._build_payloads(fetched_emails, mailbox.name)
+                    if not payloads:
+                        continue
+
+                    # 先保存邮件，不进行检测（默认为NORMAL），避免阻塞用户
+                    # 钓鱼检测将在后台异步执行
+                    for payload in payloads:
+                        payload["phishing_level"] = PhishingLevel.NORMAL
+                        payload["phishing_score"] = 0.0
+                        payload["phishing_reason"] = None
+                        payload["phishing_status"] = PhishingStatus.PENDING.value
+
+                    synced_count, batch_email_ids = (
+                        await self._email_sync_crud.save_mailbox_emails(
+                            account_id=account_id,
+                            mailbox_id=mailbox_entity.id,
+                            payloads=payloads,
+                        )
+                    )
+                    synced_total += synced_count
+
+                    # 首次同步时，更新剩余配额
+                    if is_initial_sync:
+                        remaining_quota -= synced_count
+
+                    # 收集新邮件ID用于后台检测
+                    new_email_ids.extend(batch_email_ids)
+
+                    await self._mailbox_crud.update_sync_state(
+                        mailbox_entity.id, max(chunk)
+                    )
+
+            if not has_uids:
+                await self._mailbox_crud.update_sync_state(
+                    mailbox_entity.id, last_uid
+                )
+
+            # 启动后台异步检测任务（不等待完成）
+            if new_email_ids:
+                self._logger.info(
+                    "启动后台钓鱼检测任务: account_id=%d, mailbox=%s, count=%d",
+                    account_id,
+                    mailbox.name,
+                    len(new_email_ids),
+                )
+                # 异步检测邮件，不阻塞主流程
+                await self._phishing_detection_service.detect_emails_async(
+                    new_email_ids
+                )
+
+        await self._email_account_crud.update_last_sync(account_id)
+
+        return SyncEmailsResponse(
+            success=True,
+            message=f"同步成功，获取{synced_total}封新邮件。",
+            synced_count=synced_total,
+        )
+
+    async def _iter_uid_pages(
+        self,
+        imap_client: ImapClient,
+        start_uid: int,
+        status: MailboxStatus,
+        latest_count: int,
+    ) -> AsyncIterator[List[int]]:
+        """按页产出当前文件夹待同步的UID。
+
+        Args:
+            imap_client: 已选中文件夹的IMAP客户端。
+            start_uid: 增量同步的起始UID（包含）。
+            status: 当前文件夹的STATUS结果。
+            latest_count: 首次同步时拉取的最新邮件数量，为0表示增量同步。
+
+        Yields:
+            按UID升序排列的非空UID列表。
+        """
+        if latest_count:
+            # 使用 fetch_latest_uids 直接获取最新的邮件，避免获取全部UID列表
+            uids = await imap_client.fetch_latest_uids(latest_count)
+            if uids:
+                yield uids
+            return
+
+        # 非首次同步：按UID区间分页增量获取新邮件
+        async for uids in imap_client.iter_uids_since(start_uid, status=status):
+            yield uids
+
+    def _build_payloads(self, fetched_emails, mailbox_name: str) -> List[dict]:
+        """构建同步写入的数据载荷。"""
+        payloads: List[dict] = []
+        for fetched in fetched_emails:
+            parsed = self._email_parser.parse(fetched.raw_bytes)
+            if not parsed:
+                continue
+            message_id = parsed.message_id or self._fallback_message_id(
+                mailbox_name, fetched.uid
+            )
+            payloads.append(
+                {
+                    "uid": fetched.uid,
+                    "flags": fetched.flags,
+                    "internal_date": fetched.internal_date,
+                    "size": fetched.size,
+                    "message_id": message_id,
+                    "subject": parsed.subject,
+                    "sender_name": parsed.sender_name,
+                    "sender_address": parsed.sender_address,
+                    "recipients": parsed.recipients,
+                    "content_text": parsed.content_text,
+                    "content_html": parsed.content_html,
+                    "snippet": parsed.snippet,
+                    "received_at": parsed.received_at or fetched.internal_date,
+                }
+            )
+        return payloads
+
+    def _fallback_message_id(self, mailbox_name: str, uid: int) -> str:
+        """生成缺失Message-ID时的替代值。"""
+        message_id = f"missing-{mailbox_name}-{uid}"
+        return message_id[:255]
+
+    def _chunk_list(self, values: List[int], chunk_size: int) -> List[List[int]]:
+        """将列表按指定大小切分为子列表。"""
+        return [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
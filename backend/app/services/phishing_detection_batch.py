@@ -0,0 +1,125 @@
+"""钓鱼检测批量任务辅助类。
+
+负责单次批量检测中的并发控制、检测结果分块写库与更新事件推送。
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.crud.email_body_crud import EmailBodyCrud
+from app.entities.email_entity import PhishingLevel, PhishingStatus
+from app.services.phishing_event_service import PhishingEventService
+
+# (用户ID, 待写入的检测结果行, 已序列化的事件数据)
+DetectionOutcome = Tuple[Optional[int], Dict[str, Any], Optional[str]]
+
+
+class PhishingDetectionBatch:
+    """单次批量检测的结果缓冲。
+
+    检测结果每攒满 flush_size 条写入一次数据库，写入成功后再推送该块
+    对应的更新事件，保证前端收到事件时数据库中已是最新结果。
+    """
+
+    def __init__(
+        self,
+        email_body_crud: EmailBodyCrud,
+        event_service: Optional[PhishingEventService],
+        semaphore: asyncio.Semaphore,
+        logger: logging.Logger,
+        flush_size: int = 50,
+    ) -> None:
+        """初始化批量检测缓冲。
+
+        Args:
+            email_body_crud: 邮件正文与检测结果数据访问对象。
+            event_service: 钓鱼检测事件推送服务。
+            semaphore: 所有批量任务共享的检测并发信号量。
+            logger: 日志记录器。
+            flush_size: 每次写库的检测结果数量。
+        """
+        self._email_body_crud = email_body_crud
+        self._event_service = event_service
+        self._semaphore = semaphore
+        self._logger = logger
+        self._flush_size = max(1, flush_size)
+        self._pending: List[DetectionOutcome] = []
+        # 用户ID为稀疏的自增BIGINT，且单批通常只涉及一个用户，集合比位图更合适
+        self.user_ids: Set[int] = set()
+
+    async def run_guarded(
+        self,
+        email_id: int,
+        detect: Callable[[], Awaitable[Optional[DetectionOutcome]]],
+    ) -> None:
+        """在并发上限内检测单封邮件，并缓冲其检测结果。
+
+        单封邮件的异常在此处记录并吞掉，避免TaskGroup取消同批其他检测。
+
+        Args:
+            email_id: 邮件ID。
+            detect: 创建单封检测协程的工厂函数，取得并发名额后才调用。
+        """
+        async with self._semaphore:
+            try:
+                outcome = await detect()
+            except Exception as e:
+                self._logger.error("检测邮件 %s 失败: %s", email_id, e, exc_info=True)
+                return
+        if outcome is None:
+            return
+        self._pending.append(outcome)
+        if len(self._pending) >= self._flush_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """写入缓冲中的检测结果，写入成功后推送对应的更新事件。"""
+        if not self._pending:
+            return
+        # 先整体取出缓冲，写库期间完成的检测进入新的缓冲
+        outcomes, self._pending = self._pending, []
+        self.user_ids.update(user_id for user_id, _, _ in outcomes if user_id)
+        try:
+            await self._email_body_crud.bulk_update_phishing_results(
+                [row for _, row, _ in outcomes]
+            )
+        except Exception as e:
+            self._logger.error("批量写入检测结果失败: %s", e, exc_info=True)
+            return
+
+        if not self._event_service:
+            return
+        for user_id, _, payload in outcomes:
+            if user_id and payload is not None:
+                await self._event_service.publish_detection_update(
+                    user_id=user_id, payload=payload
+                )
+
+    @classmethod
+    def build_update_row(cls, message_id: int, result) -> Dict[str, Any]:
+        """构建批量写库所需的检测结果行。
+
+        Args:
+            message_id: 邮件消息ID（email_messages表ID）。
+            result: 钓鱼检测结果。
+
+        Returns:
+            以主键为条件的更新数据字典。
+        """
+        return {
+            "id": message_id,
+            "phishing_level": cls.map_phishing_level(result.level.value),
+            "phishing_score": result.score,
+            "phishing_reason": result.reason,
+            "phishing_status": PhishingStatus.COMPLETED,
+        }
+
+    @staticmethod
+    def map_phishing_level(level: str) -> PhishingLevel:
+        """映射钓鱼检测等级到数据库枚举。
+
+        检测器等级名称与数据库枚举成员名一致，直接查询枚举的成员字典，
+        未知等级回退为正常。
+        """
+        return PhishingLevel.__members__.get(level, PhishingLevel.NORMAL)
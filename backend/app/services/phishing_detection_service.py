@@ -6,19 +6,28 @@
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any, Set
+from functools import partial
+from itertools import chain
+from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime
 
-from app.crud.email_crud import EmailCrud
-from app.entities.email_entity import PhishingLevel, PhishingStatus
+from app.crud.email_body_crud import EmailBodyCrud
+from app.entities.email_entity import EmailEntity, PhishingStatus
+from app.entities.mailbox_message_entity import MailboxMessageEntity
 from app.utils.phishing import PhishingDetectorInterface
 from app.utils.phishing.phishing_detector_interface import (
     PhishingResult,
     PhishingLevel as DetectorPhishingLevel,
 )
+from app.services.phishing_detection_batch import (
+    DetectionOutcome,
+    PhishingDetectionBatch,
+)
 from app.services.phishing_event_service import PhishingEventService
 from app.services.url_whitelist_service import UrlWhitelistMatcher
 from app.services.sender_whitelist_service import SenderWhitelistMatcher
+from app.utils.json_codec import JsonCodec
+from app.utils.task_coalescer import TaskCoalescer
 
 
 class PhishingDetectionService:
@@ -30,32 +39,46 @@ class PhishingDetectionService:
     - 所有URL都在白名单中：直接判断为正常邮件，置信度为0
     """
 
+    # 正文总长度超过该值（字符数）时，URL提取放到线程池执行
+    _URL_EXTRACT_OFFLOAD_SIZE = 16 * 1024
+    # 批量检测每攒满该数量的结果写库一次，并随后推送对应的更新事件
+    _FLUSH_SIZE = 50
+
     def __init__(
         self,
-        email_crud: EmailCrud,
+        email_body_crud: EmailBodyCrud,
         phishing_detector: PhishingDetectorInterface,
         event_service: Optional[PhishingEventService],
         url_whitelist_matcher: Optional[UrlWhitelistMatcher],
         sender_whitelist_matcher: Optional[SenderWhitelistMatcher],
         logger: logging.Logger,
+        max_inflight: int = 8,
     ):
         """初始化钓鱼检测服务。
 
         Args:
-            email_crud: 邮件数据访问对象。
+            email_body_crud: 邮件正文与检测结果数据访问对象。
             phishing_detector: 钓鱼检测器。
             event_service: 钓鱼检测事件推送服务。
             url_whitelist_matcher: URL白名单匹配器。
             sender_whitelist_matcher: 发件人白名单匹配器。
             logger: 日志记录器。
+            max_inflight: 全局同时进行的单封邮件检测数量上限，
+                应与检测器可承受的并发量一致；小于1时按1处理。
         """
-        self._email_crud = email_crud
+        self._email_body_crud = email_body_crud
         self._phishing_detector = phishing_detector
         self._event_service = event_service
         self._url_whitelist_matcher = url_whitelist_matcher
         self._sender_whitelist_matcher = sender_whitelist_matcher
         self._logger = logger
-        self._detection_tasks: Dict[int, asyncio.Task] = {}  # 跟踪正在运行的检测任务
+        # 按邮件ID合并进行中的检测，避免同一邮件重复调用检测器
+        self._detection_coalescer: TaskCoalescer[PhishingResult] = TaskCoalescer()
+        # 运行中的批量检测任务，持有引用避免后台任务在执行中被垃圾回收
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # 所有批量任务共享的检测并发上限，避免压垮检测器与数据库连接池；
+        # 配置为0时信号量永远无法获取，负数则直接报错，因此至少保留1个并发
+        self._detect_sem = asyncio.Semaphore(max(1, max_inflight))
 
     async def detect_emails_async(
         self,
@@ -64,15 +87,17 @@ class PhishingDetectionService:
     ) -> None:
         """异步检测邮件列表。
 
-        在后台检测邮件，不阻塞主流程。每检测完一封邮件，立即更新数据库。
+        在后台检测邮件，不阻塞主流程。检测结果按块写入数据库。
 
         Args:
             email_ids: 要检测的邮件ID列表。
             callback: 可选的回调函数，每检测完一封邮件时调用 callback(email_id, result)
         """
         task = asyncio.create_task(self._detect_and_update_batch(email_ids, callback))
-        # 不await，让任务在后台运行
-        self._logger.info(f"启动后台检测任务，共 {len(email_ids)} 封邮件")
+        # 不await，让任务在后台运行；事件循环只弱引用任务，需自行持有到完成
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        self._logger.info("启动后台检测任务，共 %d 封邮件", len(email_ids))
 
     async def _detect_and_update_batch(
         self,
@@ -85,27 +110,68 @@ class PhishingDetectionService:
             email_ids: 要检测的邮件ID列表。
             callback: 回调函数。
         """
-        user_ids: Set[int] = set()
+        batch = PhishingDetectionBatch(
+            self._email_body_crud,
+            self._event_service,
+            self._detect_sem,
+            self._logger,
+            flush_size=self._FLUSH_SIZE,
+        )
         try:
-            for email_id in email_ids:
-                try:
-                    user_id = await self._detect_and_update_single(email_id, callback)
-                    if user_id:
-                        user_ids.add(user_id)
-                except Exception as e:
-                    self._logger.error(
-                        f"检测邮件 {email_id} 失败: {str(e)}", exc_info=True
+            # 一次查询预取整批邮件（含正文与账户），同时预热白名单规则，
+            # 避免并发检测时各自触发规则加载
+            try:
+                mailbox_messages, _ = await asyncio.gather(
+                    self._email_body_crud.get_many_with_body_and_account(email_ids),
+                    self._warm_whitelist_rules(),
+                )
+            except Exception:
+                self._logger.exception("预取待检测邮件失败，共 %d 封", len(email_ids))
+                return
+            message_map = {mm.id: mm for mm in mailbox_messages}
+            async with asyncio.TaskGroup() as tg:
+                for email_id in email_ids:
+                    tg.create_task(
+                        batch.run_guarded(
+                            email_id,
+                            partial(
+                                self._detect_and_update_single,
+                                email_id,
+                                message_map.get(email_id),
+                                callback,
+                            ),
+                        )
                     )
         finally:
-            self._logger.info(f"后台检测任务完成，共处理 {len(email_ids)} 封邮件")
-            await self._notify_batch_completed(user_ids, len(email_ids))
+            # 批量任务被中途取消时，仍写入已完成的部分
+            await batch.flush()
+            self._logger.info("后台检测任务完成，共处理 %d 封邮件", len(email_ids))
+            await self._notify_batch_completed(batch.user_ids, len(email_ids))
+
+    async def _warm_whitelist_rules(self) -> None:
+        """预先加载白名单规则，加载失败时留给单封检测时重试。"""
+        matchers = [
+            matcher
+            for matcher in (self._sender_whitelist_matcher, self._url_whitelist_matcher)
+            if matcher
+        ]
+        results = await asyncio.gather(
+            *(matcher.ensure_rules_loaded() for matcher in matchers),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.warning("预加载白名单规则失败: %s", result)
 
     async def _detect_and_update_single(
         self,
         email_id: int,
+        mailbox_message: Optional[MailboxMessageEntity],
         callback: Optional[callable] = None,
-    ) -> Optional[int]:
-        """检测并更新单封邮件。
+    ) -> Optional[DetectionOutcome]:
+        """检测单封邮件并生成待写入的检测结果。
+
+        检测结果不在此处写库，而是交给批量任务分块写入，写库后再推送事件。
 
         检测顺序：
         1. 检查发件人是否在白名单中
@@ -114,44 +180,30 @@ class PhishingDetectionService:
 
         Args:
             email_id: 邮件ID。
+            mailbox_message: 已预加载正文与账户的邮件实体，不存在时为None。
             callback: 回调函数。
 
         Returns:
-            对应的用户ID，失败返回None。
+            (用户ID, 待写入的检测结果, 事件数据) 元组；邮件不存在，或同一邮件
+            已有进行中的检测（由其发起方负责写库与推送）时返回None。
         """
-        # 获取邮件详情
-        mailbox_message = await self._email_crud.get_by_id(email_id)
         if not mailbox_message or not mailbox_message.message:
-            self._logger.warning(f"邮件 {email_id} 不存在，跳过检测")
+            self._logger.warning("邮件 %s 不存在，跳过检测", email_id)
             return None
 
         message = mailbox_message.message
-        body = message.body
         user_id = message.email_account.user_id if message.email_account else None
 
-        sender_address = message.sender_address or ""
-        content_html = body.content_html if body else None
-
-        # 检查白名单
-        result = await self._check_whitelist_and_detect(
-            sender=sender_address,
-            subject=message.subject,
-            content_text=body.content_text if body else None,
-            content_html=content_html,
-        )
-
-        # 更新数据库
-        phishing_level = self._map_phishing_level(result.level.value)
-        await self._email_crud.update_phishing_result(
-            message_id=message.id,
-            phishing_level=phishing_level,
-            phishing_score=result.score,
-            phishing_reason=result.reason,
-            phishing_status=PhishingStatus.COMPLETED,
-        )
+        # 检查白名单并检测（同一邮件的并发检测会被合并）
+        result, is_owner = await self._detect_coalesced(email_id, message)
+        if not is_owner:
+            return None
 
         self._logger.debug(
-            f"邮件 {email_id} 检测完成: level={result.level.value}, score={result.score}"
+            "邮件 %s 检测完成: level=%s, score=%s",
+            email_id,
+            result.level.value,
+            result.score,
         )
 
         # 调用回调函数（用于实时推送）
@@ -159,16 +211,38 @@ class PhishingDetectionService:
             try:
                 await callback(email_id, result)
             except Exception as e:
-                self._logger.error(f"回调函数执行失败: {str(e)}", exc_info=True)
+                self._logger.error("回调函数执行失败: %s", e, exc_info=True)
 
-        # 推送检测结果更新事件
-        if self._event_service and user_id:
-            await self._event_service.publish_detection_update(
-                user_id=user_id,
-                payload=self._build_event_payload(email_id, result),
-            )
+        payload = (
+            self._build_event_payload(email_id, result)
+            if self._event_service and user_id
+            else None
+        )
+        return user_id, PhishingDetectionBatch.build_update_row(message.id, result), payload
 
-        return user_id
+    async def _detect_coalesced(
+        self, email_id: int, message: EmailEntity
+    ) -> Tuple[PhishingResult, bool]:
+        """执行检测，并合并同一邮件的并发检测请求。
+
+        Args:
+            email_id: 邮件ID（mailbox_messages表ID）。
+            message: 已预加载正文的邮件元数据实体。
+
+        Returns:
+            (检测结果, 是否为本次检测的发起方) 元组。
+        """
+        body = message.body
+        return await self._detection_coalescer.run(
+            email_id,
+            partial(
+                self._check_whitelist_and_detect,
+                sender=message.sender_address or "",
+                subject=message.subject,
+                content_text=body.content_text if body else None,
+                content_html=body.content_html if body else None,
+            ),
+        )
 
     async def _check_whitelist_and_detect(
         self,
@@ -180,6 +254,7 @@ class PhishingDetectionService:
         """检查白名单并决定是否执行检测。
 
         检测顺序：
+        0. 主题与正文均为空 -> 直接返回正常
         1. 检查发件人是否在白名单中 -> 直接返回正常
         2. 检查所有URL是否都在白名单中 -> 直接返回正常
         3. 否则执行正常检测
@@ -193,43 +268,43 @@ class PhishingDetectionService:
         Returns:
             钓鱼检测结果。
         """
+        # 主题与正文均为空时没有可供检测的内容，无需调用检测器
+        if not (
+            (subject and subject.strip())
+            or (content_text and content_text.strip())
+            or (content_html and content_html.strip())
+        ):
+            return PhishingResult(
+                level=DetectorPhishingLevel.NORMAL,
+                score=0.0,
+                reason="邮件内容为空，无需检测",
+            )
+
         # 1. 检查发件人是否在白名单中
         if self._sender_whitelist_matcher:
             try:
                 if await self._sender_whitelist_matcher.is_sender_whitelisted(sender):
-                    self._logger.info(f"发件人 {sender} 在白名单中，跳过检测")
+                    self._logger.info("发件人 %s 在白名单中，跳过检测", sender)
                     return PhishingResult(
                         level=DetectorPhishingLevel.NORMAL,
                         score=0.0,
                         reason="发件人在白名单中，无需检测",
                     )
             except Exception as e:
-                self._logger.error(f"检查发件人白名单失败: {str(e)}", exc_info=True)
+                self._logger.error("检查发件人白名单失败: %s", e, exc_info=True)
 
         # 2. 检查所有URL是否都在白名单中（同时检测HTML超链接和纯文本URL）
         if self._url_whitelist_matcher:
             try:
-                # 合并提取：HTML超链接(<a href>) + 纯文本URL
-                # 忽略资源链接（图片/CSS/JS等）
-                urls = set()
-                if content_html:
-                    urls.update(
-                        UrlWhitelistMatcher.extract_urls_from_html(content_html)
-                    )
-                if content_text:
-                    urls.update(
-                        UrlWhitelistMatcher.extract_urls_from_text(content_text)
-                    )
+                urls = await self._extract_urls(content_text, content_html)
 
                 if urls:
                     all_whitelisted = (
-                        await self._url_whitelist_matcher.check_urls_whitelisted(
-                            list(urls)
-                        )
+                        await self._url_whitelist_matcher.check_urls_whitelisted(urls)
                     )
                     if all_whitelisted:
                         self._logger.info(
-                            f"邮件中的所有URL ({len(urls)}个) 都在白名单中，跳过检测"
+                            "邮件中的所有URL (%d个) 都在白名单中，跳过检测", len(urls)
                         )
                         return PhishingResult(
                             level=DetectorPhishingLevel.NORMAL,
@@ -237,7 +312,7 @@ class PhishingDetectionService:
                             reason=f"邮件中的所有链接 ({len(urls)}个) 都在白名单中，无需检测",
                         )
             except Exception as e:
-                self._logger.error(f"检查URL白名单失败: {str(e)}", exc_info=True)
+                self._logger.error("检查URL白名单失败: %s", e, exc_info=True)
 
         # 3. 执行正常检测
         return await self._phishing_detector.detect(
@@ -247,6 +322,55 @@ class PhishingDetectionService:
             content_html=content_html,
         )
 
+    async def _extract_urls(
+        self, content_text: Optional[str], content_html: Optional[str]
+    ) -> List[str]:
+        """提取邮件中用户可点击的URL。
+
+        合并提取HTML超链接(<a href>)与纯文本URL，忽略资源链接（图片/CSS/JS等）。
+        正文较大时在线程池中执行正则扫描，避免阻塞事件循环。
+
+        Args:
+            content_text: 纯文本内容。
+            content_html: HTML内容。
+
+        Returns:
+            去重后的URL列表。
+        """
+        size = len(content_text or "") + len(content_html or "")
+        if size > self._URL_EXTRACT_OFFLOAD_SIZE:
+            return await asyncio.to_thread(
+                self._extract_urls_sync, content_text, content_html
+            )
+        return self._extract_urls_sync(content_text, content_html)
+
+    @staticmethod
+    def _extract_urls_sync(
+        content_text: Optional[str], content_html: Optional[str]
+    ) -> List[str]:
+        """同步提取邮件中的URL。
+
+        Args:
+            content_text: 纯文本内容。
+            content_html: HTML内容。
+
+        Returns:
+            去重后的URL列表。
+        """
+        # dict.fromkeys 一次完成去重，并保持出现顺序，便于日志对照
+        return list(
+            dict.fromkeys(
+                chain(
+                    UrlWhitelistMatcher.extract_urls_from_html(content_html)
+                    if content_html
+                    else (),
+                    UrlWhitelistMatcher.extract_urls_from_text(content_text)
+                    if content_text
+                    else (),
+                )
+            )
+        )
+
     async def detect_single_email(
         self,
         email_id: int,
@@ -265,24 +389,24 @@ class PhishingDetectionService:
             检测结果字典，失败返回None。
         """
         try:
-            mailbox_message = await self._email_crud.get_by_id(email_id)
+            mailbox_message = await self._email_body_crud.get_with_body_and_account(
+                email_id
+            )
             if not mailbox_message or not mailbox_message.message:
                 return None
 
             message = mailbox_message.message
-            body = message.body
 
-            # 使用白名单检测
-            result = await self._check_whitelist_and_detect(
-                sender=message.sender_address or "",
-                subject=message.subject,
-                content_text=body.content_text if body else None,
-                content_html=body.content_html if body else None,
-            )
+            # 使用白名单检测（与进行中的同一邮件检测合并）
+            result, is_owner = await self._detect_coalesced(email_id, message)
+            if not is_owner:
+                return self._build_result_dict(email_id, result)
 
             # 更新数据库
-            phishing_level = self._map_phishing_level(result.level.value)
-            await self._email_crud.update_phishing_result(
+            phishing_level = PhishingDetectionBatch.map_phishing_level(
+                result.level.value
+            )
+            await self._email_body_crud.update_phishing_result(
                 message_id=message.id,
                 phishing_level=phishing_level,
                 phishing_score=result.score,
@@ -296,14 +420,9 @@ class PhishingDetectionService:
                     payload=self._build_event_payload(email_id, result),
                 )
 
-            return {
-                "email_id": email_id,
-                "phishing_level": result.level.value,
-                "phishing_score": result.score,
-                "phishing_reason": result.reason,
-            }
+            return self._build_result_dict(email_id, result)
         except Exception as e:
-            self._logger.error(f"检测邮件 {email_id} 失败: {str(e)}", exc_info=True)
+            self._logger.error("检测邮件 %s 失败: %s", email_id, e, exc_info=True)
             return None
 
     async def _notify_batch_completed(self, user_ids: Set[int], count: int) -> None:
@@ -313,40 +432,51 @@ class PhishingDetectionService:
             user_ids: 用户ID集合。
             count: 本次检测邮件数量。
         """
-        if not self._event_service:
+        if not self._event_service or not user_ids:
             return
 
-        for user_id in user_ids:
-            await self._event_service.publish_batch_completed(
-                user_id=user_id,
-                payload={"total": count},
-            )
+        await self._event_service.publish_batch_completed_many(
+            user_ids=user_ids,
+            payload={"total": count},
+        )
 
     @staticmethod
-    def _build_event_payload(email_id: int, result) -> Dict[str, Any]:
+    def _build_event_payload(email_id: int, result) -> str:
         """构建SSE事件数据。
 
+        事件数据在此处一次性序列化为JSON字符串，推送服务无需重复编码。
+
+        Args:
+            email_id: 邮件ID（mailbox_messages表ID）。
+            result: 钓鱼检测结果。
+
+        Returns:
+            已序列化的事件数据JSON字符串。
+        """
+        return JsonCodec.dumps(
+            {
+                "email_id": email_id,
+                "phishing_level": result.level.value,
+                "phishing_score": result.score,
+                "phishing_status": PhishingStatus.COMPLETED.value,
+                "phishing_reason": result.reason,
+            }
+        )
+
+    @staticmethod
+    def _build_result_dict(email_id: int, result) -> Dict[str, Any]:
+        """构建单封检测接口的返回数据。
+
         Args:
             email_id: 邮件ID（mailbox_messages表ID）。
             result: 钓鱼检测结果。
 
         Returns:
-            事件数据字典。
+            检测结果字典。
         """
         return {
             "email_id": email_id,
             "phishing_level": result.level.value,
             "phishing_score": result.score,
-            "phishing_status": PhishingStatus.COMPLETED.value,
             "phishing_reason": result.reason,
         }
-
-    @staticmethod
-    def _map_phishing_level(level: str) -> PhishingLevel:
-        """映射钓鱼检测等级到数据库枚举。"""
-        level_map = {
-            "NORMAL": PhishingLevel.NORMAL,
-            "SUSPICIOUS": PhishingLevel.SUSPICIOUS,
-            "HIGH_RISK": PhishingLevel.HIGH_RISK,
-        }
-        return level_map.get(level, PhishingLevel.NORMAL)
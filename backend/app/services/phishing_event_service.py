@@ -6,9 +6,10 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.utils.json_codec import JsonCodec
 
 
 class PhishingEventService:
@@ -17,15 +18,27 @@ class PhishingEventService:
     维护每个用户的SSE连接队列，并支持发送检测结果更新事件。
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        flush_interval: float = 0.05,
+    ) -> None:
         """初始化事件推送服务。
 
         Args:
             logger: 日志记录器。
+            flush_interval: 检测结果更新事件的合并推送间隔（秒）。
         """
         self._logger = logger or logging.getLogger(self.__class__.__name__)
-        self._connections: Dict[int, List[asyncio.Queue[str]]] = {}
+        # 连接队列以不可变元组保存，注册与注销时整体替换（写时复制），
+        # 广播时直接读取当前元组，无需加锁
+        self._connections: Dict[int, Tuple[asyncio.Queue[str], ...]] = {}
+        # 仅用于串行化注册与注销
         self._lock = asyncio.Lock()
+        self._flush_interval = flush_interval
+        # 用户ID -> 待推送的检测结果更新SSE消息
+        self._pending_updates: Dict[int, List[str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def register(self, user_id: int) -> asyncio.Queue[str]:
         """注册用户SSE连接。
@@ -38,7 +51,7 @@ class PhishingEventService:
         """
         queue: asyncio.Queue[str] = asyncio.Queue(maxsize=100)
         async with self._lock:
-            self._connections.setdefault(user_id, []).append(queue)
+            self._connections[user_id] = self._connections.get(user_id, ()) + (queue,)
             self._logger.info(
                 "SSE连接注册: user_id=%s, total=%d",
                 user_id,
@@ -54,33 +67,80 @@ class PhishingEventService:
             queue: 推送队列。
         """
         async with self._lock:
-            queues = self._connections.get(user_id, [])
-            if queue in queues:
-                queues.remove(queue)
-            if not queues:
+            queues = tuple(
+                item for item in self._connections.get(user_id, ()) if item is not queue
+            )
+            if queues:
+                self._connections[user_id] = queues
+            else:
                 self._connections.pop(user_id, None)
             self._logger.info("SSE连接注销: user_id=%s", user_id)
 
-    async def publish_detection_update(self, user_id: int, payload: Dict[str, Any]) -> None:
+    async def publish_detection_update(
+        self, user_id: int, payload: Union[Dict[str, Any], str]
+    ) -> None:
         """推送检测结果更新事件。
 
+        事件先按用户缓冲，在 flush_interval 内到达的多条事件合并为一次入队，
+        每条事件仍保持独立的SSE帧，前端无需改动。
+
         Args:
             user_id: 用户ID。
-            payload: 事件数据。
+            payload: 事件数据，可以是字典或已序列化的JSON字符串。
         """
         message = self._format_sse("phishing_update", payload)
-        await self._broadcast(user_id, message)
+        self._pending_updates.setdefault(user_id, []).append(message)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
 
     async def publish_batch_completed(self, user_id: int, payload: Dict[str, Any]) -> None:
         """推送批量检测完成事件。
 
+        推送前先立即下发缓冲中的更新事件，保证完成事件排在最后。
+
         Args:
             user_id: 用户ID。
             payload: 事件数据。
         """
+        await self._flush_pending_updates()
         message = self._format_sse("phishing_batch_completed", payload)
         await self._broadcast(user_id, message)
 
+    async def publish_batch_completed_many(
+        self, user_ids: Iterable[int], payload: Dict[str, Any]
+    ) -> None:
+        """向多个用户推送同一批量检测完成事件。
+
+        事件只序列化一次。推送前先立即下发缓冲中的更新事件。
+
+        Args:
+            user_ids: 用户ID集合。
+            payload: 事件数据。
+        """
+        await self._flush_pending_updates()
+        message = self._format_sse("phishing_batch_completed", payload)
+        connections = self._connections
+        for user_id in user_ids:
+            queues = connections.get(user_id)
+            if queues:
+                self._put_to_queues(user_id, queues, message)
+
+    async def _flush_later(self) -> None:
+        """等待合并间隔后下发缓冲中的更新事件。"""
+        try:
+            await asyncio.sleep(self._flush_interval)
+        finally:
+            self._flush_task = None
+        await self._flush_pending_updates()
+
+    async def _flush_pending_updates(self) -> None:
+        """下发缓冲中的更新事件，每个用户的多条事件拼接为一条队列消息。"""
+        if not self._pending_updates:
+            return
+        pending, self._pending_updates = self._pending_updates, {}
+        for user_id, messages in pending.items():
+            await self._broadcast(user_id, "".join(messages))
+
     async def _broadcast(self, user_id: int, message: str) -> None:
         """向指定用户广播事件。
 
@@ -88,12 +148,22 @@ class PhishingEventService:
             user_id: 用户ID。
             message: SSE消息。
         """
-        async with self._lock:
-            queues = list(self._connections.get(user_id, []))
-
+        queues = self._connections.get(user_id)
         if not queues:
             return
 
+        self._put_to_queues(user_id, queues, message)
+
+    def _put_to_queues(
+        self, user_id: int, queues: Tuple[asyncio.Queue[str], ...], message: str
+    ) -> None:
+        """将消息放入连接队列，队列已满时丢弃最旧的消息。
+
+        Args:
+            user_id: 用户ID。
+            queues: 推送队列列表。
+            message: SSE消息。
+        """
         for queue in queues:
             if queue.full():
                 try:
@@ -105,15 +175,15 @@ class PhishingEventService:
             except asyncio.QueueFull:
                 self._logger.debug("SSE队列已满，跳过推送: user_id=%s", user_id)
 
-    def _format_sse(self, event: str, data: Dict[str, Any]) -> str:
+    def _format_sse(self, event: str, data: Union[Dict[str, Any], str]) -> str:
         """格式化SSE消息。
 
         Args:
             event: 事件名称。
-            data: 事件数据。
+            data: 事件数据，已序列化的JSON字符串将直接使用。
 
         Returns:
             SSE格式的字符串。
         """
-        payload = json.dumps(data, ensure_ascii=True)
+        payload = data if isinstance(data, str) else JsonCodec.dumps(data)
         return f"event: {event}\ndata: {payload}\n\n"
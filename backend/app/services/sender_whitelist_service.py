@@ -3,11 +3,12 @@
 提供发件人邮箱地址规则匹配功能，支持多种匹配规则。
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import FrozenSet, Optional
 
 from app.crud.sender_whitelist_crud import SenderWhitelistCrud
-from app.entities.sender_whitelist_entity import SenderWhitelistEntity
+from app.utils.domain_rule_set import DomainRuleSet
 
 
 class SenderWhitelistMatcher:
@@ -39,12 +40,49 @@ class SenderWhitelistMatcher:
         """
         self._whitelist_crud = whitelist_crud
         self._logger = logger or logging.getLogger(self.__class__.__name__)
-        self._cached_rules: Optional[List[SenderWhitelistEntity]] = None
+        self._emails: FrozenSet[str] = frozenset()
+        self._domain_rules: Optional[DomainRuleSet] = None
+        self._rule_version = -1
+        self._refresh_lock = asyncio.Lock()
 
     async def refresh_rules(self) -> None:
-        """刷新规则缓存。"""
-        self._cached_rules = await self._whitelist_crud.get_all_active()
-        self._logger.info(f"刷新发件人白名单规则缓存，共 {len(self._cached_rules)} 条规则")
+        """刷新规则缓存。
+
+        将规则预编译为按类型分桶的哈希结构，匹配时无需逐条遍历。
+        """
+        # 先记录版本号，查询期间有规则写入时下次仍会重新加载
+        version = self._whitelist_crud.version
+        rules = await self._whitelist_crud.get_all_active()
+        self._emails = frozenset(
+            rule.rule_value.strip().lower()
+            for rule in rules
+            if rule.rule_type == self.RULE_EMAIL and rule.rule_value
+        )
+        self._domain_rules = DomainRuleSet.build(rules)
+        self._rule_version = version
+        self._logger.info(f"刷新发件人白名单规则缓存，共 {len(rules)} 条规则")
+
+    async def ensure_rules_loaded(self) -> None:
+        """确保已加载最新的规则。
+
+        规则被管理员增删改后重新加载。并发调用时只有一个协程查询数据库，
+        其余协程等待其完成。
+        """
+        if self._is_stale():
+            async with self._refresh_lock:
+                if self._is_stale():
+                    await self.refresh_rules()
+
+    def _is_stale(self) -> bool:
+        """判断规则缓存是否未加载或已过期。
+
+        Returns:
+            需要重新加载返回True。
+        """
+        return (
+            self._domain_rules is None
+            or self._rule_version != self._whitelist_crud.version
+        )
 
     async def is_sender_whitelisted(self, sender_email: str) -> bool:
         """检查发件人邮箱是否在白名单中。
@@ -58,26 +96,24 @@ class SenderWhitelistMatcher:
         if not sender_email:
             return False
 
-        # 标准化邮箱地址
+        # 标准化邮箱地址（仅此一次，规则值已在刷新时统一转为小写）
         sender_email = sender_email.lower().strip()
 
-        # 提取域名
-        domain = self.extract_domain(sender_email)
+        # 提取域名，地址已是小写，无需再经 extract_domain 转换
+        domain = sender_email.rpartition("@")[2] if "@" in sender_email else None
         if not domain:
             return False
 
         # 获取规则（使用缓存或重新加载）
-        if self._cached_rules is None:
-            await self.refresh_rules()
-
-        rules = self._cached_rules or []
+        await self.ensure_rules_loaded()
 
-        for rule in rules:
-            if self._match_rule(sender_email, domain, rule.rule_type, rule.rule_value):
-                self._logger.debug(
-                    f"发件人 '{sender_email}' 匹配白名单规则: {rule.rule_type}:{rule.rule_value}"
-                )
-                return True
+        if sender_email in self._emails:
+            matched = f"{self.RULE_EMAIL}:{sender_email}"
+        else:
+            matched = self._domain_rules.match(domain)
+        if matched:
+            self._logger.debug(f"发件人 '{sender_email}' 匹配白名单规则: {matched}")
+            return True
 
         return False
 
@@ -97,44 +133,3 @@ class SenderWhitelistMatcher:
             return None
         except Exception:
             return None
-
-    def _match_rule(
-        self, email: str, domain: str, rule_type: str, rule_value: str
-    ) -> bool:
-        """检查邮箱/域名是否匹配规则。
-
-        Args:
-            email: 完整的邮箱地址。
-            domain: 邮箱域名。
-            rule_type: 规则类型。
-            rule_value: 规则值。
-
-        Returns:
-            是否匹配。
-        """
-        email = email.lower()
-        domain = domain.lower()
-        rule_value = rule_value.lower()
-
-        if rule_type == self.RULE_EMAIL:
-            # 精确匹配完整邮箱地址
-            return email == rule_value
-
-        elif rule_type == self.RULE_DOMAIN:
-            # 精确匹配域名
-            return domain == rule_value
-
-        elif rule_type == self.RULE_DOMAIN_SUFFIX:
-            # 后缀匹配
-            # 例如: mail.qq.com 匹配 qq.com
-            if domain == rule_value:
-                return True
-            if domain.endswith("." + rule_value):
-                return True
-            return False
-
-        elif rule_type == self.RULE_DOMAIN_KEYWORD:
-            # 关键词匹配
-            return rule_value in domain
-
-        return False
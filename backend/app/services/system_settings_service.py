@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
 from app.crud.system_settings_crud import SystemSettingsCrud
 from app.entities.system_settings_entity import SystemSettingsEntity
@@ -31,9 +31,9 @@ class SystemSettingsService:
         """
         self._settings_crud = settings_crud
         self._logger = logger
-        self._cache_ttl_seconds = max(cache_ttl_seconds, 1)
-        self._cached_settings: Optional[SystemSettingsEntity] = None
-        self._cache_expires_at = 0.0
+        self._cache_ttl_ns = max(cache_ttl_seconds, 1) * 1_000_000_000
+        # (设置实体, 过期时间纳秒)，整体重新绑定，读取时不会看到半更新状态
+        self._cache: Optional[Tuple[SystemSettingsEntity, int]] = None
 
     async def get_settings(self, force_refresh: bool = False) -> SystemSettingsEntity:
         """获取系统设置，必要时刷新缓存。
@@ -44,17 +44,16 @@ class SystemSettingsService:
         Returns:
             系统设置实体。
         """
-        now = time.monotonic()
+        cache = self._cache
         if (
             not force_refresh
-            and self._cached_settings is not None
-            and now < self._cache_expires_at
+            and cache is not None
+            and time.monotonic_ns() < cache[1]
         ):
-            return self._cached_settings
+            return cache[0]
 
         settings = await self._settings_crud.get_or_create_default()
-        self._cached_settings = settings
-        self._cache_expires_at = now + self._cache_ttl_seconds
+        self._store(settings)
         return settings
 
     async def update_settings(
@@ -72,8 +71,7 @@ class SystemSettingsService:
         settings = await self._settings_crud.update_settings(
             enable_long_url_detection=enable_long_url_detection
         )
-        self._cached_settings = settings
-        self._cache_expires_at = time.monotonic() + self._cache_ttl_seconds
+        self._store(settings)
 
         self._logger.info(
             "系统设置已更新: enable_long_url_detection=%s",
@@ -100,6 +98,15 @@ class SystemSettingsService:
         Returns:
             长链接检测开关状态。
         """
-        if self._cached_settings is None:
+        cache = self._cache
+        if cache is None:
             return default
-        return self._cached_settings.enable_long_url_detection
+        return cache[0].enable_long_url_detection
+
+    def _store(self, settings: SystemSettingsEntity) -> None:
+        """写入设置缓存。
+
+        Args:
+            settings: 系统设置实体。
+        """
+        self._cache = (settings, time.monotonic_ns() + self._cache_ttl_ns)
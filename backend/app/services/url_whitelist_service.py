@@ -3,13 +3,27 @@
 提供URL域名规则匹配功能，支持Clash风格的域名规则。
 """
 
+import asyncio
 import logging
 import re
 from typing import List, Optional
-from urllib.parse import urlparse
 
 from app.crud.url_whitelist_crud import UrlWhitelistCrud
-from app.entities.url_whitelist_entity import UrlWhitelistEntity
+from app.utils.domain_rule_set import DomainRuleSet
+
+try:
+    # google-re2 基于DFA，匹配耗时与输入长度线性相关，长HTML正文下更稳定
+    import re2 as _regex
+except ModuleNotFoundError:
+    # 未安装google-re2时回退到标准库re。
+    _regex = re
+
+# 只匹配 <a 标签中的 href 属性（两种引擎均支持内联 (?i) 标志）
+_HREF_RE = _regex.compile(
+    r'(?i)<a\s+[^>]*href\s*=\s*["\']?(https?://[^"\'>\s]+)'
+)
+# 纯文本中http/https开头的URL
+_TEXT_URL_RE = _regex.compile(r'(?i)https?://[^\s<>"\'()\[\]{}]+')
 
 
 class UrlWhitelistMatcher:
@@ -58,6 +72,8 @@ class UrlWhitelistMatcher:
         ".ppt",
         ".pptx",
     }
+    # 供 str.endswith 一次性判断的扩展名元组
+    _RESOURCE_EXTENSION_SUFFIXES = tuple(RESOURCE_EXTENSIONS)
 
     def __init__(
         self,
@@ -72,12 +88,21 @@ class UrlWhitelistMatcher:
         """
         self._whitelist_crud = whitelist_crud
         self._logger = logger or logging.getLogger(self.__class__.__name__)
-        self._cached_rules: Optional[List[UrlWhitelistEntity]] = None
+        self._rule_set: Optional[DomainRuleSet] = None
+        self._rule_version = -1
+        self._refresh_lock = asyncio.Lock()
 
     async def refresh_rules(self) -> None:
-        """刷新规则缓存。"""
-        self._cached_rules = await self._whitelist_crud.get_all_active()
-        self._logger.info(f"刷新白名单规则缓存，共 {len(self._cached_rules)} 条规则")
+        """刷新规则缓存。
+
+        将规则预编译为按类型分桶的哈希结构，匹配时无需逐条遍历。
+        """
+        # 先记录版本号，查询期间有规则写入时下次仍会重新加载
+        version = self._whitelist_crud.version
+        rules = await self._whitelist_crud.get_all_active()
+        self._rule_set = DomainRuleSet.build(rules)
+        self._rule_version = version
+        self._logger.info(f"刷新白名单规则缓存，共 {len(rules)} 条规则")
 
     async def is_url_whitelisted(self, url: str) -> bool:
         """检查URL是否在白名单中。
@@ -92,24 +117,19 @@ class UrlWhitelistMatcher:
         if not domain:
             return False
 
-        # 获取规则（使用缓存或重新加载）
-        if self._cached_rules is None:
-            await self.refresh_rules()
-
-        rules = self._cached_rules or []
-
-        for rule in rules:
-            if self._match_rule(domain, rule.rule_type, rule.rule_value):
-                self._logger.debug(
-                    f"URL '{url}' 匹配白名单规则: {rule.rule_type}:{rule.rule_value}"
-                )
-                return True
+        rule_set = await self._get_rule_set()
+        matched = rule_set.match(domain)
+        if matched:
+            self._logger.debug(f"URL '{url}' 匹配白名单规则: {matched}")
+            return True
 
         return False
 
     async def check_urls_whitelisted(self, urls: List[str]) -> bool:
         """检查URL列表是否全部在白名单中。
 
+        先将URL列表归并为去重后的域名集合，每个域名只解析和匹配一次。
+
         Args:
             urls: URL列表。
 
@@ -119,73 +139,87 @@ class UrlWhitelistMatcher:
         if not urls:
             return False
 
+        domains = set()
         for url in urls:
-            if not await self.is_url_whitelisted(url):
+            domain = self.extract_domain(url)
+            if not domain:
+                # 无法解析域名的URL视为不在白名单中
                 return False
+            domains.add(domain)
 
-        return True
+        rule_set = await self._get_rule_set()
+        return all(rule_set.match(domain) for domain in domains)
 
-    @staticmethod
-    def extract_domain(url: str) -> Optional[str]:
-        """从URL中提取域名部分。
+    async def ensure_rules_loaded(self) -> None:
+        """确保已加载最新的规则。
 
-        仅提取域名，不包含路径、查询参数等。
+        规则被管理员增删改后重新加载。并发调用时只有一个协程查询数据库，
+        其余协程等待其完成。
+        """
+        if self._is_stale():
+            async with self._refresh_lock:
+                if self._is_stale():
+                    await self.refresh_rules()
 
-        Args:
-            url: 完整的URL字符串。
+    def _is_stale(self) -> bool:
+        """判断规则缓存是否未加载或已过期。
 
         Returns:
-            域名字符串，如果解析失败返回None。
+            需要重新加载返回True。
         """
-        try:
-            # 如果没有协议前缀，添加http://以便解析
-            if not url.startswith(("http://", "https://")):
-                url = "http://" + url
+        return (
+            self._rule_set is None
+            or self._rule_version != self._whitelist_crud.version
+        )
 
-            parsed = urlparse(url)
-            hostname = parsed.hostname
+    async def _get_rule_set(self) -> DomainRuleSet:
+        """获取规则集合（使用缓存或重新加载）。
 
-            if hostname:
-                # 移除端口号（如果有）
-                return hostname.lower()
+        Returns:
+            预编译的规则集合。
+        """
+        await self.ensure_rules_loaded()
+        return self._rule_set
 
-            return None
-        except Exception:
-            return None
+    @staticmethod
+    def extract_domain(url: str) -> Optional[str]:
+        """从URL中提取域名部分。
 
-    def _match_rule(self, domain: str, rule_type: str, rule_value: str) -> bool:
-        """检查域名是否匹配规则。
+        仅提取域名，不包含路径、查询参数等。与浏览器一致，反斜杠视为路径分隔符，
+        因此 ``http://evil.com\\@good.com`` 的主机是 evil.com 而不是 good.com。
 
         Args:
-            domain: 要检查的域名。
-            rule_type: 规则类型。
-            rule_value: 规则值。
+            url: 完整的URL字符串。
 
         Returns:
-            是否匹配。
+            域名字符串，如果解析失败返回None。
         """
-        domain = domain.lower()
-        rule_value = rule_value.lower()
-
-        if rule_type == self.RULE_DOMAIN:
-            # 精确匹配
-            return domain == rule_value
-
-        elif rule_type == self.RULE_DOMAIN_SUFFIX:
-            # 后缀匹配
-            # 例如: mail.qq.com 匹配 qq.com
-            # 但 notqq.com 不应匹配 qq.com
-            if domain == rule_value:
-                return True
-            if domain.endswith("." + rule_value):
-                return True
-            return False
-
-        elif rule_type == self.RULE_DOMAIN_KEYWORD:
-            # 关键词匹配
-            return rule_value in domain
+        if not url:
+            return None
 
-        return False
+        # 直接切片取主机部分，避免完整解析scheme/path/query/fragment
+        rest = url.strip()
+        scheme_end = rest.find("://")
+        if scheme_end >= 0:
+            rest = rest[scheme_end + 3 :]
+
+        end = len(rest)
+        for separator in "/\\?#":
+            position = rest.find(separator, 0, end)
+            if position >= 0:
+                end = position
+        host = rest[:end]
+
+        # 去掉用户信息与端口号，IPv6地址去掉方括号
+        host = host[host.rfind("@") + 1 :]
+        if host.startswith("["):
+            close = host.find("]")
+            host = host[1:close] if close > 0 else ""
+        else:
+            host = host.partition(":")[0]
+
+        # 末尾的点表示完全限定域名，与不带点的域名等价
+        return host.rstrip(".").lower() or None
 
     @classmethod
     def is_resource_url(cls, url: str) -> bool:
@@ -200,8 +234,8 @@ class UrlWhitelistMatcher:
             如果是资源链接返回True，否则返回False。
         """
         # 移除查询参数后检查扩展名
-        path = url.split("?")[0].lower()
-        return any(path.endswith(ext) for ext in cls.RESOURCE_EXTENSIONS)
+        path = url.split("?", 1)[0].lower()
+        return path.endswith(cls._RESOURCE_EXTENSION_SUFFIXES)
 
     @classmethod
     def extract_urls_from_html(cls, html_content: str) -> List[str]:
@@ -216,15 +250,14 @@ class UrlWhitelistMatcher:
         Returns:
             用户可点击的URL列表（已去重和过滤资源链接）。
         """
-        if not html_content:
+        # 不含协议分隔符的正文不可能匹配，跳过整段扫描
+        if not html_content or "://" not in html_content:
             return []
 
-        # 只匹配 <a 标签中的 href 属性
-        pattern = r'<a\s+[^>]*href\s*=\s*["\']?(https?://[^"\'>\s]+)'
-        urls = re.findall(pattern, html_content, re.IGNORECASE)
+        urls = _HREF_RE.findall(html_content)
 
         # 去重并过滤资源链接
-        return [url for url in set(urls) if not cls.is_resource_url(url)]
+        return [url for url in dict.fromkeys(urls) if not cls.is_resource_url(url)]
 
     @classmethod
     def extract_urls_from_text(cls, text_content: str) -> List[str]:
@@ -239,12 +272,10 @@ class UrlWhitelistMatcher:
         Returns:
             URL列表（已去重和过滤资源链接）。
         """
-        if not text_content:
+        if not text_content or "://" not in text_content:
             return []
 
-        # 匹配http/https开头的URL
-        pattern = r'https?://[^\s<>"\'()\[\]{}]+'
-        urls = re.findall(pattern, text_content, re.IGNORECASE)
+        urls = _TEXT_URL_RE.findall(text_content)
 
         # 去重并过滤资源链接
-        return [url for url in set(urls) if not cls.is_resource_url(url)]
+        return [url for url in dict.fromkeys(urls) if not cls.is_resource_url(url)]
@@ -1,12 +1,12 @@
 """邮箱密码加密工具模块。"""
 
 import base64
+import hashlib
 import os
+from functools import lru_cache
 from typing import Optional
 
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
 class PasswordEncryptor:
@@ -34,14 +34,26 @@ class PasswordEncryptor:
         Returns:
             配置好的Fernet加密器。
         """
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self._salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(self._master_key))
-        return Fernet(key)
+        return Fernet(self._derive_key(self._master_key, self._salt))
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _derive_key(master_key: bytes, salt: bytes) -> bytes:
+        """通过PBKDF2从主密钥派生Fernet密钥。
+
+        派生过程需要10万次迭代，按 (主密钥, 盐值) 在进程内缓存，
+        重复创建加密器时无需再次计算。
+
+        Args:
+            master_key: 主密钥。
+            salt: 盐值。
+
+        Returns:
+            URL安全Base64编码的32字节密钥。
+        """
+        # 直接调用OpenSSL实现，支持SHA扩展指令的CPU上可获得硬件加速
+        derived = hashlib.pbkdf2_hmac("sha256", master_key, salt, 100000, 32)
+        return base64.urlsafe_b64encode(derived)
 
     def encrypt(self, plain_password: str) -> str:
         """加密密码。
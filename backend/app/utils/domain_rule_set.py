@@ -0,0 +1,120 @@
+"""Clash风格域名规则集合工具。"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+# 后缀字典树中标记“此处为一条规则结尾”的键，不会与域名标签冲突
+_TERMINAL = None
+
+
+class DomainRuleSet:
+    """预编译的Clash风格域名规则集合。
+
+    构建时按规则类型分桶并统一转为小写：
+    - DOMAIN: 放入精确匹配集合，哈希查找
+    - DOMAIN-SUFFIX: 按反转后的域名标签构建字典树，从顶级域名开始逐级查找
+    - DOMAIN-KEYWORD: 放入关键词元组，逐个做子串判断
+
+    匹配开销只与域名层级数和关键词数量相关，与规则总数无关。
+    """
+
+    RULE_DOMAIN = "DOMAIN"
+    RULE_DOMAIN_SUFFIX = "DOMAIN-SUFFIX"
+    RULE_DOMAIN_KEYWORD = "DOMAIN-KEYWORD"
+
+    def __init__(
+        self,
+        exact: FrozenSet[str] = frozenset(),
+        suffixes: FrozenSet[str] = frozenset(),
+        keywords: Tuple[str, ...] = (),
+    ) -> None:
+        """初始化规则集合。
+
+        Args:
+            exact: 精确匹配的域名集合（小写）。
+            suffixes: 后缀匹配的域名集合（小写）。
+            keywords: 关键词元组（小写）。
+        """
+        self._exact = exact
+        self._suffixes = suffixes
+        self._keywords = keywords
+        self._suffix_trie = self._build_suffix_trie(suffixes)
+
+    @classmethod
+    def build(cls, rules: Iterable[Any]) -> "DomainRuleSet":
+        """由规则实体构建规则集合。
+
+        非域名类的规则类型会被忽略，由调用方自行处理。
+
+        Args:
+            rules: 带有 ``rule_type`` 与 ``rule_value`` 属性的规则实体序列。
+
+        Returns:
+            规则集合。
+        """
+        exact = set()
+        suffixes = set()
+        keywords = set()
+        for rule in rules:
+            value = (rule.rule_value or "").strip().lower()
+            if not value:
+                continue
+            if rule.rule_type == cls.RULE_DOMAIN:
+                exact.add(value)
+            elif rule.rule_type == cls.RULE_DOMAIN_SUFFIX:
+                suffixes.add(value)
+            elif rule.rule_type == cls.RULE_DOMAIN_KEYWORD:
+                keywords.add(value)
+        return cls(frozenset(exact), frozenset(suffixes), tuple(sorted(keywords)))
+
+    def __len__(self) -> int:
+        """返回规则数量。"""
+        return len(self._exact) + len(self._suffixes) + len(self._keywords)
+
+    def match(self, domain: str) -> Optional[str]:
+        """匹配域名。
+
+        Args:
+            domain: 已转为小写的域名。
+
+        Returns:
+            命中的规则描述（``类型:值``），未命中返回None。
+        """
+        if domain in self._exact:
+            return f"{self.RULE_DOMAIN}:{domain}"
+
+        if self._suffix_trie:
+            # 例如 mail.qq.com 依次查找 com、qq、mail 标签，途经规则结尾即命中；
+            # notqq.com 在 notqq 标签处即失配，不会命中 qq.com
+            node = self._suffix_trie
+            labels = domain.split(".")
+            for depth in range(len(labels) - 1, -1, -1):
+                node = node.get(labels[depth])
+                if node is None:
+                    break
+                if _TERMINAL in node:
+                    suffix = ".".join(labels[depth:])
+                    return f"{self.RULE_DOMAIN_SUFFIX}:{suffix}"
+
+        for keyword in self._keywords:
+            if keyword in domain:
+                return f"{self.RULE_DOMAIN_KEYWORD}:{keyword}"
+
+        return None
+
+    @staticmethod
+    def _build_suffix_trie(suffixes: Iterable[str]) -> Dict[Any, Any]:
+        """构建反转域名标签字典树。
+
+        Args:
+            suffixes: 后缀规则值（小写）。
+
+        Returns:
+            嵌套字典形式的字典树，规则结尾节点包含 ``_TERMINAL`` 键。
+        """
+        trie: Dict[Any, Any] = {}
+        for suffix in suffixes:
+            node = trie
+            for label in reversed(suffix.split(".")):
+                node = node.setdefault(label, {})
+            node[_TERMINAL] = True
+        return trie
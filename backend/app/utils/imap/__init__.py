@@ -6,6 +6,9 @@
     - providers: 邮箱服务商提供者，采用策略模式支持不同服务商的特定处理
     - imap_client: 异步IMAP客户端
     - smtp_client: 异步SMTP客户端
+    - imap_connection_pool: IMAP连接池
+    - smtp_connection_pool: SMTP会话连接池
+    - keyed_connection_pool: IMAP与SMTP连接池共用的按键连接池基类
     - imap_config: 邮箱配置类
 
 使用示例：
@@ -18,6 +21,8 @@
     >>> await client.connect("user@163.com", "password")
 """
 
+import importlib
+
 from app.utils.imap.imap_config import (
     ImapConfig,
     ImapConfigFactory,
@@ -25,12 +30,6 @@ from app.utils.imap.imap_config import (
     NETEASE_IMAP_CONFIG,
     DEFAULT_SCHOOL_CONFIG,
 )
-try:
-    from app.utils.imap.imap_client import ImapClient
-except ModuleNotFoundError:
-    # 在测试环境中可缺少IMAP依赖，避免导入失败影响其他模块。
-    ImapClient = None
-
 from app.utils.imap.imap_models import (
     MailboxInfo,
     MailboxStatus,
@@ -38,11 +37,15 @@ from app.utils.imap.imap_models import (
     ParsedEmail,
 )
 from app.utils.imap.email_parser import EmailParser
-try:
-    from app.utils.imap.smtp_client import SmtpClient
-except ModuleNotFoundError:
-    # 测试环境下缺少SMTP依赖时降级处理。
-    SmtpClient = None
+from app.utils.imap.imap_connection_pool import ImapConnectionPool
+from app.utils.imap.smtp_connection_pool import SmtpConnectionPool
+
+# 客户端类依赖aioimaplib/aiosmtplib，首次访问时才导入，
+# 仅使用解析器、配置等子模块时无需加载网络库
+_LAZY_CLIENTS = {
+    "ImapClient": "app.utils.imap.imap_client",
+    "SmtpClient": "app.utils.imap.smtp_client",
+}
 
 __all__ = [
     # 配置类
@@ -54,6 +57,8 @@ __all__ = [
     # 客户端
     "ImapClient",
     "SmtpClient",
+    "ImapConnectionPool",
+    "SmtpConnectionPool",
     # 数据模型
     "MailboxInfo",
     "MailboxStatus",
@@ -62,3 +67,26 @@ __all__ = [
     # 工具类
     "EmailParser",
 ]
+
+
+def __getattr__(name: str):
+    """按需导入客户端类。
+
+    Args:
+        name: 属性名称。
+
+    Returns:
+        客户端类，缺少对应依赖时返回None（测试环境下降级处理）。
+
+    Raises:
+        AttributeError: 属性不存在。
+    """
+    module_name = _LAZY_CLIENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ModuleNotFoundError:
+        value = None
+    globals()[name] = value
+    return value
@@ -2,20 +2,116 @@
 
 from __future__ import annotations
 
-import email
+import codecs
 import re
 from dataclasses import dataclass
 from datetime import datetime
 from email.header import decode_header
 from email.message import Message
+from email.parser import BytesParser
+from email.policy import compat32
 from email.utils import getaddresses, parsedate_to_datetime
-from typing import List, Optional
+from functools import lru_cache
+from html import unescape
+from typing import List, Optional, Tuple
 
 from app.entities.email_recipient_entity import RecipientType
 from app.utils.imap.imap_models import ParsedEmail, ParsedRecipient
 
+_WS_RE = re.compile(r"\s+")
+# 以下正则均为线性扫描：标签不跨越下一个 "<"，隐藏块只向后查找一次结束标记
+_HIDDEN_BLOCK_START_RE = re.compile(r"<!--|<(script|style)\b", re.IGNORECASE)
+_HIDDEN_BLOCK_END_RES = {
+    None: re.compile(r"-->"),
+    "script": re.compile(r"</script\s*>", re.IGNORECASE),
+    "style": re.compile(r"</style\s*>", re.IGNORECASE),
+}
+_TAG_RE = re.compile(r"<[^<>]+>")
+_UNCLOSED_TAG_TAIL_RE = re.compile(r"<[^<>]*\Z")
+_SNIPPET_LENGTH = 200
+_SNIPPET_SOURCE_WINDOW = 8192
+_BODY_CONTENT_TYPES = frozenset({"text/plain", "text/html"})
+# 普通ASCII地址头部的快速路径，仅覆盖 "Name" <a@b>、Name <a@b>、<a@b> 与 a@b，
+# 含编码词、注释、转义或多个地址等情况交由getaddresses处理
+_ADDR_SPEC = r'[^\s<>@",;:()\[\]\\]+@[^\s<>@",;:()\[\]\\]+'
+_NAME_WORD = r'[^\s"<>@,;:()\[\]\\]+'
+_SIMPLE_ADDRESS_RE = re.compile(
+    rf'\s*(?:"(?P<quoted>[^"\\]*)"|(?P<plain>(?:{_NAME_WORD}(?: {_NAME_WORD})*)?))'
+    rf"\s*<(?P<angle>{_ADDR_SPEC})>\s*|\s*(?P<bare>{_ADDR_SPEC})\s*"
+)
+_RECIPIENT_HEADERS = (
+    ("To", RecipientType.TO),
+    ("Cc", RecipientType.CC),
+    ("Bcc", RecipientType.BCC),
+    ("Reply-To", RecipientType.REPLY_TO),
+)
+
+
+def _decode_header_value(header_value) -> str:
+    """解码邮件头部内容。
+
+    Args:
+        header_value: 头部原始值。
+
+    Returns:
+        解码后的字符串。
+    """
+    try:
+        decoded_parts = decode_header(header_value)
+        result = []
+        for content, charset in decoded_parts:
+            if isinstance(content, bytes):
+                result.append(content.decode(charset or "utf-8", errors="replace"))
+            else:
+                result.append(content)
+        return "".join(result)
+    except Exception:
+        return str(header_value)
+
+
+# 同步时大量邮件来自相同的发件人与订阅源，缓存解码结果避免重复解析
+_decode_header_cached = lru_cache(maxsize=4096)(_decode_header_value)
+
+
+@lru_cache(maxsize=64)
+def _resolve_charset(charset: str) -> str:
+    """解析邮件声明的字符集为Python编解码器名称。
+
+    邮件中出现的字符集种类很少，结果按声明值缓存；
+    无法识别的字符集只在首次出现时查找失败，之后直接回退为UTF-8。
+
+    Args:
+        charset: Content-Type中声明的字符集。
+
+    Returns:
+        编解码器名称。
+    """
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return "utf-8"
+
 
-@dataclass(frozen=True)
+def _match_simple_address(header_value: object) -> Optional[Tuple[str, str]]:
+    """以正则快速解析只含单个普通ASCII地址的头部。
+
+    Args:
+        header_value: 头部原始值。
+
+    Returns:
+        (显示名称, 邮箱地址)，不属于简单形式时返回None。
+    """
+    if not isinstance(header_value, str) or "=?" in header_value:
+        return None
+    match = _SIMPLE_ADDRESS_RE.fullmatch(header_value)
+    if not match:
+        return None
+    if match["bare"]:
+        return "", match["bare"]
+    return match["quoted"] or match["plain"] or "", match["angle"]
+
+
+@dataclass(frozen=True, slots=True)
 class SenderInfo:
     """发件人信息。
 
@@ -41,6 +137,9 @@ class EmailParser:
             logger: 日志记录器。
         """
         self._logger = logger
+        # 显式使用compat32策略（与 email.message_from_bytes 默认一致），
+        # 解析器无状态，可在多次解析间复用
+        self._bytes_parser = BytesParser(policy=compat32)
 
     def parse(self, raw_email: bytes) -> Optional[ParsedEmail]:
         """解析原始邮件内容。
@@ -52,7 +151,7 @@ class EmailParser:
             解析后的邮件对象，失败返回None。
         """
         try:
-            msg = email.message_from_bytes(raw_email)
+            msg = self._bytes_parser.parsebytes(raw_email)
 
             message_id = msg.get("Message-ID") or None
             subject = self._decode_header(msg.get("Subject", ""))
@@ -88,74 +187,85 @@ class EmailParser:
         Returns:
             发件人信息对象。
         """
-        decoded = self._decode_header(header_value)
-        addresses = getaddresses([decoded])
+        if not header_value:
+            return SenderInfo(name=None, address=None)
+
+        simple = _match_simple_address(header_value)
+        if simple:
+            name, address = simple
+            return SenderInfo(name=name or None, address=address)
+
+        addresses = getaddresses([str(header_value)])
         if not addresses:
             return SenderInfo(name=None, address=None)
 
         name, address = addresses[0]
-        return SenderInfo(name=name or None, address=address or None)
+        return SenderInfo(
+            name=self._decode_header(name) or None, address=address or None
+        )
 
-    def _parse_recipients(self, msg: Message) -> List[ParsedRecipient]:
+    def _parse_recipients(self, msg: Message) -> Tuple[ParsedRecipient, ...]:
         """解析收件人信息。
 
         Args:
             msg: 邮件对象。
 
         Returns:
-            收件人列表。
+            收件人元组。
         """
         recipients: List[ParsedRecipient] = []
-
-        recipients.extend(
-            self._parse_recipient_header("To", msg.get("To"), RecipientType.TO)
-        )
-        recipients.extend(
-            self._parse_recipient_header("Cc", msg.get("Cc"), RecipientType.CC)
-        )
-        recipients.extend(
-            self._parse_recipient_header("Bcc", msg.get("Bcc"), RecipientType.BCC)
-        )
-        recipients.extend(
-            self._parse_recipient_header(
-                "Reply-To", msg.get("Reply-To"), RecipientType.REPLY_TO
-            )
-        )
-
-        return recipients
+        for header_name, recipient_type in _RECIPIENT_HEADERS:
+            header_values = msg.get_all(header_name)
+            if header_values:
+                recipients.extend(
+                    self._parse_recipient_header(
+                        header_name, header_values, recipient_type
+                    )
+                )
+        return tuple(recipients)
 
     def _parse_recipient_header(
         self,
         header_name: str,
-        header_value: Optional[str],
+        header_values: List[str],
         recipient_type: RecipientType,
     ) -> List[ParsedRecipient]:
-        """解析单个收件人头部字段。
+        """解析同名收件人头部字段。
+
+        先按原始头部拆分地址，再逐个解码显示名称，
+        避免编码后的显示名称中含有逗号时被误拆为多个地址。
 
         Args:
             header_name: 头部名称，用于日志。
-            header_value: 头部值。
+            header_values: 同名头部的全部原始值。
             recipient_type: 收件人类型。
 
         Returns:
             收件人列表。
         """
-        if not header_value:
-            return []
-
-        decoded = self._decode_header(header_value)
-        addresses = getaddresses([decoded])
-        recipients = []
-        for name, address in addresses:
-            if not address:
-                continue
-            recipients.append(
+        simple = (
+            _match_simple_address(header_values[0])
+            if len(header_values) == 1
+            else None
+        )
+        if simple:
+            name, address = simple
+            return [
                 ParsedRecipient(
-                    recipient_type=recipient_type,
-                    name=name or None,
-                    address=address,
+                    recipient_type=recipient_type, name=name or None, address=address
                 )
+            ]
+
+        decode = self._decode_header
+        recipients = [
+            ParsedRecipient(
+                recipient_type=recipient_type,
+                name=decode(name) or None,
+                address=address,
             )
+            for name, address in getaddresses([str(value) for value in header_values])
+            if address
+        ]
 
         if not recipients:
             self._logger.debug("未解析到收件人: header=%s", header_name)
@@ -175,7 +285,14 @@ class EmailParser:
 
         if msg.is_multipart():
             for part in msg.walk():
+                if content_text and content_html:
+                    break
                 content_type = part.get_content_type()
+                if content_type not in _BODY_CONTENT_TYPES:
+                    continue
+                # 以附件形式携带的文本文件不是正文，也无需解码
+                if part.get_content_disposition() == "attachment":
+                    continue
                 if content_type == "text/plain" and not content_text:
                     payload = part.get_payload(decode=True)
                     if payload:
@@ -206,18 +323,10 @@ class EmailParser:
         """
         if not header_value:
             return ""
-
-        try:
-            decoded_parts = decode_header(header_value)
-            result = []
-            for content, charset in decoded_parts:
-                if isinstance(content, bytes):
-                    result.append(content.decode(charset or "utf-8", errors="replace"))
-                else:
-                    result.append(content)
-            return "".join(result)
-        except Exception:
-            return str(header_value)
+        if isinstance(header_value, str):
+            return _decode_header_cached(header_value)
+        # 含8位原始字节的头部会以不可哈希的Header对象返回，不走缓存
+        return _decode_header_value(header_value)
 
     def _decode_content(self, payload: bytes, part: Message) -> str:
         """解码邮件正文。
@@ -229,7 +338,7 @@ class EmailParser:
         Returns:
             解码后的文本内容。
         """
-        charset = part.get_content_charset() or "utf-8"
+        charset = _resolve_charset(part.get_content_charset() or "utf-8")
         try:
             return payload.decode(charset, errors="replace")
         except Exception:
@@ -264,11 +373,20 @@ class EmailParser:
         Returns:
             摘要文本。
         """
-        raw_text = content_text or self._strip_html(content_html or "")
-        raw_text = re.sub(r"\s+", " ", raw_text or "").strip()
-        if not raw_text:
+        source = content_text or content_html
+        if not source:
             return None
-        return raw_text[:200]
+        to_text = self._strip_html if not content_text else None
+
+        # 摘要只取前200个字符，先截取正文开头再处理，内容不足时逐步扩大窗口
+        window = _SNIPPET_SOURCE_WINDOW
+        while True:
+            chunk = source[:window]
+            text = _WS_RE.sub(" ", to_text(chunk) if to_text else chunk).strip()
+            if len(text) >= _SNIPPET_LENGTH or window >= len(source):
+                break
+            window *= 4
+        return text[:_SNIPPET_LENGTH] or None
 
     def _strip_html(self, html: str) -> str:
         """移除HTML标签获取纯文本。
@@ -279,10 +397,24 @@ class EmailParser:
         Returns:
             纯文本字符串。
         """
-        # Remove script and style elements and their content
-        html = re.sub(
-            r"<(script|style)[^>]*>.*?</\1>", " ", html, flags=re.DOTALL | re.IGNORECASE
-        )
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", html)
-        return text
+        # 去掉注释与script/style块，未闭合的块视为延续到结尾
+        pieces = []
+        pos = 0
+        while True:
+            start = _HIDDEN_BLOCK_START_RE.search(html, pos)
+            if not start:
+                pieces.append(html[pos:])
+                break
+            pieces.append(html[pos : start.start()])
+            block = start.group(1)
+            end_re = _HIDDEN_BLOCK_END_RES[block.lower() if block else None]
+            end = end_re.search(html, start.end())
+            if not end:
+                break
+            pos = end.end()
+
+        text = " ".join(pieces)
+        # 截断产生的半个标签同样丢弃
+        text = _UNCLOSED_TAG_TAIL_RE.sub(" ", text)
+        text = _TAG_RE.sub(" ", text)
+        return unescape(text)
@@ -9,17 +9,35 @@ from __future__ import annotations
 import logging
 import re
 import ssl
-from typing import List, Optional, TYPE_CHECKING
+from functools import lru_cache, partial
+from typing import AsyncIterator, Dict, List, Optional, TYPE_CHECKING
 
 from aioimaplib import IMAP4_SSL
 
+from app.utils.imap.imap_fetch_helper import ImapFetchHelper
 from app.utils.imap.imap_models import FetchedEmail, MailboxInfo, MailboxStatus
 from app.utils.imap.imap_response_parser import ImapResponseParser
 from app.utils.imap.imap_search_helper import ImapSearchHelper
+from app.utils.imap.providers.base_provider import quote_mailbox_name
 
 if TYPE_CHECKING:
     from app.utils.imap.providers.base_provider import BaseEmailProvider
 
+# STATUS响应中的 "字段 数值" 对，一次扫描取出全部字段
+_STATUS_ITEM_RE = re.compile(rb"\b(UIDVALIDITY|UIDNEXT|MESSAGES|UNSEEN) (\d+)")
+
+
+@lru_cache(maxsize=1)
+def _default_ssl_context() -> ssl.SSLContext:
+    """获取进程内共享的默认SSL上下文。
+
+    创建上下文需要加载系统CA证书，首次使用时创建一次，之后所有连接复用。
+
+    Returns:
+        默认SSL上下文。
+    """
+    return ssl.create_default_context()
+
 
 class ImapClient:
     """异步IMAP客户端类。
@@ -39,6 +57,13 @@ class ImapClient:
         >>> await client.connect("user@163.com", "password")
     """
 
+    # 抓取邮件时请求的数据项，BODY.PEEK不会将邮件标记为已读
+    _FETCH_ITEMS = "(UID FLAGS INTERNALDATE RFC822.SIZE BODY.PEEK[])"
+    # 单条UID FETCH命令最多包含的UID数量
+    _FETCH_BATCH_SIZE = 200
+    # 分页获取UID时每页期望的UID数量
+    _UID_PAGE_SIZE = 500
+
     def __init__(
         self,
         config=None,
@@ -68,6 +93,8 @@ class ImapClient:
 
         self._client: Optional[IMAP4_SSL] = None
         self._selected_mailbox: Optional[str] = None
+        # 选中文件夹时服务器返回的邮件总数（EXISTS）
+        self._selected_exists: Optional[int] = None
 
     @property
     def provider(self) -> Optional["BaseEmailProvider"]:
@@ -94,14 +121,11 @@ class ImapClient:
             if self._provider:
                 timeout = self._provider.get_connection_timeout()
 
-            # 创建SSL上下文，确保连接能正常建立
-            ssl_context = ssl.create_default_context()
-
             self._client = IMAP4_SSL(
                 host=self._imap_host,
                 port=self._imap_port,
                 timeout=timeout,
-                ssl_context=ssl_context,
+                ssl_context=_default_ssl_context(),
             )
             await self._client.wait_hello_from_server()
 
@@ -129,6 +153,22 @@ class ImapClient:
             finally:
                 self._client = None
                 self._selected_mailbox = None
+                self._selected_exists = None
+
+    async def noop(self) -> bool:
+        """发送NOOP确认连接仍然可用。
+
+        Returns:
+            连接可用返回True。
+        """
+        if not self._client:
+            return False
+        try:
+            response = await self._client.noop()
+        except Exception as exc:
+            self._logger.debug("IMAP NOOP失败: %s", exc)
+            return False
+        return response.result == "OK"
 
     async def list_mailboxes(self) -> List[MailboxInfo]:
         """获取邮箱文件夹列表。
@@ -145,15 +185,7 @@ class ImapClient:
             self._logger.warning("获取文件夹列表失败: %s", response)
             return []
 
-        mailboxes = []
-        for line in response.lines:
-            if not isinstance(line, (bytes, bytearray)):
-                continue
-            info = self._parse_list_line(line.decode("utf-8", errors="ignore"))
-            if info:
-                mailboxes.append(info)
-
-        return mailboxes
+        return ImapResponseParser.parse_list_response(response.lines)
 
     async def get_mailbox_status(self, mailbox_name: str) -> MailboxStatus:
         """获取文件夹状态信息。
@@ -176,20 +208,19 @@ class ImapClient:
             self._logger.warning("获取文件夹状态失败: %s", response)
             return MailboxStatus(None, None, None)
 
-        line = ""
+        fields: Dict[bytes, int] = {}
         for resp_line in response.lines:
             if isinstance(resp_line, (bytes, bytearray)):
-                line = resp_line.decode("utf-8", errors="ignore")
+                fields = {
+                    key: int(value)
+                    for key, value in _STATUS_ITEM_RE.findall(resp_line)
+                }
                 break
 
-        uid_validity = self._parse_status_value(line, "UIDVALIDITY")
-        uid_next = self._parse_status_value(line, "UIDNEXT")
-        message_count = self._parse_status_value(line, "MESSAGES")
-
         return MailboxStatus(
-            uid_validity=uid_validity,
-            uid_next=uid_next,
-            message_count=message_count,
+            uid_validity=fields.get(b"UIDVALIDITY"),
+            uid_next=fields.get(b"UIDNEXT"),
+            message_count=fields.get(b"MESSAGES"),
         )
 
     async def select_mailbox(self, mailbox_name: str) -> bool:
@@ -211,12 +242,14 @@ class ImapClient:
                 self._logger.warning("Provider拒绝选择文件夹: %s", mailbox_name)
                 return False
 
+        self._selected_exists = None
         response = await self._client.select(self._format_mailbox_name(mailbox_name))
         if response.result != "OK":
             self._logger.warning("选择文件夹失败: %s", response)
             return False
 
         self._selected_mailbox = mailbox_name
+        self._selected_exists = ImapResponseParser.parse_exists(response.lines)
 
         # 调用Provider的选择后钩子
         if self._provider:
@@ -238,59 +271,58 @@ class ImapClient:
             return []
 
         start_uid = max(start_uid, 1)
-        if self._provider and self._provider.requires_raw_uid_search():
-            # UID SEARCH返回的就是UID列表，无需二次转换。
-            raw_response = await ImapSearchHelper.uid_search_raw(
-                self._client,
-                start_uid,
-                logger=self._logger,
-            )
-            if raw_response and raw_response.result == "OK":
-                raw_uids = ImapSearchHelper.extract_search_numbers(raw_response.lines)
-                return sorted(raw_uids)
-            if raw_response:
-                self._logger.warning("UID搜索失败: %s", raw_response)
-            else:
-                self._logger.warning("UID搜索失败: 未获取响应，回退到通用SEARCH")
+        uids = await ImapFetchHelper.fetch_uid_range(
+            self._uid_command, start_uid, logger=self._logger
+        )
+        if uids is not None:
+            return uids
 
-        # 注意：SEARCH UID <criteria> 返回的是SEQUENCE NUMBERS，不是UIDs！
-        # 我们必须先获取这些sequence numbers，然后FETCH (UID)来获取真正的UID。
-        response = await self._uid_command("SEARCH", None, "UID", f"{start_uid}:*")
-        if response.result != "OK":
-            self._logger.warning("UID搜索失败: %s", response)
-            return []
+        raw_search = bool(self._provider and self._provider.requires_raw_uid_search())
+        return await ImapSearchHelper.search_uids_since(
+            self._client, self._uid_command, start_uid, raw_search, logger=self._logger
+        )
 
-        # 提取 Sequence Numbers
-        seq_nums = ImapSearchHelper.extract_search_numbers(response.lines)
-        if not seq_nums:
-            return []
+    async def iter_uids_since(
+        self,
+        start_uid: int,
+        status: Optional[MailboxStatus] = None,
+        page_size: int = _UID_PAGE_SIZE,
+    ) -> AsyncIterator[List[int]]:
+        """分页获取指定UID之后的UID列表。
 
-        # 批量获取UID
-        # 为了避免URL过长，应该分批处理，但这里假设差异不会太大
-        # 使用逗号分隔Sequence Set
-        seq_set = ",".join(map(str, seq_nums))
+        根据STATUS的邮件数与UIDNEXT估算UID密度，按预计包含 page_size 封邮件的
+        UID区间逐页查询，并依据每页实际数量调整下一页的区间宽度。
+        UIDVALIDITY重置等需要从头同步的场景下，单次响应与内存占用不随文件夹大小增长。
 
-        fetched_response = await self._client.fetch(seq_set, "(UID)")
-        if fetched_response.result != "OK":
-            self._logger.warning("获取UID详情失败: %s", fetched_response)
-            return []
+        Args:
+            start_uid: 起始UID（包含）。
+            status: 当前文件夹的STATUS结果，未提供时重新查询。
+            page_size: 每页期望的UID数量。
 
-        real_uids = []
-        for line in fetched_response.lines:
-            if isinstance(line, (bytes, bytearray)):
-                line = line.decode("utf-8", errors="ignore")
+        Yields:
+            按UID升序排列的非空UID列表。
+        """
+        if not self._client:
+            self._logger.error("IMAP未连接")
+            return
 
-            # 解析 FETCH 响应: * 118 FETCH (UID 146 ...)
-            match = re.search(r"UID (\d+)", line)
-            if match:
-                real_uids.append(int(match.group(1)))
+        start_uid = max(start_uid, 1)
+        if status is None and self._selected_mailbox:
+            status = await self.get_mailbox_status(self._selected_mailbox)
 
-        return sorted(real_uids)
+        fetch_range = partial(
+            ImapFetchHelper.fetch_uid_range, self._uid_command, logger=self._logger
+        )
+        async for uids in ImapFetchHelper.iter_uid_pages(
+            fetch_range, self.fetch_uids_since, start_uid, status, page_size
+        ):
+            yield uids
 
     async def fetch_latest_uids(self, count: int) -> List[int]:
         """获取最新的N封邮件的UID列表。
 
-        使用IMAP序列号反向查找，避免获取全部UID列表。
+        根据SELECT返回的EXISTS直接计算最后N个序列号，
+        不再通过SEARCH ALL传回整个文件夹的序列号列表。
 
         Args:
             count: 要获取的邮件数量。
@@ -305,38 +337,34 @@ class ImapClient:
         if count <= 0:
             return []
 
-        # 使用 SEARCH ALL 获取邮件总数
-        response = await self._client.search("ALL")
-        if response.result != "OK":
-            self._logger.warning("SEARCH ALL失败: %s", response)
-            return []
-
-        # 提取所有序列号
-        seq_nums = ImapSearchHelper.extract_search_numbers(response.lines)
-        if not seq_nums:
+        exists = self._selected_exists
+        if exists is None:
+            exists = await self._count_messages()
+        if not exists:
             return []
 
-        # 取最后N个序列号（最新的邮件）
-        seq_nums = sorted(seq_nums)
-        latest_seq_nums = seq_nums[-count:] if len(seq_nums) > count else seq_nums
+        # 序列号按到达顺序连续编号，最新的N封即最后N个序列号
+        first_seq = max(exists - count + 1, 1)
+        seq_set = f"{first_seq}:{exists}"
 
-        # 批量获取这些序列号对应的UID
-        seq_set = ",".join(map(str, latest_seq_nums))
         fetched_response = await self._client.fetch(seq_set, "(UID)")
         if fetched_response.result != "OK":
             self._logger.warning("获取UID详情失败: %s", fetched_response)
             return []
 
-        real_uids = []
-        for line in fetched_response.lines:
-            if isinstance(line, (bytes, bytearray)):
-                line = line.decode("utf-8", errors="ignore")
+        # RFC 3501未规定FETCH响应的顺序，这里保留排序
+        return sorted(ImapResponseParser.extract_fetch_uids(fetched_response.lines))
 
-            match = re.search(r"UID (\d+)", line)
-            if match:
-                real_uids.append(int(match.group(1)))
+    async def _count_messages(self) -> Optional[int]:
+        """在SELECT响应未提供EXISTS时，通过STATUS查询当前文件夹的邮件数量。
 
-        return sorted(real_uids)
+        Returns:
+            邮件数量，查询失败时返回None。
+        """
+        if not self._selected_mailbox:
+            return None
+        status = await self.get_mailbox_status(self._selected_mailbox)
+        return status.message_count
 
     async def fetch_emails_by_uid(self, uids: List[int]) -> List[FetchedEmail]:
         """按UID列表抓取邮件原始内容。
@@ -351,9 +379,22 @@ class ImapClient:
             self._logger.error("IMAP未连接")
             return []
 
+        if not uids:
+            return []
+
+        # 每批一次UID FETCH取回，解析失败或缺失的邮件再逐封补抓；
+        # 分批限制命令长度（服务器通常限制在8KB左右）与单次响应大小
+        fetched_map: Dict[int, FetchedEmail] = {}
+        for start in range(0, len(uids), self._FETCH_BATCH_SIZE):
+            batch = uids[start : start + self._FETCH_BATCH_SIZE]
+            fetched_map.update(
+                await ImapFetchHelper.fetch_emails_batch(
+                    self._uid_command, batch, self._FETCH_ITEMS, logger=self._logger
+                )
+            )
         emails: List[FetchedEmail] = []
         for uid in uids:
-            fetched = await self._fetch_email(uid)
+            fetched = fetched_map.get(uid) or await self._fetch_email(uid)
             if fetched:
                 emails.append(fetched)
         return emails
@@ -367,31 +408,15 @@ class ImapClient:
         Returns:
             抓取到的邮件对象或None。
         """
-        response = await self._uid_command(
-            "FETCH",
-            str(uid),
-            "(UID FLAGS INTERNALDATE RFC822.SIZE BODY.PEEK[])",
-        )
+        response = await self._uid_command("FETCH", str(uid), self._FETCH_ITEMS)
         if response.result != "OK":
             self._logger.warning("FETCH失败: uid=%s", uid)
             return None
 
-        raw_email = ImapResponseParser.extract_literal_bytes(response.lines)
-        if not raw_email:
+        fetched = ImapResponseParser.build_fetched_email(uid, response.lines)
+        if not fetched:
             self._logger.warning("邮件内容为空: uid=%s", uid)
-            return None
-
-        flags, internal_date, size = ImapResponseParser.parse_flags_and_internal_date(
-            response.lines
-        )
-
-        return FetchedEmail(
-            uid=uid,
-            flags=flags,
-            internal_date=internal_date,
-            size=size,
-            raw_bytes=raw_email,
-        )
+        return fetched
 
     async def _execute_post_login_hook(self) -> None:
         """执行登录后钩子。
@@ -447,56 +472,6 @@ class ImapClient:
 
         raise ValueError(f"不支持的UID命令: {command}")
 
-    def _parse_list_line(self, line: str) -> Optional[MailboxInfo]:
-        """解析LIST响应行。
-
-        Args:
-            line: LIST响应行文本。
-
-        Returns:
-            文件夹信息或None。
-        """
-        if not line:
-            return None
-
-        match = re.match(r"\((?P<attrs>[^)]*)\)\s+(?P<rest>.*)", line)
-        if not match:
-            return None
-
-        attrs = match.group("attrs").strip()
-        rest = match.group("rest").strip()
-
-        delimiter = None
-        name = rest
-        if rest.startswith('"'):
-            parts = rest.split('"')
-            if len(parts) >= 3:
-                delimiter = parts[1]
-                name = '"'.join(parts[2:]).strip()
-        elif " " in rest:
-            delimiter, name = rest.split(" ", 1)
-
-        name = name.strip().strip('"')
-        if not name:
-            return None
-
-        return MailboxInfo(name=name, delimiter=delimiter, attributes=attrs or None)
-
-    def _parse_status_value(self, line: str, key: str) -> Optional[int]:
-        """从STATUS响应中解析数值。
-
-        Args:
-            line: STATUS响应文本。
-            key: 字段名称。
-
-        Returns:
-            数值或None。
-        """
-        if not line:
-            return None
-        match = re.search(rf"{key} (\d+)", line)
-        return int(match.group(1)) if match else None
-
     def _format_mailbox_name(self, mailbox_name: str) -> str:
         """格式化文件夹名称。
 
@@ -512,15 +487,4 @@ class ImapClient:
         if self._provider:
             return self._provider.format_mailbox_name(mailbox_name)
 
-        # 默认格式化逻辑
-        if not mailbox_name:
-            return mailbox_name
-
-        if mailbox_name.startswith('"') and mailbox_name.endswith('"'):
-            return mailbox_name
-
-        if " " in mailbox_name or '"' in mailbox_name:
-            escaped = mailbox_name.replace("\\", "\\\\").replace('"', '\\"')
-            return f'"{escaped}"'
-
-        return mailbox_name
+        return quote_mailbox_name(mailbox_name)
@@ -4,12 +4,13 @@
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from app.entities.email_account_entity import EmailType
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ImapConfig:
     """IMAP/SMTP邮箱配置。
 
@@ -82,6 +83,7 @@ class ImapConfigFactory:
         return cls._CONFIG_MAP.get(email_type)
 
     @classmethod
+    @lru_cache(maxsize=256)
     def get_config_or_default(
         cls,
         email_type: EmailType,
@@ -93,6 +95,8 @@ class ImapConfigFactory:
     ) -> ImapConfig:
         """获取配置，优先使用自定义值，否则使用默认配置。
 
+        ImapConfig 为不可变对象，相同入参的结果会被缓存复用。
+
         Args:
             email_type: 邮箱类型。
             imap_host: 自定义IMAP服务器地址。
@@ -107,6 +111,11 @@ class ImapConfigFactory:
         default_config = cls.get_config(email_type)
 
         if default_config:
+            # 未提供任何自定义值时直接复用默认配置实例，不再构造等值副本
+            if not (imap_host or imap_port or smtp_host or smtp_port) and (
+                use_ssl is None or use_ssl == default_config.use_ssl
+            ):
+                return default_config
             return ImapConfig(
                 imap_host=imap_host or default_config.imap_host,
                 imap_port=imap_port or default_config.imap_port,
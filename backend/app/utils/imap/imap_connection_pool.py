@@ -0,0 +1,43 @@
+"""IMAP连接池模块。
+
+按账户与登录凭据缓存已登录的IMAP客户端，
+连续同步同一账户时无需重复进行TLS握手与LOGIN认证。
+"""
+
+import logging
+from typing import Any, Optional
+
+from app.utils.imap.keyed_connection_pool import KeyedConnectionPool
+
+
+class ImapConnectionPool(KeyedConnectionPool):
+    """IMAP连接池。
+
+    复用前与后台清理时发送NOOP确认连接仍然存活。
+    """
+
+    _PROTOCOL = "IMAP连接"
+
+    def __init__(
+        self,
+        idle_timeout: float = 300.0,
+        logger: Optional[logging.Logger] = None,
+        sweep_interval: Optional[float] = 60.0,
+    ) -> None:
+        """初始化IMAP连接池。
+
+        Args:
+            idle_timeout: 连接最大空闲时间（秒），超过后关闭并重建。
+                服务器通常在空闲30分钟后断开，这里取更保守的值。
+            logger: 日志记录器。
+            sweep_interval: 后台清理的间隔（秒），为None时不启动后台清理。
+        """
+        super().__init__(idle_timeout, logger, sweep_interval)
+
+    async def _check_alive(self, connection: Any) -> bool:
+        """发送NOOP确认IMAP连接仍然存活。"""
+        return await connection.noop()
+
+    async def _close_connection(self, connection: Any) -> None:
+        """断开IMAP客户端。"""
+        await connection.disconnect()
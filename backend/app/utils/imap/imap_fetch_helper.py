@@ -0,0 +1,154 @@
+"""IMAP抓取辅助工具模块。
+
+封装UID分页查询与批量抓取邮件的公共逻辑，避免IMAP客户端文件过长。
+"""
+
+from __future__ import annotations
+
+from logging import Logger
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from app.utils.imap.imap_models import FetchedEmail, MailboxStatus
+from app.utils.imap.imap_response_parser import ImapResponseParser
+from app.utils.imap.imap_search_helper import ImapSearchHelper
+
+# 执行UID命令的协程函数：uid_command(command, *args) -> aioimaplib响应
+UidCommand = Callable[..., Awaitable[Any]]
+
+
+class ImapFetchHelper:
+    """IMAP抓取辅助工具类。"""
+
+    @staticmethod
+    async def fetch_uid_range(
+        uid_command: UidCommand,
+        start_uid: int,
+        end_uid: Optional[int] = None,
+        logger: Optional[Logger] = None,
+    ) -> Optional[List[int]]:
+        """通过 UID FETCH start:end (UID) 直接获取新邮件的UID。
+
+        一次往返即可取得UID，省去SEARCH后再按序列号FETCH的第二次往返。
+
+        Args:
+            uid_command: 执行UID命令的协程函数。
+            start_uid: 起始UID（包含）。
+            end_uid: 结束UID（包含），为None时查询到最新邮件。
+            logger: 可选日志记录器。
+
+        Returns:
+            UID列表，服务器不支持该命令时返回None。
+        """
+        uid_set = f"{start_uid}:{'*' if end_uid is None else end_uid}"
+        try:
+            response = await uid_command("FETCH", uid_set, "(UID)")
+        except Exception as exc:
+            if logger:
+                logger.warning("UID FETCH范围查询失败，回退到SEARCH: %s", exc)
+            return None
+        if response.result != "OK":
+            if logger:
+                logger.warning("UID FETCH范围查询失败，回退到SEARCH: %s", response)
+            return None
+
+        # start:* 在start大于最大UID时仍会返回最后一封邮件，需要过滤
+        uids = ImapResponseParser.extract_fetch_uids(response.lines)
+        return sorted(uid for uid in uids if uid >= start_uid)
+
+    @staticmethod
+    async def iter_uid_pages(
+        fetch_range: Callable[[int, Optional[int]], Awaitable[Optional[List[int]]]],
+        fetch_since: Callable[[int], Awaitable[List[int]]],
+        start_uid: int,
+        status: Optional[MailboxStatus],
+        page_size: int,
+    ) -> AsyncIterator[List[int]]:
+        """按UID区间分页产出指定UID之后的UID列表。
+
+        根据STATUS的邮件数与UIDNEXT估算UID密度，按预计包含 page_size 封邮件的
+        UID区间逐页查询，并依据每页实际数量调整下一页的区间宽度。
+
+        Args:
+            fetch_range: 查询UID区间的协程函数，不支持时返回None。
+            fetch_since: 查询起始UID之后全部UID的协程函数。
+            start_uid: 起始UID（包含）。
+            status: 当前文件夹的STATUS结果。
+            page_size: 每页期望的UID数量。
+
+        Yields:
+            按UID升序排列的非空UID列表。
+        """
+        uid_next = status.uid_next if status else None
+        message_count = status.message_count if status else None
+        if not uid_next or not message_count or uid_next - start_uid <= page_size:
+            uids = await fetch_since(start_uid)
+            if uids:
+                yield uids
+            return
+
+        # UID只增不减且不复用，密度不超过1，区间宽度至少为page_size
+        density = min(message_count / max(uid_next - 1, 1), 1.0)
+        width = max(int(page_size / density), page_size)
+        low = start_uid
+        while True:
+            high = low + width - 1
+            # 最后一页使用 * 作为上界，顺带取回STATUS之后新到达的邮件
+            last_page = high >= uid_next - 1
+            uids = await fetch_range(low, None if last_page else high)
+            if uids is None:
+                uids = await fetch_since(low)
+                last_page = True
+            if uids:
+                yield uids
+            if last_page:
+                return
+
+            low = high + 1
+            # 按本页实际密度修正下一页宽度，空页说明区间过窄，宽度加倍
+            if uids:
+                width = max(int(width * page_size / len(uids)), page_size)
+            else:
+                width *= 2
+
+    @staticmethod
+    async def fetch_emails_batch(
+        uid_command: UidCommand,
+        uids: List[int],
+        fetch_items: str,
+        logger: Optional[Logger] = None,
+    ) -> Dict[int, FetchedEmail]:
+        """使用单条UID FETCH命令批量抓取邮件。
+
+        Args:
+            uid_command: 执行UID命令的协程函数。
+            uids: UID列表。
+            fetch_items: FETCH请求的数据项。
+            logger: 可选日志记录器。
+
+        Returns:
+            UID到邮件对象的映射，批量抓取失败时为空。
+        """
+        try:
+            response = await uid_command(
+                "FETCH",
+                ImapSearchHelper.build_sequence_set(uids),
+                fetch_items,
+            )
+        except Exception as exc:
+            if logger:
+                logger.warning("批量FETCH失败，改为逐封抓取: %s", exc)
+            return {}
+        if response.result != "OK":
+            if logger:
+                logger.warning("批量FETCH失败，改为逐封抓取: %s", response.result)
+            return {}
+
+        return ImapResponseParser.parse_fetched_emails(response.lines)
@@ -1,6 +1,30 @@
 """IMAP标志位解析工具。"""
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+
+# 系统标志位对应的位掩码
+FLAG_SEEN = 1
+FLAG_FLAGGED = 2
+FLAG_ANSWERED = 4
+FLAG_DELETED = 8
+FLAG_DRAFT = 16
+
+# 大写标志名到位掩码的映射
+_FLAG_BITS = {
+    "\\SEEN": FLAG_SEEN,
+    "\\FLAGGED": FLAG_FLAGGED,
+    "\\ANSWERED": FLAG_ANSWERED,
+    "\\DELETED": FLAG_DELETED,
+    "\\DRAFT": FLAG_DRAFT,
+}
+# 状态字段名到位掩码的映射
+_STATUS_FIELDS = (
+    ("is_read", FLAG_SEEN),
+    ("is_flagged", FLAG_FLAGGED),
+    ("is_answered", FLAG_ANSWERED),
+    ("is_deleted", FLAG_DELETED),
+    ("is_draft", FLAG_DRAFT),
+)
 
 
 def normalize_flags(flags: List[str]) -> Optional[str]:
@@ -17,6 +41,33 @@ def normalize_flags(flags: List[str]) -> Optional[str]:
     return " ".join(sorted(flags))
 
 
+def flags_to_bits(flags: Iterable[str]) -> int:
+    """将flags转换为位掩码。
+
+    Args:
+        flags: 原始flag列表。
+
+    Returns:
+        FLAG_* 常量按位或的结果，非系统标志位被忽略。
+    """
+    bits = 0
+    for flag in flags:
+        bits |= _FLAG_BITS.get(flag.upper(), 0)
+    return bits
+
+
+def bits_to_status(bits: int) -> Dict[str, bool]:
+    """将位掩码转换为状态字段。
+
+    Args:
+        bits: FLAG_* 常量按位或的结果。
+
+    Returns:
+        状态字段映射。
+    """
+    return {field: bool(bits & mask) for field, mask in _STATUS_FIELDS}
+
+
 def flags_to_status(flags: List[str]) -> Dict[str, bool]:
     """将flags转换为状态字段。
 
@@ -26,11 +77,4 @@ def flags_to_status(flags: List[str]) -> Dict[str, bool]:
     Returns:
         状态字段映射。
     """
-    upper_flags = {flag.upper() for flag in flags}
-    return {
-        "is_read": "\\SEEN" in upper_flags,
-        "is_flagged": "\\FLAGGED" in upper_flags,
-        "is_answered": "\\ANSWERED" in upper_flags,
-        "is_deleted": "\\DELETED" in upper_flags,
-        "is_draft": "\\DRAFT" in upper_flags,
-    }
+    return bits_to_status(flags_to_bits(flags))
@@ -2,12 +2,12 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.entities.email_recipient_entity import RecipientType
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MailboxInfo:
     """邮箱文件夹信息。
 
@@ -22,7 +22,7 @@ class MailboxInfo:
     attributes: Optional[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MailboxStatus:
     """邮箱文件夹状态信息。
 
@@ -37,7 +37,7 @@ class MailboxStatus:
     message_count: Optional[int]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FetchedEmail:
     """IMAP拉取到的原始邮件数据。
 
@@ -56,7 +56,7 @@ class FetchedEmail:
     raw_bytes: bytes
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedRecipient:
     """解析后的收件人信息。
 
@@ -71,7 +71,7 @@ class ParsedRecipient:
     address: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedEmail:
     """解析后的邮件内容。
 
@@ -80,7 +80,7 @@ class ParsedEmail:
         subject: 邮件主题。
         sender_name: 发件人姓名。
         sender_address: 发件人邮箱。
-        recipients: 收件人列表。
+        recipients: 收件人元组。
         content_text: 纯文本内容。
         content_html: HTML内容。
         received_at: 邮件日期。
@@ -91,7 +91,7 @@ class ParsedEmail:
     subject: Optional[str]
     sender_name: Optional[str]
     sender_address: Optional[str]
-    recipients: List[ParsedRecipient]
+    recipients: Tuple[ParsedRecipient, ...]
     content_text: Optional[str]
     content_html: Optional[str]
     received_at: Optional[datetime]
@@ -3,9 +3,57 @@
 from __future__ import annotations
 
 import re
+from dataclasses import replace
 from datetime import datetime
 from email.utils import parsedate_to_datetime
-from typing import Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.imap.imap_models import FetchedEmail, MailboxInfo
+
+# 匹配FETCH响应的起始行，例如 "* 12 FETCH (" 或 aioimaplib去掉星号后的 "12 FETCH ("
+_FETCH_START_RE = re.compile(rb"^(?:\*\s+)?\d+\s+FETCH\b")
+# 匹配行尾的literal长度声明，例如 "BODY[] {1234}"
+_LITERAL_SIZE_RE = re.compile(rb"\{(\d+)\}\r?\n?")
+_UID_RE = re.compile(r"\bUID (\d+)")
+_UID_BYTES_RE = re.compile(rb"\bUID (\d+)")
+_FLAGS_RE = re.compile(r"FLAGS \((.*?)\)")
+_INTERNALDATE_RE = re.compile(r'INTERNALDATE "([^"]+)"')
+_SIZE_RE = re.compile(r"RFC822\.SIZE (\d+)")
+# 匹配SELECT响应中的邮件总数，例如 "* 172 EXISTS"
+_EXISTS_RE = re.compile(rb"^(?:\*\s+)?(\d+)\s+EXISTS\b", re.IGNORECASE)
+# LIST响应行：(属性) 分隔符 名称，分隔符可能为NIL，名称可能带引号与转义
+_LIST_LINE_RE = re.compile(
+    r'\((?P<attrs>[^)]*)\)\s+'
+    r'(?:"(?P<delimiter>(?:[^"\\]|\\.)*)"|NIL\b|(?P<bare_delimiter>\S+))\s+'
+    r'(?:"(?P<quoted_name>(?:[^"\\]|\\.)*)"|(?P<name>\S.*?))\s*$',
+    re.IGNORECASE,
+)
+_QUOTED_ESCAPE_RE = re.compile(r"\\(.)")
+# 以literal形式返回的文件夹名称，例如 "{8}"，名称在下一响应行中
+_LIST_LITERAL_RE = re.compile(r"\{(\d+)\}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_internal_date_cached(date_str: str) -> Optional[datetime]:
+    """解析IMAP内部日期并缓存结果。
+
+    批量同步时大量邮件的内部日期（秒级精度）相同，datetime不可变，
+    可直接复用缓存的解析结果。
+
+    Args:
+        date_str: 日期字符串。
+
+    Returns:
+        日期对象或None。
+    """
+    try:
+        return parsedate_to_datetime(date_str)
+    except Exception:
+        try:
+            return datetime.strptime(date_str, "%d-%b-%Y %H:%M:%S %z")
+        except Exception:
+            return None
 
 
 class ImapResponseParser:
@@ -18,19 +66,16 @@ class ImapResponseParser:
     def extract_literal_bytes(lines: Iterable[object]) -> Optional[bytes]:
         """提取FETCH响应中的literal邮件内容。
 
+        按FETCH响应中 "{size}" 声明的长度截取正文，而不是在拼接后的
+        响应中查找标记，避免正文中恰好出现的 "{n}" 文本造成误截。
+
         Args:
             lines: IMAP响应行列表。
 
         Returns:
             原始邮件字节或None。
         """
-        size = ImapResponseParser._find_literal_size(lines)
-
-        stream_result = ImapResponseParser._extract_literal_stream(lines, size)
-        if stream_result:
-            return stream_result
-
-        return ImapResponseParser._extract_literal_from_buffer(lines, size)
+        return ImapResponseParser._extract_literal_stream(lines)
 
     @staticmethod
     def parse_flags_and_internal_date(
@@ -48,138 +93,284 @@ class ImapResponseParser:
         if not header_line:
             return [], None, None
 
-        flags_match = re.search(r"FLAGS \((.*?)\)", header_line)
+        flags_match = _FLAGS_RE.search(header_line)
         flags = flags_match.group(1).split() if flags_match else []
 
-        date_match = re.search(r'INTERNALDATE "([^"]+)"', header_line)
+        date_match = _INTERNALDATE_RE.search(header_line)
         internal_date = (
             ImapResponseParser._parse_internal_date(date_match.group(1))
             if date_match
             else None
         )
 
-        size_match = re.search(r"RFC822\.SIZE (\d+)", header_line)
+        size_match = _SIZE_RE.search(header_line)
         size = int(size_match.group(1)) if size_match else None
 
         return flags, internal_date, size
 
     @staticmethod
-    def _extract_literal_stream(
-        lines: Iterable[object],
-        literal_size: Optional[int],
-    ) -> Optional[bytes]:
-        """按IMAP流式响应解析literal内容。"""
-        buffer = bytearray()
+    def build_fetched_email(
+        uid: Optional[int], lines: List[object]
+    ) -> Optional[FetchedEmail]:
+        """由单封邮件的FETCH响应行构建邮件对象。
+
+        Args:
+            uid: 邮件UID。
+            lines: 单封邮件的响应行列表。
+
+        Returns:
+            邮件对象，UID缺失或正文为空时返回None。
+        """
+        if uid is None:
+            return None
+
+        raw_email = ImapResponseParser.extract_literal_bytes(lines)
+        if not raw_email:
+            return None
+
+        flags, internal_date, size = ImapResponseParser.parse_flags_and_internal_date(
+            lines
+        )
+        return FetchedEmail(
+            uid=uid,
+            flags=flags,
+            internal_date=internal_date,
+            size=size,
+            raw_bytes=raw_email,
+        )
+
+    @staticmethod
+    def parse_fetched_emails(lines: Iterable[object]) -> Dict[int, FetchedEmail]:
+        """解析批量FETCH响应中的全部邮件。
+
+        Args:
+            lines: 批量FETCH的响应行列表。
+
+        Returns:
+            UID到邮件对象的映射，无法解析的邮件不包含在内。
+        """
+        fetched_map: Dict[int, FetchedEmail] = {}
+        for group in ImapResponseParser.split_fetch_responses(lines):
+            fetched = ImapResponseParser.build_fetched_email(
+                ImapResponseParser.parse_uid(group), group
+            )
+            if fetched:
+                fetched_map[fetched.uid] = fetched
+        return fetched_map
+
+    @staticmethod
+    def split_fetch_responses(lines: Iterable[object]) -> List[List[object]]:
+        """将多封邮件的FETCH响应拆分为每封邮件的响应行。
+
+        按literal声明的长度跳过邮件正文，避免正文中恰好出现的
+        "n FETCH" 文本被误判为下一封邮件的起始行。
+
+        Args:
+            lines: 批量FETCH的响应行列表。
+
+        Returns:
+            每封邮件对应的响应行列表。
+        """
+        groups: List[List[object]] = []
+        current: Optional[List[object]] = None
         remaining = 0
-        collecting = False
 
         for line in lines:
             if not isinstance(line, (bytes, bytearray, memoryview)):
                 continue
-            data = bytes(line)
+            length = len(line)
 
-            if not collecting:
-                if literal_size is None:
-                    match = re.search(rb"\{(\d+)\}\r?\n?", data)
-                    if not match:
-                        continue
-                    literal_size = int(match.group(1))
-                else:
-                    # 构建包含literal_size的正则表达式
-                    pattern = rb"\{" + str(literal_size).encode() + rb"\}\r?\n?"
-                    match = re.search(pattern, data)
-                    if not match:
-                        continue
-                start = match.end()
-                literal_part = data[start:]
-                if literal_size is None:
-                    return None
-                if len(literal_part) >= literal_size:
-                    return literal_part[:literal_size]
-
-                buffer.extend(literal_part)
-                remaining = literal_size - len(literal_part)
-                collecting = True
+            if remaining > 0:
+                current.append(line)
+                remaining -= length
                 continue
 
-            if len(data) >= remaining:
-                buffer.extend(data[:remaining])
-                return bytes(buffer)
+            data = bytes(line)
+            if _FETCH_START_RE.match(data):
+                current = [line]
+                groups.append(current)
+            elif current is not None:
+                current.append(line)
+            else:
+                continue
+
+            match = _LITERAL_SIZE_RE.search(data)
+            if match:
+                # literal可能与声明行同处一行，已包含的部分不再计入
+                remaining = max(int(match.group(1)) - (length - match.end()), 0)
+
+        return groups
+
+    @staticmethod
+    def extract_fetch_uids(lines: Iterable[object]) -> List[int]:
+        """提取 FETCH (UID) 响应中的全部UID。
 
-            buffer.extend(data)
-            remaining -= len(data)
+        Args:
+            lines: 响应行列表，例如 "* 118 FETCH (UID 146)"。
+
+        Returns:
+            UID列表（保持响应顺序）。
+        """
+        # 拼接后一次findall扫描，避免逐行解码与逐行正则匹配
+        buffer = b"\n".join(
+            line if isinstance(line, (bytes, bytearray)) else str(line).encode()
+            for line in lines
+        )
+        return [int(uid) for uid in _UID_BYTES_RE.findall(buffer)]
+
+    @staticmethod
+    def parse_exists(lines: Iterable[object]) -> Optional[int]:
+        """解析SELECT响应中的邮件总数。
+
+        Args:
+            lines: SELECT响应行列表。
 
+        Returns:
+            EXISTS声明的邮件数量，未找到时返回None。
+        """
+        for line in lines:
+            if not isinstance(line, (bytes, bytearray)):
+                continue
+            match = _EXISTS_RE.match(line)
+            if match:
+                return int(match.group(1))
         return None
 
     @staticmethod
-    def _extract_literal_from_buffer(
-        lines: Iterable[object],
-        literal_size: Optional[int],
-    ) -> Optional[bytes]:
-        """从拼接后的响应中回退解析literal内容。"""
-        all_bytes = ImapResponseParser._collect_bytes(lines)
-        if not all_bytes:
-            return None
+    def parse_uid(lines: Iterable[object]) -> Optional[int]:
+        """解析FETCH响应中的UID。
+
+        Args:
+            lines: 单封邮件的响应行列表。
 
-        if literal_size is None:
-            match = re.search(rb"\{(\d+)\}", all_bytes)
-            if not match:
-                return None
-            literal_size = int(match.group(1))
-            marker = match.group(0)
-        else:
-            marker = f"{{{literal_size}}}".encode()
-
-        marker_index = all_bytes.rfind(marker)
-        if marker_index == -1:
+        Returns:
+            UID或None。
+        """
+        header_line = ImapResponseParser._find_header_line(lines)
+        if not header_line:
             return None
+        match = _UID_RE.search(header_line)
+        return int(match.group(1)) if match else None
 
-        start = marker_index + len(marker)
-        if all_bytes[start : start + 2] == b"\r\n":
-            start += 2
-        elif all_bytes[start : start + 1] == b"\n":
-            start += 1
+    @staticmethod
+    def parse_list_response(lines: Iterable[object]) -> List[MailboxInfo]:
+        """解析LIST命令的全部响应行。
 
-        end = start + literal_size
-        if end > len(all_bytes):
-            return None
+        名称以literal形式返回时（例如含有引号或非ASCII字符），
+        aioimaplib把名称作为单独一行返回，这里与前一行合并为一个文件夹。
+
+        Args:
+            lines: LIST响应行列表。
+
+        Returns:
+            文件夹信息列表。
+        """
+        mailboxes: List[MailboxInfo] = []
+        literal_head: Optional[MailboxInfo] = None
+        literal_size = 0
+        for line in lines:
+            if not isinstance(line, (bytes, bytearray)):
+                continue
+            if literal_head is not None:
+                name = bytes(line[:literal_size]).decode("utf-8", errors="ignore")
+                if name:
+                    mailboxes.append(replace(literal_head, name=name))
+                literal_head = None
+                continue
 
-        return all_bytes[start:end]
+            info = ImapResponseParser.parse_list_line(
+                line.decode("utf-8", errors="ignore")
+            )
+            if info is None:
+                continue
+            literal = _LIST_LITERAL_RE.fullmatch(info.name)
+            # 带引号的 "{8}" 是普通名称，只有未加引号时才是literal声明
+            if literal and not line.rstrip().endswith(b'"'):
+                literal_head, literal_size = info, int(literal.group(1))
+                continue
+            mailboxes.append(info)
+        return mailboxes
 
     @staticmethod
-    def _find_literal_size(lines: Iterable[object]) -> Optional[int]:
-        """从FETCH响应头中解析literal大小。"""
-        header_line = ImapResponseParser._find_header_line(lines)
-        if header_line:
-            match = re.search(r"\{(\d+)\}", header_line)
-            if match:
-                return int(match.group(1))
+    def parse_list_line(line: str) -> Optional[MailboxInfo]:
+        """解析LIST响应行。
+
+        Args:
+            line: LIST响应行文本（aioimaplib已去掉 "* LIST" 前缀）。
 
-        all_bytes = ImapResponseParser._collect_bytes(lines)
-        if not all_bytes:
+        Returns:
+            文件夹信息或None。
+        """
+        if not line:
+            return None
+
+        match = _LIST_LINE_RE.match(line)
+        if not match:
             return None
 
-        match = re.search(rb"\{(\d+)\}", all_bytes)
-        if match:
-            return int(match.group(1))
+        name = match.group("quoted_name")
+        if name is None:
+            name = match.group("name")
+        elif "\\" in name:
+            name = _QUOTED_ESCAPE_RE.sub(r"\1", name)
+        if not name:
+            return None
 
-        return None
+        delimiter = match.group("delimiter")
+        if delimiter is None:
+            delimiter = match.group("bare_delimiter")
+        elif "\\" in delimiter:
+            delimiter = _QUOTED_ESCAPE_RE.sub(r"\1", delimiter)
+        attrs = match.group("attrs").strip()
+
+        return MailboxInfo(name=name, delimiter=delimiter, attributes=attrs or None)
 
     @staticmethod
-    def _collect_bytes(lines: Iterable[object]) -> bytes:
-        """合并响应中的字节内容。
+    def _extract_literal_stream(lines: Iterable[object]) -> Optional[bytes]:
+        """按IMAP流式响应解析literal内容。
+
+        以第一个 "{size}" 声明为准，从声明之后精确读取 size 个字节，
+        literal可能与声明同处一行，也可能跨越多个响应行。
 
         Args:
-            lines: 响应行列表。
+            lines: 单封邮件的响应行列表。
 
         Returns:
-            合并后的字节内容。
+            literal字节，未找到声明或内容不完整时返回None。
         """
-        chunks = []
+        literal_size: Optional[int] = None
+        buffer: Optional[bytearray] = None
+        offset = 0
+
         for line in lines:
-            if isinstance(line, (bytes, bytearray, memoryview)):
-                chunks.append(bytes(line))
-        return b"".join(chunks)
+            if not isinstance(line, (bytes, bytearray, memoryview)):
+                continue
+            # 通过memoryview切片，正文在拼出最终结果前不做中间拷贝
+            view = memoryview(line)
+
+            if literal_size is None:
+                match = _LITERAL_SIZE_RE.search(view)
+                if not match:
+                    continue
+                literal_size = int(match.group(1))
+                view = view[match.end() :]
+
+            if buffer is None:
+                # aioimaplib把整段literal作为单独一行返回，此时只需拷贝一次，
+                # 不经过预分配缓冲区，大邮件的内存峰值少一份正文大小
+                if len(view) >= literal_size:
+                    return bytes(view[:literal_size])
+                if not view:
+                    continue
+                buffer = bytearray(literal_size)
+
+            chunk = view[: literal_size - offset]
+            buffer[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+            if offset == literal_size:
+                return bytes(buffer)
+
+        return None
 
     @staticmethod
     def _find_header_line(lines: Iterable[object]) -> Optional[str]:
@@ -191,12 +382,10 @@ class ImapResponseParser:
         Returns:
             解析到的头部文本。
         """
+        # 先在原始字节中查找标记，只解码命中的那一行
         for line in lines:
-            if not isinstance(line, (bytes, bytearray)):
-                continue
-            text = line.decode("utf-8", errors="ignore")
-            if "FETCH" in text:
-                return text
+            if isinstance(line, (bytes, bytearray)) and b"FETCH" in line:
+                return line.decode("utf-8", errors="ignore")
         return None
 
     @staticmethod
@@ -209,10 +398,4 @@ class ImapResponseParser:
         Returns:
             日期对象或None。
         """
-        try:
-            return parsedate_to_datetime(date_str)
-        except Exception:
-            try:
-                return datetime.strptime(date_str, "%d-%b-%Y %H:%M:%S %z")
-            except Exception:
-                return None
+        return _parse_internal_date_cached(date_str)
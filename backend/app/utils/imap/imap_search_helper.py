@@ -6,7 +6,9 @@
 from __future__ import annotations
 
 from logging import Logger
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, List, Optional, TYPE_CHECKING
+
+from app.utils.imap.imap_response_parser import ImapResponseParser
 
 if TYPE_CHECKING:
     from aioimaplib import IMAP4_SSL
@@ -27,13 +29,36 @@ class ImapSearchHelper:
         """
         numbers: List[int] = []
         for line in lines:
-            if isinstance(line, (bytes, bytearray)):
-                line = line.decode("utf-8", errors="ignore")
-            for value in str(line).split():
-                if value.isdigit():
-                    numbers.append(int(value))
+            # 数字与空格在字节与文本中一致，字节行直接切分，省去整行解码
+            if not isinstance(line, (bytes, bytearray)):
+                line = str(line)
+            numbers.extend([int(value) for value in line.split() if value.isdigit()])
         return numbers
 
+    @staticmethod
+    def build_sequence_set(numbers: List[int]) -> str:
+        """将编号列表压缩为IMAP序列集合字符串。
+
+        连续编号合并为区间，例如 [1, 2, 3, 5, 7, 8] -> "1:3,5,7:8"。
+
+        Args:
+            numbers: UID或序列号列表。
+
+        Returns:
+            序列集合字符串。
+        """
+        ranges: List[str] = []
+        ordered = sorted(set(numbers))
+        index = 0
+        while index < len(ordered):
+            start = end = ordered[index]
+            index += 1
+            while index < len(ordered) and ordered[index] == end + 1:
+                end = ordered[index]
+                index += 1
+            ranges.append(f"{start}:{end}" if start != end else str(start))
+        return ",".join(ranges)
+
     @staticmethod
     async def uid_search_raw(
         client: "IMAP4_SSL",
@@ -66,3 +91,62 @@ class ImapSearchHelper:
             if logger:
                 logger.warning("UID SEARCH原始命令执行失败: %s", exc)
             return None
+
+    @staticmethod
+    async def search_uids_since(
+        client: "IMAP4_SSL",
+        uid_command: Callable[..., Awaitable[Any]],
+        start_uid: int,
+        raw_search: bool,
+        logger: Optional[Logger] = None,
+    ) -> List[int]:
+        """通过SEARCH命令获取指定UID之后的UID列表。
+
+        用于服务器不支持 UID FETCH 区间查询时的回退。
+
+        Args:
+            client: IMAP客户端实例。
+            uid_command: 执行UID命令的协程函数。
+            start_uid: 起始UID（包含）。
+            raw_search: 是否优先使用原始协议的UID SEARCH命令。
+            logger: 可选日志记录器。
+
+        Returns:
+            按UID升序排列的UID列表。
+        """
+        if raw_search:
+            # UID SEARCH返回的就是UID列表，无需二次转换。
+            raw_response = await ImapSearchHelper.uid_search_raw(
+                client, start_uid, logger=logger
+            )
+            if raw_response and raw_response.result == "OK":
+                raw_uids = ImapSearchHelper.extract_search_numbers(raw_response.lines)
+                # RFC 3501未规定SEARCH结果的顺序，这里保留排序
+                return sorted(raw_uids)
+            if logger and raw_response:
+                logger.warning("UID搜索失败: %s", raw_response)
+            elif logger:
+                logger.warning("UID搜索失败: 未获取响应，回退到通用SEARCH")
+
+        # 注意：SEARCH UID <criteria> 返回的是SEQUENCE NUMBERS，不是UIDs！
+        # 我们必须先获取这些sequence numbers，然后FETCH (UID)来获取真正的UID。
+        response = await uid_command("SEARCH", None, "UID", f"{start_uid}:*")
+        if response.result != "OK":
+            if logger:
+                logger.warning("UID搜索失败: %s", response)
+            return []
+
+        seq_nums = ImapSearchHelper.extract_search_numbers(response.lines)
+        if not seq_nums:
+            return []
+
+        # 批量获取UID，连续序列号压缩为区间以缩短命令
+        seq_set = ImapSearchHelper.build_sequence_set(seq_nums)
+        fetched_response = await client.fetch(seq_set, "(UID)")
+        if fetched_response.result != "OK":
+            if logger:
+                logger.warning("获取UID详情失败: %s", fetched_response)
+            return []
+
+        # RFC 3501未规定FETCH响应的顺序，这里保留排序
+        return sorted(ImapResponseParser.extract_fetch_uids(fetched_response.lines))
@@ -0,0 +1,359 @@
+"""按键缓存已登录连接的通用连接池模块。
+
+IMAP与SMTP连接池共用同一套获取、归还、空闲回收与按账户驱逐逻辑，
+各协议只需实现存活检查与关闭连接两个钩子。
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+# 进程内随机密钥，凭据指纹只在本进程内可比较，不会泄露可离线验证的口令哈希
+_FINGERPRINT_SECRET = os.urandom(32)
+
+
+class PoolKey(NamedTuple):
+    """连接池键。
+
+    Attributes:
+        account_id: 邮箱账户ID，用于删除账户时驱逐连接；未知时为None。
+        host: 服务器主机。
+        port: 服务器端口。
+        username: 登录用户名。
+        credential: 授权密码的指纹，密码变更后旧连接不会再被复用。
+    """
+
+    account_id: Optional[int]
+    host: str
+    port: int
+    username: str
+    credential: str
+
+    @classmethod
+    def build(
+        cls,
+        account_id: Optional[int],
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+    ) -> "PoolKey":
+        """根据连接参数构建连接池键。
+
+        Args:
+            account_id: 邮箱账户ID。
+            host: 服务器主机。
+            port: 服务器端口。
+            username: 登录用户名。
+            password: 授权密码，只保存其HMAC指纹。
+
+        Returns:
+            连接池键。
+        """
+        digest = hmac.new(
+            _FINGERPRINT_SECRET, password.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return cls(account_id, host, port, username, digest[:16])
+
+
+@dataclass
+class _PooledConnection:
+    """连接池中的连接条目。
+
+    Attributes:
+        connection: 已登录的连接对象。
+        last_used: 最近一次使用的单调时钟时间（秒）。
+    """
+
+    connection: Any
+    last_used: float
+
+
+class KeyedConnectionPool(ABC):
+    """按键缓存已登录连接的连接池基类。
+
+    每个键最多保留一个已登录连接，使用时持有该键的锁，保证同一账户的请求
+    串行复用同一连接。IMAP的选中文件夹状态属于连接，同一账户并发同步还会
+    争用同一UID游标，因此不按账户放开到多个连接。
+
+    后台清理任务定期关闭空闲超时的连接，并对其余空闲连接做存活检查。
+    """
+
+    # 日志中的协议名称
+    _PROTOCOL = "连接"
+
+    def __init__(
+        self,
+        idle_timeout: float,
+        logger: Optional[logging.Logger] = None,
+        sweep_interval: Optional[float] = 60.0,
+    ) -> None:
+        """初始化连接池。
+
+        Args:
+            idle_timeout: 连接最大空闲时间（秒），超过后关闭并重建。
+            logger: 日志记录器。
+            sweep_interval: 后台清理的间隔（秒），为None时只在获取连接时回收。
+        """
+        self._idle_timeout = idle_timeout
+        self._sweep_interval = sweep_interval
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+        self._connections: Dict[PoolKey, _PooledConnection] = {}
+        self._locks: Dict[PoolKey, asyncio.Lock] = {}
+        # 正在等待或持有各键锁的 acquire 调用数，用于判断锁能否回收
+        self._waiting: Dict[PoolKey, int] = {}
+        # 被驱逐时仍有调用方等待或持有的键，直到这些调用全部结束前，
+        # 归还的连接都直接关闭而不放回连接池
+        self._discarded: Set[PoolKey] = set()
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        key: PoolKey,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> AsyncIterator[Any]:
+        """获取指定键的已登录连接。
+
+        连接不存在、已断开或空闲超时时，调用 factory 重新建立并登录。
+        使用过程中抛出异常时，该连接会被关闭并移出连接池。
+
+        Args:
+            key: 连接池键。
+            factory: 创建已登录连接的异步工厂函数。
+
+        Yields:
+            已登录的连接对象。
+        """
+        self._ensure_sweeper()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                await self._evict_idle(exclude=key)
+
+                entry = self._connections.pop(key, None)
+                if entry is not None and not await self._is_reusable(entry):
+                    await self._close(key, entry.connection)
+                    entry = None
+
+                if entry is None:
+                    entry = _PooledConnection(
+                        connection=await factory(), last_used=0.0
+                    )
+                    self._logger.debug(
+                        "%s已建立: %s:%s %s",
+                        self._PROTOCOL,
+                        key.host,
+                        key.port,
+                        key.username,
+                    )
+
+                try:
+                    yield entry.connection
+                except BaseException:
+                    await self._close(key, entry.connection)
+                    raise
+
+                if key in self._discarded:
+                    await self._close(key, entry.connection)
+                    return
+                entry.last_used = time.monotonic()
+                self._connections[key] = entry
+        finally:
+            remaining = self._waiting.pop(key) - 1
+            if remaining:
+                self._waiting[key] = remaining
+            else:
+                self._discarded.discard(key)
+            self._drop_unused_lock(key)
+
+    async def release(self, key: PoolKey, connection: Any) -> None:
+        """将在连接池外建立的已登录连接放入连接池。
+
+        该键已有空闲连接或正被占用时，直接关闭传入的连接。
+
+        Args:
+            key: 连接池键。
+            connection: 已登录的连接对象。
+        """
+        lock = self._locks.get(key)
+        if (lock is not None and lock.locked()) or key in self._connections:
+            await self._close(key, connection)
+            return
+        self._locks.setdefault(key, asyncio.Lock())
+        self._ensure_sweeper()
+        self._connections[key] = _PooledConnection(
+            connection=connection, last_used=time.monotonic()
+        )
+
+    async def evict_account(self, account_id: int) -> None:
+        """驱逐指定账户的全部连接。
+
+        账户删除或凭据变更时调用。空闲连接立即关闭；正在使用或排队等待该键的
+        调用归还连接时直接关闭，直到这些调用全部结束前都不会放回连接池。
+
+        Args:
+            account_id: 邮箱账户ID。
+        """
+        for key, lock in list(self._locks.items()):
+            if key.account_id != account_id:
+                continue
+            if key in self._waiting:
+                self._discarded.add(key)
+            entry = self._connections.pop(key, None)
+            if entry is not None:
+                await self._close(key, entry.connection)
+            self._drop_unused_lock(key)
+
+    async def close(self) -> None:
+        """停止后台清理并关闭连接池中的全部连接。"""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+        connections = list(self._connections.items())
+        self._connections.clear()
+        for key, entry in connections:
+            await self._close(key, entry.connection)
+            self._drop_unused_lock(key)
+
+    @abstractmethod
+    async def _check_alive(self, connection: Any) -> bool:
+        """检查连接是否仍然存活，由各协议的连接池实现。
+
+        Args:
+            connection: 已登录的连接对象。
+
+        Returns:
+            连接存活返回True。
+        """
+        pass
+
+    @abstractmethod
+    async def _close_connection(self, connection: Any) -> None:
+        """关闭单个连接，由各协议的连接池实现。
+
+        Args:
+            connection: 已登录的连接对象。
+        """
+        pass
+
+    async def _is_reusable(self, entry: _PooledConnection) -> bool:
+        """判断连接是否仍可复用。
+
+        Args:
+            entry: 连接条目。
+
+        Returns:
+            未空闲超时且存活检查通过则返回True。
+        """
+        if time.monotonic() - entry.last_used > self._idle_timeout:
+            return False
+        return await self._check_alive(entry.connection)
+
+    async def _evict_idle(self, exclude: Optional[PoolKey] = None) -> None:
+        """回收其他键下空闲超时且未被占用的连接。
+
+        Args:
+            exclude: 当前正在获取的键（由调用方自行处理）。
+        """
+        now = time.monotonic()
+        expired = [
+            key
+            for key, entry in self._connections.items()
+            if key != exclude
+            and now - entry.last_used > self._idle_timeout
+            and not self._locks[key].locked()
+        ]
+        for key in expired:
+            entry = self._connections.pop(key)
+            await self._close(key, entry.connection)
+            self._drop_unused_lock(key)
+
+    def _ensure_sweeper(self) -> None:
+        """在首次使用连接池时启动后台清理任务。"""
+        if self._sweep_interval is None or self._sweep_task is not None:
+            return
+        self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        """定期回收空闲超时的连接，并检查其余空闲连接是否存活。"""
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                await self._sweep_once()
+            except Exception as exc:
+                self._logger.warning("%s池清理失败: %s", self._PROTOCOL, exc)
+
+    async def _sweep_once(self) -> None:
+        """执行一次清理。"""
+        await self._evict_idle()
+        for key in list(self._connections):
+            lock = self._locks.get(key)
+            if lock is None or lock.locked():
+                continue
+            async with lock:
+                entry = self._connections.get(key)
+                # 存活检查不刷新 last_used，空闲超时仍以真实使用时间为准
+                if entry is not None and not await self._check_alive(entry.connection):
+                    self._connections.pop(key, None)
+                    await self._close(key, entry.connection)
+            self._drop_unused_lock(key)
+
+    def _drop_unused_lock(self, key: PoolKey) -> None:
+        """回收没有连接且无人等待或持有的键锁。
+
+        键包含凭据指纹，密码变更或账户更替后旧键不会再被使用，
+        不回收时锁字典会随进程运行持续增长。
+
+        Args:
+            key: 连接池键。
+        """
+        if (
+            key in self._connections
+            or key in self._waiting
+            or key in self._discarded
+        ):
+            return
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._locks[key]
+
+    async def _close(self, key: PoolKey, connection: Any) -> None:
+        """关闭单个连接，忽略关闭过程中的异常。
+
+        Args:
+            key: 连接池键。
+            connection: 已登录的连接对象。
+        """
+        try:
+            await self._close_connection(connection)
+        except Exception as exc:
+            self._logger.debug(
+                "关闭%s失败: %s:%s %s, %s",
+                self._PROTOCOL,
+                key.host,
+                key.port,
+                key.username,
+                exc,
+            )
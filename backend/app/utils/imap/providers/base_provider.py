@@ -6,14 +6,41 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from logging import Logger
-from typing import Optional, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Mapping, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from aioimaplib import IMAP4_SSL
 
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=256)
+def quote_mailbox_name(mailbox_name: str) -> str:
+    """按IMAP语法为文件夹名称加引号。
+
+    同一账户的文件夹名称集合很小且反复出现，结果按名称缓存。
+
+    Args:
+        mailbox_name: 原始文件夹名称。
+
+    Returns:
+        包含空格或引号时返回转义后的带引号名称，否则原样返回。
+    """
+    if not mailbox_name:
+        return mailbox_name
+
+    if mailbox_name.startswith('"') and mailbox_name.endswith('"'):
+        return mailbox_name
+
+    if " " in mailbox_name or '"' in mailbox_name:
+        escaped = mailbox_name.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+
+    return mailbox_name
+
+
+@dataclass(frozen=True, slots=True)
 class ProviderConfig:
     """邮箱服务商配置。
 
@@ -48,6 +75,17 @@ class BaseEmailProvider(ABC):
         logger: 日志记录器。
     """
 
+    # 特殊文件夹类型到实际名称的映射，子类按服务商覆盖
+    _SPECIAL_FOLDERS: Mapping[str, str] = MappingProxyType(
+        {
+            "inbox": "INBOX",
+            "sent": "Sent",
+            "drafts": "Drafts",
+            "trash": "Trash",
+            "junk": "Junk",
+        }
+    )
+
     def __init__(self, logger: Optional[Logger] = None):
         """初始化服务商提供者。
 
@@ -127,34 +165,18 @@ class BaseEmailProvider(ABC):
         Returns:
             格式化后的文件夹名称。
         """
-        if not mailbox_name:
-            return mailbox_name
-
-        # 默认实现：处理包含空格或引号的名称
-        if mailbox_name.startswith('"') and mailbox_name.endswith('"'):
-            return mailbox_name
-
-        if " " in mailbox_name or '"' in mailbox_name:
-            escaped = mailbox_name.replace("\\", "\\\\").replace('"', '\\"')
-            return f'"{escaped}"'
-
-        return mailbox_name
+        return quote_mailbox_name(mailbox_name)
 
-    def get_special_folders(self) -> dict[str, str]:
+    def get_special_folders(self) -> Mapping[str, str]:
         """获取特殊文件夹映射。
 
-        不同服务商的特殊文件夹（收件箱、已发送、草稿等）名称可能不同。
+        不同服务商的特殊文件夹（收件箱、已发送、草稿等）名称可能不同，
+        子类通过覆盖 ``_SPECIAL_FOLDERS`` 提供各自的映射。
 
         Returns:
-            特殊文件夹类型到实际名称的映射字典。
+            特殊文件夹类型到实际名称的只读映射，每次调用返回同一对象。
         """
-        return {
-            "inbox": "INBOX",
-            "sent": "Sent",
-            "drafts": "Drafts",
-            "trash": "Trash",
-            "junk": "Junk",
-        }
+        return self._SPECIAL_FOLDERS
 
     def requires_id_command(self) -> bool:
         """是否需要发送ID命令。
@@ -6,6 +6,7 @@
 """
 
 from logging import Logger
+from types import MappingProxyType
 from typing import Optional, TYPE_CHECKING
 
 from app.utils.imap.providers.base_provider import BaseEmailProvider, ProviderConfig
@@ -42,6 +43,17 @@ class NeteaseEmailProvider(BaseEmailProvider):
     CLIENT_VERSION = "1.0"
     CLIENT_VENDOR = "Argus Mail Client"
 
+    # 网易邮箱的文件夹名称使用UTF-7编码的中文名
+    _SPECIAL_FOLDERS = MappingProxyType(
+        {
+            "inbox": "INBOX",
+            "sent": "&XfJT0ZAB-",      # 已发送
+            "drafts": "&g0l6P3ux-",    # 草稿箱
+            "trash": "&XfJSIJZk-",     # 已删除
+            "junk": "&V4NXPpCuTvY-",   # 垃圾邮件
+        }
+    )
+
     def __init__(self, logger: Optional[Logger] = None):
         """初始化网易邮箱提供者。
 
@@ -150,22 +162,6 @@ class NeteaseEmailProvider(BaseEmailProvider):
             # 回退到标准方式
             return await client.id()
 
-    def get_special_folders(self) -> dict[str, str]:
-        """网易邮箱特殊文件夹映射。
-
-        网易邮箱的文件夹名称使用UTF-7编码的中文名。
-
-        Returns:
-            网易邮箱的特殊文件夹名称映射。
-        """
-        return {
-            "inbox": "INBOX",
-            "sent": "&XfJT0ZAB-",      # 已发送
-            "drafts": "&g0l6P3ux-",    # 草稿箱
-            "trash": "&XfJSIJZk-",     # 已删除
-            "junk": "&V4NXPpCuTvY-",   # 垃圾邮件
-        }
-
     def get_connection_timeout(self) -> int:
         """网易邮箱连接超时时间。
 
@@ -53,6 +53,12 @@ class ProviderFactory:
         "hhstu.edu.cn": SchoolEmailProvider,
     }
 
+    # 已创建的提供者实例缓存，键为 (提供者类, 日志记录器)
+    # 内置提供者只持有日志记录器与常量配置，可安全复用
+    _instance_cache: dict[
+        tuple[Type[BaseEmailProvider], Optional[Logger]], BaseEmailProvider
+    ] = {}
+
     @classmethod
     def get_provider(
         cls,
@@ -78,7 +84,7 @@ class ProviderFactory:
         provider_class = cls._provider_map.get(email_type)
 
         if provider_class:
-            return provider_class(logger=logger)
+            return cls._get_instance(provider_class, logger)
 
         # 自定义类型，使用DefaultEmailProvider
         if email_type == EmailType.CUSTOM:
@@ -103,7 +109,8 @@ class ProviderFactory:
     ) -> BaseEmailProvider:
         """根据邮箱地址自动检测并获取服务商提供者。
 
-        通过分析邮箱地址的域名部分，自动识别邮箱服务商。
+        通过分析邮箱地址的域名部分，自动识别邮箱服务商，
+        已注册域名的子域名（如 stu.hhstu.edu.cn）同样会被识别。
 
         Args:
             email_address: 邮箱地址。
@@ -117,14 +124,23 @@ class ProviderFactory:
             >>> print(provider.name)
             '网易163邮箱'
         """
-        if "@" not in email_address:
+        _, at, domain = email_address.rpartition("@")
+        if not at:
             return DefaultEmailProvider(logger=logger)
 
-        domain = email_address.split("@")[1].lower()
+        if not domain.islower():
+            domain = domain.lower()
 
-        provider_class = cls._domain_map.get(domain)
-        if provider_class:
-            return provider_class(logger=logger)
+        # 先精确匹配，再逐级去掉最左侧的标签按后缀匹配，
+        # 例如 stu.hhstu.edu.cn 依次尝试 hhstu.edu.cn、edu.cn、cn
+        suffix = domain
+        while True:
+            provider_class = cls._domain_map.get(suffix)
+            if provider_class:
+                return cls._get_instance(provider_class, logger)
+            _, dot, suffix = suffix.partition(".")
+            if not dot:
+                break
 
         # 未知域名，返回默认提供者
         return DefaultEmailProvider(
@@ -132,6 +148,28 @@ class ProviderFactory:
             provider_name=f"未知邮箱({domain})",
         )
 
+    @classmethod
+    def _get_instance(
+        cls,
+        provider_class: Type[BaseEmailProvider],
+        logger: Optional[Logger],
+    ) -> BaseEmailProvider:
+        """获取已注册提供者类的共享实例。
+
+        Args:
+            provider_class: 服务商提供者类。
+            logger: 日志记录器。
+
+        Returns:
+            缓存的服务商提供者实例，首次获取时创建。
+        """
+        key = (provider_class, logger)
+        provider = cls._instance_cache.get(key)
+        if provider is None:
+            provider = provider_class(logger=logger)
+            cls._instance_cache[key] = provider
+        return provider
+
     @classmethod
     def register(
         cls,
@@ -5,6 +5,7 @@ QQ邮箱使用标准IMAP协议，无需特殊处理。
 """
 
 from logging import Logger
+from types import MappingProxyType
 from typing import Optional
 
 from app.utils.imap.providers.base_provider import BaseEmailProvider, ProviderConfig
@@ -31,6 +32,16 @@ class QQEmailProvider(BaseEmailProvider):
         - 垃圾邮件: Junk
     """
 
+    _SPECIAL_FOLDERS = MappingProxyType(
+        {
+            "inbox": "INBOX",
+            "sent": "Sent Messages",
+            "drafts": "Drafts",
+            "trash": "Deleted Messages",
+            "junk": "Junk",
+        }
+    )
+
     def __init__(self, logger: Optional[Logger] = None):
         """初始化QQ邮箱提供者。
 
@@ -70,17 +81,3 @@ class QQEmailProvider(BaseEmailProvider):
             False，表示不需要发送ID命令。
         """
         return False
-
-    def get_special_folders(self) -> dict[str, str]:
-        """QQ邮箱特殊文件夹映射。
-
-        Returns:
-            QQ邮箱的特殊文件夹名称映射。
-        """
-        return {
-            "inbox": "INBOX",
-            "sent": "Sent Messages",
-            "drafts": "Drafts",
-            "trash": "Deleted Messages",
-            "junk": "Junk",
-        }
@@ -4,6 +4,7 @@
 """
 
 import logging
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
@@ -11,6 +12,8 @@ from typing import List, Optional
 import aiosmtplib
 
 from app.utils.imap.imap_config import ImapConfig
+from app.utils.imap.keyed_connection_pool import PoolKey
+from app.utils.imap.smtp_connection_pool import SmtpConnectionPool
 
 
 class SmtpClient:
@@ -38,9 +41,14 @@ class SmtpClient:
         content: str,
         content_html: Optional[str] = None,
         cc_addresses: Optional[List[str]] = None,
+        pool: Optional[SmtpConnectionPool] = None,
+        account_id: Optional[int] = None,
     ) -> bool:
         """发送邮件。
 
+        提供连接池时复用已登录的SMTP会话；复用前先发送NOOP确认会话可用，
+        若此时会话已被服务器断开，则重新建立连接并重试一次。
+
         Args:
             username: 发件人邮箱地址。
             password: 授权密码。
@@ -49,37 +57,31 @@ class SmtpClient:
             content: 纯文本内容。
             content_html: HTML内容（可选）。
             cc_addresses: 抄送人列表（可选）。
+            pool: SMTP连接池（可选）。
+            account_id: 发件邮箱账户ID，用于删除账户时驱逐连接池中的会话。
 
         Returns:
             是否发送成功。
         """
         try:
-            # 创建邮件
-            if content_html:
-                msg = MIMEMultipart("alternative")
-                msg.attach(MIMEText(content, "plain", "utf-8"))
-                msg.attach(MIMEText(content_html, "html", "utf-8"))
-            else:
-                msg = MIMEText(content, "plain", "utf-8")
-
-            msg["Subject"] = subject
-            msg["From"] = username
-            msg["To"] = ", ".join(to_addresses)
-            if cc_addresses:
-                msg["Cc"] = ", ".join(cc_addresses)
-
-            # 发送邮件
-            all_recipients = to_addresses + (cc_addresses or [])
-
-            await aiosmtplib.send(
-                msg,
-                hostname=self._config.smtp_host,
-                port=self._config.smtp_port,
-                username=username,
-                password=password,
-                use_tls=self._config.use_ssl,
+            msg = self._build_message(
+                username, to_addresses, subject, content, content_html, cc_addresses
             )
 
+            if pool is None:
+                await aiosmtplib.send(
+                    msg,
+                    hostname=self._config.smtp_host,
+                    port=self._config.smtp_port,
+                    username=username,
+                    password=password,
+                    use_tls=self._config.use_ssl,
+                )
+            else:
+                await self._send_with_pool(
+                    pool, username, password, msg, account_id
+                )
+
             self._logger.info("邮件发送成功: to=%s", to_addresses)
             return True
 
@@ -87,6 +89,117 @@ class SmtpClient:
             self._logger.error("邮件发送失败: %s", e)
             return False
 
+    async def _send_with_pool(
+        self,
+        pool: SmtpConnectionPool,
+        username: str,
+        password: str,
+        msg: Message,
+        account_id: Optional[int] = None,
+    ) -> None:
+        """通过连接池中的会话发送邮件。
+
+        Args:
+            pool: SMTP连接池。
+            username: 发件人邮箱地址。
+            password: 授权密码。
+            msg: 待发送的邮件对象。
+            account_id: 发件邮箱账户ID。
+
+        Raises:
+            aiosmtplib.SMTPException: 发送失败，或复用会话断开后重试仍失败。
+        """
+        key = PoolKey.build(
+            account_id,
+            self._config.smtp_host,
+            self._config.smtp_port,
+            username,
+            password,
+        )
+        for attempt in range(2):
+            reused = True
+            probing = False
+
+            async def open_session() -> aiosmtplib.SMTP:
+                nonlocal reused
+                reused = False
+                return await self._open_session(username, password)
+
+            try:
+                async with pool.acquire(key, open_session) as smtp:
+                    if reused:
+                        # 复用的会话可能已被服务器超时断开，发信前用NOOP确认
+                        probing = True
+                        await smtp.noop()
+                        probing = False
+                    await smtp.send_message(msg)
+                return
+            except aiosmtplib.SMTPServerDisconnected as exc:
+                # 仅在复用会话的NOOP探测阶段断开时重试，此时邮件尚未发送；
+                # 新建会话或发信过程中断开时服务器可能已接收邮件，重试会导致重复投递
+                if attempt or not probing:
+                    raise
+                self._logger.warning("SMTP会话已断开，重新连接: %s", exc)
+
+    async def _open_session(self, username: str, password: str) -> aiosmtplib.SMTP:
+        """建立并登录SMTP会话。
+
+        Args:
+            username: 邮箱地址。
+            password: 授权密码。
+
+        Returns:
+            已登录的SMTP会话。
+        """
+        smtp = aiosmtplib.SMTP(
+            hostname=self._config.smtp_host,
+            port=self._config.smtp_port,
+            use_tls=self._config.use_ssl,
+        )
+        await smtp.connect()
+        try:
+            await smtp.login(username, password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    @staticmethod
+    def _build_message(
+        username: str,
+        to_addresses: List[str],
+        subject: str,
+        content: str,
+        content_html: Optional[str],
+        cc_addresses: Optional[List[str]],
+    ) -> Message:
+        """构建待发送的邮件对象。
+
+        Args:
+            username: 发件人邮箱地址。
+            to_addresses: 收件人列表。
+            subject: 邮件主题。
+            content: 纯文本内容。
+            content_html: HTML内容。
+            cc_addresses: 抄送人列表。
+
+        Returns:
+            MIME邮件对象。
+        """
+        if content_html:
+            msg = MIMEMultipart("alternative")
+            msg.attach(MIMEText(content, "plain", "utf-8"))
+            msg.attach(MIMEText(content_html, "html", "utf-8"))
+        else:
+            msg = MIMEText(content, "plain", "utf-8")
+
+        msg["Subject"] = subject
+        msg["From"] = username
+        msg["To"] = ", ".join(to_addresses)
+        if cc_addresses:
+            msg["Cc"] = ", ".join(cc_addresses)
+        return msg
+
     async def test_connection(self, username: str, password: str) -> bool:
         """测试SMTP连接。
 
@@ -0,0 +1,47 @@
+"""SMTP连接池模块。
+
+按账户与登录凭据缓存已登录的SMTP会话，
+避免每次发信都重复进行TLS握手与AUTH认证。
+"""
+
+import logging
+from typing import Any, Optional
+
+from app.utils.imap.keyed_connection_pool import KeyedConnectionPool
+
+
+class SmtpConnectionPool(KeyedConnectionPool):
+    """SMTP会话连接池。
+
+    复用前与后台清理时检查会话的连接状态，不额外发送命令。
+    """
+
+    _PROTOCOL = "SMTP会话"
+
+    def __init__(
+        self,
+        idle_timeout: float = 100.0,
+        logger: Optional[logging.Logger] = None,
+        sweep_interval: Optional[float] = 60.0,
+    ) -> None:
+        """初始化SMTP连接池。
+
+        Args:
+            idle_timeout: 会话最大空闲时间（秒），超过后关闭并重建。
+            logger: 日志记录器。
+            sweep_interval: 后台清理的间隔（秒），为None时不启动后台清理。
+        """
+        super().__init__(idle_timeout, logger, sweep_interval)
+
+    async def _check_alive(self, connection: Any) -> bool:
+        """检查SMTP会话是否仍处于连接状态。"""
+        return bool(getattr(connection, "is_connected", False))
+
+    async def _close_connection(self, connection: Any) -> None:
+        """关闭SMTP会话，QUIT失败时直接关闭底层连接。"""
+        try:
+            if getattr(connection, "is_connected", False):
+                await connection.quit()
+        except Exception:
+            connection.close()
+            raise
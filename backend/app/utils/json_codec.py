@@ -0,0 +1,32 @@
+"""JSON序列化工具。"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    # 未安装orjson时回退到标准库json。
+    orjson = None
+
+
+class JsonCodec:
+    """JSON序列化工具类。
+
+    优先使用C扩展实现的orjson进行序列化，未安装时回退到标准库json。
+    输出统一为UTF-8字符串，中文等非ASCII字符不做转义。
+    """
+
+    @staticmethod
+    def dumps(data: Any) -> str:
+        """将数据序列化为JSON字符串。
+
+        Args:
+            data: 待序列化的数据（dict、list及基础类型）。
+
+        Returns:
+            JSON字符串。
+        """
+        if orjson is not None:
+            return orjson.dumps(data).decode("utf-8")
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,46 @@
+"""并发异步任务合并工具。"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+class TaskCoalescer(Generic[ResultT]):
+    """按键合并并发的异步任务。
+
+    同一键已有进行中的任务时，后到的调用方直接等待该任务的结果，
+    不再重复执行。任务完成后立即移除，之后的调用会重新执行。
+    """
+
+    def __init__(self) -> None:
+        """初始化任务合并器。"""
+        self._tasks: Dict[Hashable, "asyncio.Future[ResultT]"] = {}
+
+    async def run(
+        self, key: Hashable, factory: Callable[[], Awaitable[ResultT]]
+    ) -> Tuple[ResultT, bool]:
+        """执行任务，并合并同一键的并发请求。
+
+        Args:
+            key: 任务键。
+            factory: 创建任务协程的工厂函数，仅在本次调用为发起方时调用。
+
+        Returns:
+            (任务结果, 是否为本次任务的发起方) 元组。
+        """
+        running = self._tasks.get(key)
+        if running is not None:
+            # 使用shield避免等待方被取消时连带取消发起方的任务
+            return await asyncio.shield(running), False
+
+        task = asyncio.ensure_future(factory())
+        self._tasks[key] = task
+        try:
+            return await task, True
+        finally:
+            self._tasks.pop(key, None)
+
+    def __len__(self) -> int:
+        """返回进行中的任务数量。"""
+        return len(self._tasks)
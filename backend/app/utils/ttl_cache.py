@@ -0,0 +1,104 @@
+"""带过期时间的LRU缓存工具。"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+ValueT = TypeVar("ValueT")
+
+
+class TtlLruCache(Generic[ValueT]):
+    """带过期时间的进程内LRU缓存。
+
+    超过容量时淘汰最久未使用的条目，条目写入超过 ttl 秒后视为失效。
+    提供 max_cost 与 cost 时，还按条目开销的总和限制缓存大小。
+    仅用于单个事件循环内的进程级缓存，不做线程同步。
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_cost: Optional[int] = None,
+        cost: Optional[Callable[[ValueT], int]] = None,
+    ) -> None:
+        """初始化缓存。
+
+        Args:
+            maxsize: 最大条目数。
+            ttl: 条目有效期（秒）。
+            max_cost: 全部条目开销之和的上限，为None时不限制。
+            cost: 计算单个条目开销的函数，与 max_cost 一同使用。
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._max_cost = max_cost
+        self._cost = cost
+        self._total_cost = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, ValueT, int]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[ValueT]:
+        """读取缓存。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            缓存值，不存在或已过期时返回None。
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self.pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: ValueT) -> None:
+        """写入缓存。
+
+        单个条目的开销超过 max_cost 时不写入。
+
+        Args:
+            key: 缓存键。
+            value: 缓存值。
+        """
+        self.pop(key)
+        cost = self._cost(value) if self._cost else 0
+        if self._max_cost is not None and cost > self._max_cost:
+            return
+        self._data[key] = (time.monotonic() + self._ttl, value, cost)
+        self._total_cost += cost
+        while len(self._data) > self._maxsize or (
+            self._max_cost is not None and self._total_cost > self._max_cost
+        ):
+            _, (_, _, evicted_cost) = self._data.popitem(last=False)
+            self._total_cost -= evicted_cost
+
+    def pop(self, key: Hashable) -> None:
+        """删除缓存条目。
+
+        Args:
+            key: 缓存键。
+        """
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._total_cost -= entry[2]
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        self._data.clear()
+        self._total_cost = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """判断缓存中是否存在未过期的条目。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            是否存在。
+        """
+        return self.get(key) is not None
@@ -0,0 +1,145 @@
+"""按键连接池的单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from app.utils.imap.imap_connection_pool import ImapConnectionPool
+from app.utils.imap.keyed_connection_pool import PoolKey
+
+
+class FakeImapConnection:
+    """记录NOOP与断开情况的假IMAP连接。"""
+
+    def __init__(self) -> None:
+        self.alive = True
+        self.disconnected = False
+
+    async def noop(self) -> bool:
+        return self.alive
+
+    async def disconnect(self) -> None:
+        self.disconnected = True
+
+
+class KeyedConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    """连接复用、凭据变更与按账户驱逐测试用例。"""
+
+    async def asyncSetUp(self) -> None:
+        """初始化不启动后台清理的连接池。"""
+        self._pool = ImapConnectionPool(sweep_interval=None)
+        self._created: list[FakeImapConnection] = []
+
+    async def asyncTearDown(self) -> None:
+        """关闭连接池。"""
+        await self._pool.close()
+
+    async def _factory(self) -> FakeImapConnection:
+        connection = FakeImapConnection()
+        self._created.append(connection)
+        return connection
+
+    async def _use(self, key: PoolKey) -> FakeImapConnection:
+        async with self._pool.acquire(key, self._factory) as connection:
+            return connection
+
+    async def test_same_key_reuses_connection(self) -> None:
+        """同一账户与凭据的连续获取复用同一连接。"""
+        key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "secret")
+
+        first = await self._use(key)
+        second = await self._use(key)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self._created), 1)
+
+    async def test_password_change_does_not_reuse_connection(self) -> None:
+        """授权密码变更后不复用旧凭据登录的连接。"""
+        old_key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "old")
+        new_key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "new")
+
+        first = await self._use(old_key)
+        second = await self._use(new_key)
+
+        self.assertIsNot(first, second)
+        self.assertNotIn("old", new_key.credential)
+
+    async def test_evict_account_closes_idle_and_in_use_connections(self) -> None:
+        """驱逐账户时关闭空闲连接，使用中的连接在归还时关闭。"""
+        idle_key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "secret")
+        busy_key = PoolKey.build(1, "imap.qq.com", 993, "b@qq.com", "secret")
+        other_key = PoolKey.build(2, "imap.qq.com", 993, "c@qq.com", "secret")
+        idle = await self._use(idle_key)
+        other = await self._use(other_key)
+
+        async with self._pool.acquire(busy_key, self._factory) as busy:
+            await self._pool.evict_account(1)
+            self.assertTrue(idle.disconnected)
+            self.assertFalse(busy.disconnected)
+
+        self.assertTrue(busy.disconnected)
+        self.assertFalse(other.disconnected)
+        self.assertIsNot(await self._use(idle_key), idle)
+
+    async def test_evict_account_applies_to_queued_callers(self) -> None:
+        """驱逐账户时排队等待该键的调用归还的新连接同样被关闭。"""
+        key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "secret")
+        holder_entered = asyncio.Event()
+        release_holder = asyncio.Event()
+
+        async def hold() -> FakeImapConnection:
+            async with self._pool.acquire(key, self._factory) as connection:
+                holder_entered.set()
+                await release_holder.wait()
+                return connection
+
+        holder_task = asyncio.create_task(hold())
+        await holder_entered.wait()
+        waiter_task = asyncio.create_task(self._use(key))
+        await asyncio.sleep(0)
+
+        await self._pool.evict_account(1)
+        release_holder.set()
+        holder = await holder_task
+        waiter = await waiter_task
+
+        self.assertIsNot(holder, waiter)
+        self.assertTrue(holder.disconnected)
+        self.assertTrue(waiter.disconnected)
+        self.assertNotIn(key, self._pool._connections)
+        self.assertNotIn(key, self._pool._locks)
+
+        reused = await self._use(key)
+        self.assertFalse(reused.disconnected)
+        self.assertIs(await self._use(key), reused)
+
+    async def test_sweep_closes_dead_idle_connections(self) -> None:
+        """后台清理通过NOOP发现失效的空闲连接并关闭。"""
+        key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "secret")
+        connection = await self._use(key)
+        connection.alive = False
+
+        await self._pool._sweep_once()
+
+        self.assertTrue(connection.disconnected)
+        self.assertIsNot(await self._use(key), connection)
+
+    async def test_locks_are_dropped_with_their_connections(self) -> None:
+        """连接被关闭后回收对应键的锁，旧凭据的键不会长期驻留。"""
+        old_key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "old")
+        new_key = PoolKey.build(1, "imap.qq.com", 993, "a@qq.com", "new")
+        connection = await self._use(old_key)
+        connection.alive = False
+
+        await self._pool._sweep_once()
+        await self._use(new_key)
+
+        self.assertNotIn(old_key, self._pool._locks)
+        self.assertIn(new_key, self._pool._locks)
+
+        with self.assertRaises(RuntimeError):
+            async with self._pool.acquire(old_key, self._factory):
+                raise RuntimeError("boom")
+
+        self.assertNotIn(old_key, self._pool._locks)
@@ -0,0 +1,59 @@
+"""Clash风格域名规则集合的单元测试。"""
+
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+
+from app.utils.domain_rule_set import DomainRuleSet
+
+
+def _rule(rule_type: str, rule_value: str) -> SimpleNamespace:
+    """构造带有 rule_type 与 rule_value 属性的规则对象。"""
+    return SimpleNamespace(rule_type=rule_type, rule_value=rule_value)
+
+
+class DomainRuleSetTest(unittest.TestCase):
+    """域名规则匹配测试用例。"""
+
+    def test_exact_match(self) -> None:
+        """DOMAIN规则只命中完全相同的域名，不命中子域名。"""
+        rule_set = DomainRuleSet.build([_rule("DOMAIN", "Good.com ")])
+
+        self.assertEqual(rule_set.match("good.com"), "DOMAIN:good.com")
+        self.assertIsNone(rule_set.match("mail.good.com"))
+
+    def test_suffix_matches_subdomains(self) -> None:
+        """DOMAIN-SUFFIX规则命中域名本身及其各级子域名。"""
+        rule_set = DomainRuleSet.build([_rule("DOMAIN-SUFFIX", "good.com")])
+
+        self.assertEqual(rule_set.match("good.com"), "DOMAIN-SUFFIX:good.com")
+        self.assertEqual(rule_set.match("a.b.good.com"), "DOMAIN-SUFFIX:good.com")
+
+    def test_suffix_respects_label_boundary(self) -> None:
+        """后缀按标签匹配，notgood.com 与 good.com.evil.com 不命中 good.com。"""
+        rule_set = DomainRuleSet.build([_rule("DOMAIN-SUFFIX", "good.com")])
+
+        self.assertIsNone(rule_set.match("notgood.com"))
+        self.assertIsNone(rule_set.match("good.com.evil.com"))
+        self.assertIsNone(rule_set.match("com"))
+
+    def test_keyword_match(self) -> None:
+        """DOMAIN-KEYWORD规则按子串匹配。"""
+        rule_set = DomainRuleSet.build([_rule("DOMAIN-KEYWORD", "campus")])
+
+        self.assertEqual(rule_set.match("my-campus.cn"), "DOMAIN-KEYWORD:campus")
+        self.assertIsNone(rule_set.match("example.cn"))
+
+    def test_ignores_unknown_and_empty_rules(self) -> None:
+        """未知类型与空值规则被忽略，不计入规则数量。"""
+        rule_set = DomainRuleSet.build(
+            [
+                _rule("IP-CIDR", "10.0.0.0/8"),
+                _rule("DOMAIN", " "),
+                _rule("DOMAIN", None),
+            ]
+        )
+
+        self.assertEqual(len(rule_set), 0)
+        self.assertIsNone(rule_set.match("10.0.0.1"))
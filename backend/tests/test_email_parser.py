@@ -0,0 +1,151 @@
+"""邮件解析器的单元测试。"""
+
+from __future__ import annotations
+
+import logging
+import unittest
+from email.utils import parseaddr
+
+from app.entities.email_recipient_entity import RecipientType
+from app.utils.imap.email_parser import (
+    EmailParser,
+    _WS_RE,
+    _SNIPPET_LENGTH,
+    _SNIPPET_SOURCE_WINDOW,
+    _decode_header_value,
+    _match_simple_address,
+)
+
+# 快速路径应直接处理的单地址头部
+_SIMPLE_HEADERS = (
+    "a@b.com",
+    "<a@b.com>",
+    " <a@b.com> ",
+    "Name<a@b.com>",
+    '"" <a@b.com>',
+    '"Doe, John" <j@x.com>',
+    '"a;b" <a@b.com>',
+    "John Q. Public <j@x.com>",
+    "O'Brien <o@x.com>",
+    "张三 <z@x.com>",
+)
+# 需要回退到标准库解析的头部
+_FALLBACK_HEADERS = (
+    "=?UTF-8?B?5byg5LiJ?= <z@x.com>",
+    '"=?UTF-8?B?5byg5LiJ?=" <z@x.com>',
+    '"a\\"b" <a@b.com>',
+    "John <j@x.com> (comment)",
+    '"x" y <a@b.com>',
+    "user@[1.2.3.4]",
+    "<>",
+)
+
+
+def _reference_address(header_value: str) -> tuple:
+    """以标准库 parseaddr 解析并解码显示名称，作为对照结果。"""
+    name, address = parseaddr(header_value)
+    return _decode_header_value(name), address
+
+
+class MatchSimpleAddressTest(unittest.TestCase):
+    """地址快速路径与 email.utils.parseaddr 一致性测试用例。"""
+
+    def setUp(self) -> None:
+        """初始化解析器。"""
+        self._parser = EmailParser(logging.getLogger("test.email_parser"))
+
+    def test_simple_headers_match_parseaddr(self) -> None:
+        """快速路径命中时与 parseaddr 的结果一致。"""
+        for header in _SIMPLE_HEADERS:
+            with self.subTest(header=header):
+                self.assertEqual(
+                    _match_simple_address(header), _reference_address(header)
+                )
+
+    def test_complex_headers_fall_back(self) -> None:
+        """编码词、转义、注释等形式不走快速路径。"""
+        for header in _FALLBACK_HEADERS:
+            with self.subTest(header=header):
+                self.assertIsNone(_match_simple_address(header))
+
+    def test_multiple_addresses_fall_back(self) -> None:
+        """多个地址不走快速路径，收件人按逗号拆分，引号内的逗号不拆分。"""
+        header = '"Doe, John" <j@x.com>, <c@d.com>'
+        self.assertIsNone(_match_simple_address(header))
+
+        recipients = self._parser._parse_recipient_header(
+            "To", [header], RecipientType.TO
+        )
+
+        self.assertEqual(
+            [(r.name, r.address) for r in recipients],
+            [("Doe, John", "j@x.com"), (None, "c@d.com")],
+        )
+
+    def test_parse_sender_matches_parseaddr(self) -> None:
+        """发件人解析结果与 parseaddr 一致，编码词被解码，空名称为None。"""
+        for header in _SIMPLE_HEADERS + _FALLBACK_HEADERS:
+            with self.subTest(header=header):
+                name, address = _reference_address(header)
+                sender = self._parser._parse_sender(header)
+                self.assertEqual(sender.name, name or None)
+                self.assertEqual(sender.address, address or None)
+
+
+class BuildSnippetTest(unittest.TestCase):
+    """邮件摘要生成测试用例。"""
+
+    def setUp(self) -> None:
+        """初始化解析器。"""
+        self._parser = EmailParser(logging.getLogger("test.email_parser"))
+
+    def _full_snippet(self, html: str) -> str:
+        """不截取窗口，直接处理整段HTML得到的摘要，作为对照结果。"""
+        text = _WS_RE.sub(" ", self._parser._strip_html(html)).strip()
+        return text[:_SNIPPET_LENGTH]
+
+    def test_html_entities(self) -> None:
+        """HTML实体被还原，&nbsp; 按空白折叠。"""
+        html = "<p>A&amp;B&nbsp;&nbsp;&lt;tag&gt; &#20013;&#x6587;</p>"
+
+        self.assertEqual(self._parser._build_snippet(None, html), "A&B <tag> 中文")
+
+    def test_tag_cut_by_window(self) -> None:
+        """跨越截取窗口的标签不会以半截形式出现在摘要中。"""
+        long_attr = "x" * (_SNIPPET_SOURCE_WINDOW * 2)
+        html = "a" * 150 + f'<a href="{long_attr}">' + "b" * 100 + "</a>"
+
+        snippet = self._parser._build_snippet(None, html)
+
+        self.assertEqual(snippet, self._full_snippet(html))
+        self.assertEqual(snippet, "a" * 150 + " " + "b" * 49)
+
+    def test_hidden_block_cut_by_window(self) -> None:
+        """跨越截取窗口的script块不会泄漏到摘要中。"""
+        script = "<script>" + "var x = 1;" * _SNIPPET_SOURCE_WINDOW + "</script>"
+        html = "开头" + script + "正文内容" * 100
+
+        snippet = self._parser._build_snippet(None, html)
+
+        self.assertEqual(snippet, self._full_snippet(html))
+        self.assertNotIn("var", snippet)
+
+    def test_cjk_text(self) -> None:
+        """中文正文按字符截取200个字符，而不是按字节。"""
+        text = "钓鱼邮件检测" * 100
+
+        snippet = self._parser._build_snippet(text, None)
+
+        self.assertEqual(len(snippet), _SNIPPET_LENGTH)
+        self.assertEqual(snippet, text[:_SNIPPET_LENGTH])
+
+    def test_plain_text_preferred_over_html(self) -> None:
+        """有纯文本时使用纯文本，空白被折叠。"""
+        snippet = self._parser._build_snippet("第一行\n\n  第二行", "<p>HTML</p>")
+
+        self.assertEqual(snippet, "第一行 第二行")
+
+    def test_empty_content(self) -> None:
+        """无正文或正文只有标签时返回None。"""
+        self.assertIsNone(self._parser._build_snippet(None, None))
+        self.assertIsNone(self._parser._build_snippet(None, "<br><!-- x -->"))
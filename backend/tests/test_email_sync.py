@@ -11,12 +11,13 @@ from pathlib import Path
 
 from app.core.database import DatabaseManager
 from app.crud.email_account_crud import EmailAccountCrud
+from app.crud.email_body_crud import EmailBodyCrud
 from app.crud.email_crud import EmailCrud
 from app.crud.email_sync_crud import EmailSyncCrud
 from app.crud.mailbox_crud import MailboxCrud
 from app.crud.user_crud import UserCrud
 from app.entities.email_account_entity import EmailType
-from app.entities.email_entity import PhishingLevel
+from app.entities.email_entity import PhishingLevel, PhishingStatus
 from app.entities.email_recipient_entity import RecipientType
 from app.utils.crypto.password_encryptor import PasswordEncryptor
 from app.utils.imap.imap_models import ParsedRecipient
@@ -71,6 +72,10 @@ class EmailSyncCrudTest(unittest.IsolatedAsyncioTestCase):
             self._db_manager,
             logger_factory.create_crud_logger("test.email", "邮件"),
         )
+        self._email_body_crud = EmailBodyCrud(
+            self._db_manager,
+            logger_factory.create_crud_logger("test.email_body", "邮件正文"),
+        )
 
         self._user = await self._user_crud.create(
             student_id="2023001",
@@ -159,11 +164,12 @@ class EmailSyncCrudTest(unittest.IsolatedAsyncioTestCase):
         )
         self.assertEqual(inserted, 2)
 
-        mailbox_messages = await self._email_crud.get_by_mailbox_ids(
-            [self._mailbox.id], limit=10, offset=0
-        )
+        rows = await self._email_crud.list_for_user(self._user.id, limit=10)
+        mailbox_messages = [row[0] for row in rows]
         self.assertEqual(len(mailbox_messages), 2)
         self.assertTrue(mailbox_messages[0].message is not None)
+        self.assertEqual(rows[0][1:], ("INBOX", "test@example.com"))
+        self.assertEqual(await self._email_crud.count_for_user(self._user.id), 2)
 
         detail = await self._email_crud.get_by_id(mailbox_messages[0].id)
         self.assertIsNotNone(detail)
@@ -207,9 +213,8 @@ class EmailSyncCrudTest(unittest.IsolatedAsyncioTestCase):
             payloads=payloads,
         )
 
-        mailbox_messages = await self._email_crud.get_by_mailbox_ids(
-            [self._mailbox.id], limit=10, offset=0
-        )
+        rows = await self._email_crud.list_for_user(self._user.id, limit=10)
+        mailbox_messages = [row[0] for row in rows]
         target = mailbox_messages[0]
         self.assertFalse(target.is_read)
 
@@ -218,3 +223,64 @@ class EmailSyncCrudTest(unittest.IsolatedAsyncioTestCase):
 
         refreshed = await self._email_crud.get_by_id(target.id)
         self.assertTrue(refreshed.is_read)
+
+    async def test_bulk_update_phishing_results(self) -> None:
+        """验证批量预取与批量写入钓鱼检测结果。"""
+        now = datetime.now(timezone.utc)
+        payloads = [
+            {
+                "uid": 20 + index,
+                "flags": [],
+                "internal_date": now,
+                "size": 256,
+                "message_id": f"<msg-bulk-{index}>",
+                "subject": f"批量检测{index}",
+                "sender_name": "Eve",
+                "sender_address": "eve@example.com",
+                "recipients": [],
+                "content_text": "请点击链接",
+                "content_html": None,
+                "snippet": "请点击链接",
+                "received_at": now,
+                "phishing_level": PhishingLevel.NORMAL,
+                "phishing_score": 0.0,
+                "phishing_reason": None,
+            }
+            for index in range(2)
+        ]
+
+        await self._email_sync_crud.save_mailbox_emails(
+            account_id=self._account.id,
+            mailbox_id=self._mailbox.id,
+            payloads=payloads,
+        )
+        rows = await self._email_crud.list_for_user(self._user.id, limit=10)
+        mailbox_messages = [row[0] for row in rows]
+        ids = [item.id for item in mailbox_messages]
+
+        prefetched = await self._email_body_crud.get_many_with_body_and_account(ids)
+        self.assertEqual(len(prefetched), 2)
+        self.assertEqual(prefetched[0].message.email_account.user_id, self._user.id)
+        self.assertIsNotNone(prefetched[0].message.body)
+
+        updated = await self._email_body_crud.bulk_update_phishing_results(
+            [
+                {
+                    "id": item.message_id,
+                    "phishing_level": PhishingLevel.HIGH_RISK,
+                    "phishing_score": 0.9,
+                    "phishing_reason": "包含可疑链接",
+                    "phishing_status": PhishingStatus.COMPLETED,
+                }
+                for item in mailbox_messages
+            ]
+        )
+        self.assertEqual(updated, 2)
+
+        refreshed = await self._email_body_crud.get_many_with_body_and_account(ids)
+        self.assertTrue(
+            all(
+                item.message.phishing_level == PhishingLevel.HIGH_RISK
+                for item in refreshed
+            )
+        )
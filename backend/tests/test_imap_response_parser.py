@@ -0,0 +1,162 @@
+"""IMAP响应解析器的单元测试。"""
+
+from __future__ import annotations
+
+import unittest
+
+from app.utils.imap.imap_response_parser import ImapResponseParser
+
+
+def _fetch_lines(seq: int, uid: int, body: bytes) -> list:
+    """按aioimaplib的返回形式构造单封邮件的FETCH响应行。"""
+    header = (
+        f'{seq} FETCH (UID {uid} FLAGS (\\Seen) '
+        f'INTERNALDATE "01-Jan-2024 08:00:00 +0800" RFC822.SIZE {len(body)} '
+        f"BODY[] {{{len(body)}}}"
+    ).encode()
+    return [header, bytearray(body), b")"]
+
+
+class SplitFetchResponsesTest(unittest.TestCase):
+    """批量FETCH响应拆分测试用例。"""
+
+    def test_multi_message_response(self) -> None:
+        """多封邮件的响应按FETCH起始行拆分，正文与UID一一对应。"""
+        lines = (
+            _fetch_lines(1, 101, b"Subject: a\r\n\r\nfirst")
+            + _fetch_lines(2, 102, b"Subject: b\r\n\r\nsecond")
+            + [b"FETCH completed"]
+        )
+
+        groups = ImapResponseParser.split_fetch_responses(lines)
+        fetched = ImapResponseParser.parse_fetched_emails(lines)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(sorted(fetched), [101, 102])
+        self.assertEqual(fetched[102].raw_bytes, b"Subject: b\r\n\r\nsecond")
+        self.assertEqual(fetched[101].flags, ["\\Seen"])
+
+    def test_literal_containing_fetch_marker(self) -> None:
+        """正文中出现 "* n FETCH {k}" 文本时不会被当作下一封邮件。"""
+        body = b"Subject: x\r\n\r\n* 2 FETCH (UID 999 BODY[] {10}\r\nend"
+        lines = _fetch_lines(1, 101, body) + _fetch_lines(2, 102, b"second")
+
+        groups = ImapResponseParser.split_fetch_responses(lines)
+        fetched = ImapResponseParser.parse_fetched_emails(lines)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(fetched[101].raw_bytes, body)
+        self.assertNotIn(999, fetched)
+
+    def test_literal_split_across_lines(self) -> None:
+        """literal跨多行返回时按声明长度跳过，其中的FETCH文本同样被忽略。"""
+        parts = [b"Subject: x\r\n", b"* 3 FETCH (UID 7 BODY[] {4}", b"tail"]
+        body = b"".join(parts)
+        header = f"1 FETCH (UID 101 BODY[] {{{len(body)}}}".encode()
+        lines = [header, *parts, b")"] + _fetch_lines(2, 102, b"second")
+
+        groups = ImapResponseParser.split_fetch_responses(lines)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(ImapResponseParser.extract_literal_bytes(groups[0]), body)
+
+    def test_empty_literal(self) -> None:
+        """空literal不吞掉下一封邮件，空正文的邮件被跳过。"""
+        lines = [b"1 FETCH (UID 101 BODY[] {0}", b")"] + _fetch_lines(
+            2, 102, b"second"
+        )
+
+        groups = ImapResponseParser.split_fetch_responses(lines)
+        fetched = ImapResponseParser.parse_fetched_emails(lines)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(list(fetched), [102])
+
+    def test_missing_uid(self) -> None:
+        """缺少UID的响应不产出邮件，也不影响其他邮件。"""
+        lines = [b"1 FETCH (FLAGS () BODY[] {5}", bytearray(b"hello"), b")"]
+        lines += _fetch_lines(2, 102, b"second")
+
+        fetched = ImapResponseParser.parse_fetched_emails(lines)
+
+        self.assertEqual(list(fetched), [102])
+
+
+class ExtractFetchUidsTest(unittest.TestCase):
+    """FETCH (UID) 响应UID提取测试用例。"""
+
+    def test_multi_message_response(self) -> None:
+        """按响应顺序提取全部UID，忽略结束行。"""
+        lines = [
+            b"1 FETCH (UID 5)",
+            b"2 FETCH (UID 9)",
+            b"3 FETCH (UID 12)",
+            b"FETCH completed",
+        ]
+
+        self.assertEqual(ImapResponseParser.extract_fetch_uids(lines), [5, 9, 12])
+
+    def test_missing_uid(self) -> None:
+        """不含UID的响应行被跳过。"""
+        lines = [b"1 FETCH (UID 5)", b"2 FETCH (FLAGS (\\Seen))", "3 FETCH (UID 8)"]
+
+        self.assertEqual(ImapResponseParser.extract_fetch_uids(lines), [5, 8])
+
+    def test_empty_response(self) -> None:
+        """空响应返回空列表。"""
+        self.assertEqual(ImapResponseParser.extract_fetch_uids([]), [])
+
+
+class ParseListLineTest(unittest.TestCase):
+    """LIST响应解析测试用例。"""
+
+    def test_quoted_name(self) -> None:
+        """带引号的名称去掉引号，保留空格与属性。"""
+        info = ImapResponseParser.parse_list_line(
+            '(\\HasNoChildren \\Sent) "/" "Sent Messages"'
+        )
+
+        self.assertEqual(info.name, "Sent Messages")
+        self.assertEqual(info.delimiter, "/")
+        self.assertEqual(info.attributes, "\\HasNoChildren \\Sent")
+
+    def test_escaped_quoted_name(self) -> None:
+        """引号字符串中的 \\" 与 \\\\ 被还原。"""
+        quote = ImapResponseParser.parse_list_line('() "/" "a\\"b"')
+        backslash = ImapResponseParser.parse_list_line('() "/" "a\\\\b"')
+
+        self.assertEqual(quote.name, 'a"b')
+        self.assertEqual(backslash.name, "a\\b")
+
+    def test_nil_delimiter(self) -> None:
+        """NIL分隔符解析为None，而不是字符串 "NIL"。"""
+        info = ImapResponseParser.parse_list_line("(\\Noselect) NIL INBOX")
+
+        self.assertIsNone(info.delimiter)
+        self.assertEqual(info.name, "INBOX")
+
+    def test_unparseable_line(self) -> None:
+        """非LIST格式的行返回None。"""
+        self.assertIsNone(ImapResponseParser.parse_list_line("LIST completed"))
+
+    def test_literal_name(self) -> None:
+        """literal形式的名称取自下一行，结束行被忽略。"""
+        lines = [
+            b'(\\HasNoChildren) "/" {6}',
+            bytearray(b'a"b/cd'),
+            b'() "/" "INBOX"',
+            b"LIST completed",
+        ]
+
+        mailboxes = ImapResponseParser.parse_list_response(lines)
+
+        self.assertEqual([m.name for m in mailboxes], ['a"b/cd', "INBOX"])
+        self.assertEqual(mailboxes[0].attributes, "\\HasNoChildren")
+
+    def test_quoted_name_looking_like_literal(self) -> None:
+        """带引号的 "{3}" 是普通名称，不会吞掉下一行。"""
+        lines = [b'() "/" "{3}"', b'() "/" "INBOX"']
+
+        mailboxes = ImapResponseParser.parse_list_response(lines)
+
+        self.assertEqual([m.name for m in mailboxes], ["{3}", "INBOX"])
@@ -0,0 +1,304 @@
+"""IMAP UID分页与增量同步游标的单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional
+
+from app.core.database import DatabaseManager
+from app.crud.email_account_crud import EmailAccountCrud
+from app.crud.email_sync_crud import EmailSyncCrud
+from app.crud.mailbox_crud import MailboxCrud
+from app.crud.user_crud import UserCrud
+from app.entities.email_account_entity import EmailType
+from app.services.mailbox_sync_service import MailboxSyncService
+from app.utils.crypto.password_encryptor import PasswordEncryptor
+from app.utils.imap.imap_models import MailboxInfo, MailboxStatus
+from app.utils.imap.providers import ProviderFactory
+from app.utils.logging.logger_factory import LoggerFactory
+from app.utils.password_hasher import PasswordHasher
+
+try:
+    from app.utils.imap.imap_client import ImapClient
+except ModuleNotFoundError:
+    ImapClient = None
+
+
+class FakeUidServer:
+    """按UID FETCH语义返回响应的假IMAP服务器。"""
+
+    def __init__(self, uids: List[int]) -> None:
+        self.uids = sorted(uids)
+        self.commands: List[str] = []
+
+    async def uid_command(self, command: str, *args):
+        """模拟 ImapClient._uid_command 的 UID FETCH start:end (UID)。"""
+        uid_set = args[0]
+        self.commands.append(f"{command} {uid_set}")
+        low_text, high_text = uid_set.split(":")
+        low = int(low_text)
+        if high_text == "*":
+            matched = [uid for uid in self.uids if uid >= low]
+            # RFC 3501：n:* 在n大于最大UID时仍匹配最后一封邮件
+            if not matched and self.uids:
+                matched = [self.uids[-1]]
+        else:
+            high = int(high_text)
+            matched = [uid for uid in self.uids if low <= uid <= high]
+        lines = [
+            f"{self.uids.index(uid) + 1} FETCH (UID {uid})".encode()
+            for uid in matched
+        ]
+        lines.append(b"FETCH completed")
+        return SimpleNamespace(result="OK", lines=lines)
+
+
+@unittest.skipIf(ImapClient is None, "aioimaplib未安装，跳过IMAP客户端测试")
+class ImapUidPagingTest(unittest.IsolatedAsyncioTestCase):
+    """iter_uids_since 分页查询测试用例。"""
+
+    def _make_client(self, server: FakeUidServer) -> "ImapClient":
+        client = ImapClient(provider=ProviderFactory.get_provider(EmailType.QQ))
+        client._client = object()
+        client._uid_command = server.uid_command
+        return client
+
+    async def _collect(
+        self,
+        client: "ImapClient",
+        start_uid: int,
+        status: MailboxStatus,
+        page_size: int,
+    ) -> List[List[int]]:
+        return [
+            page
+            async for page in client.iter_uids_since(
+                start_uid, status=status, page_size=page_size
+            )
+        ]
+
+    async def test_sparse_uids_are_paged_in_order(self) -> None:
+        """UID稀疏分布时逐页取回全部UID，且不重复、不遗漏。"""
+        uids = [1, 2, 3, 50, 400, 401, 402, 2000, 2001, 9000, 9001, 9002, 9999]
+        server = FakeUidServer(uids)
+        client = self._make_client(server)
+
+        pages = await self._collect(
+            client, 2, MailboxStatus(1, 10000, len(uids)), page_size=3
+        )
+
+        self.assertTrue(all(pages))
+        flattened = [uid for page in pages for uid in page]
+        self.assertEqual(flattened, [uid for uid in uids if uid >= 2])
+        self.assertGreater(len(server.commands), 1)
+        self.assertTrue(server.commands[-1].endswith(":*"))
+
+    async def test_no_new_mail_ignores_echoed_last_uid(self) -> None:
+        """没有新邮件时服务器对 n:* 回显最后一封，不应产出任何UID。"""
+        server = FakeUidServer(list(range(1, 51)))
+        client = self._make_client(server)
+
+        pages = await self._collect(
+            client, 51, MailboxStatus(1, 51, 50), page_size=10
+        )
+
+        self.assertEqual(pages, [])
+        self.assertEqual(server.commands, ["FETCH 51:*"])
+
+    async def test_no_new_mail_with_gap_before_uidnext(self) -> None:
+        """UIDNEXT因删信领先于最大UID时，分页的最后一页同样过滤回显。"""
+        server = FakeUidServer(list(range(1, 51)))
+        client = self._make_client(server)
+
+        pages = await self._collect(
+            client, 51, MailboxStatus(1, 200, 50), page_size=10
+        )
+
+        self.assertEqual(pages, [])
+        self.assertTrue(server.commands[-1].endswith(":*"))
+
+
+class FakeSyncImapClient:
+    """记录调用情况的假IMAP客户端，供同步流程测试使用。"""
+
+    def __init__(
+        self,
+        status: MailboxStatus,
+        uids: Optional[List[int]] = None,
+        mailbox_name: str = "INBOX",
+    ):
+        self.status = status
+        self.uids = uids or []
+        self.mailbox_name = mailbox_name
+        self.selected: List[str] = []
+        self.fetched: List[List[int]] = []
+
+    async def list_mailboxes(self) -> List[MailboxInfo]:
+        return [MailboxInfo(name=self.mailbox_name, delimiter="/", attributes=None)]
+
+    async def get_mailbox_status(self, mailbox_name: str) -> MailboxStatus:
+        return self.status
+
+    async def select_mailbox(self, mailbox_name: str) -> bool:
+        self.selected.append(mailbox_name)
+        return True
+
+    async def iter_uids_since(self, start_uid, status=None):
+        uids = [uid for uid in self.uids if uid >= start_uid]
+        if uids:
+            yield uids
+
+    async def fetch_latest_uids(self, count: int) -> List[int]:
+        return self.uids[-count:]
+
+    async def fetch_emails_by_uid(self, uids: List[int]):
+        self.fetched.append(list(uids))
+        return []
+
+
+class FakeDetectionService:
+    """记录后台检测请求的假钓鱼检测服务。"""
+
+    def __init__(self) -> None:
+        self.requests: List[List[int]] = []
+
+    async def detect_emails_async(self, email_ids: List[int]) -> None:
+        self.requests.append(list(email_ids))
+
+
+class MailboxSyncCursorTest(unittest.IsolatedAsyncioTestCase):
+    """文件夹增量同步游标测试用例。"""
+
+    async def asyncSetUp(self) -> None:
+        """初始化测试数据库与依赖。"""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(self._temp_dir.name) / "test.db"
+        test_db_url = os.getenv("TEST_DATABASE_URL")
+        db_url = test_db_url or f"sqlite+aiosqlite:///{db_path}"
+
+        try:
+            self._db_manager = DatabaseManager(db_url)
+        except ModuleNotFoundError:
+            self._temp_dir.cleanup()
+            self.skipTest("数据库驱动未安装，跳过数据库集成测试")
+            return
+
+        try:
+            await asyncio.wait_for(self._db_manager.create_tables(), timeout=5)
+        except asyncio.TimeoutError:
+            await self._db_manager.close()
+            self._temp_dir.cleanup()
+            self.skipTest("数据库连接超时，跳过数据库集成测试")
+
+        logger_factory = LoggerFactory()
+        user_crud = UserCrud(
+            self._db_manager,
+            PasswordHasher(),
+            logger_factory.create_crud_logger("test.user", "用户"),
+        )
+        email_account_crud = EmailAccountCrud(
+            self._db_manager,
+            PasswordEncryptor(),
+            logger_factory.create_crud_logger("test.account", "邮箱账户"),
+        )
+        self._mailbox_crud = MailboxCrud(
+            self._db_manager,
+            logger_factory.create_crud_logger("test.mailbox", "邮箱文件夹"),
+        )
+        email_sync_crud = EmailSyncCrud(
+            self._db_manager,
+            logger_factory.create_crud_logger("test.sync", "邮件同步"),
+        )
+        self._detection = FakeDetectionService()
+        self._sync_service = MailboxSyncService(
+            email_account_crud,
+            self._mailbox_crud,
+            email_sync_crud,
+            self._detection,
+            logging.getLogger("test.mailbox_sync"),
+        )
+
+        user = await user_crud.create(
+            student_id="2023001",
+            password="test-pass",
+            display_name="测试用户",
+        )
+        self._account = await email_account_crud.create(
+            user_id=user.id,
+            email_address="test@example.com",
+            email_type=EmailType.QQ,
+            auth_password="secret",
+            imap_host="imap.qq.com",
+            smtp_host="smtp.qq.com",
+        )
+        self._mailbox, _ = await self._mailbox_crud.upsert_mailbox(
+            account_id=self._account.id,
+            name="INBOX",
+            delimiter="/",
+            attributes=None,
+            uid_validity=100,
+        )
+        await self._mailbox_crud.update_sync_state(self._mailbox.id, 50)
+
+    async def asyncTearDown(self) -> None:
+        """释放资源。"""
+        await self._db_manager.close()
+        self._temp_dir.cleanup()
+
+    async def test_uidnext_at_cursor_skips_select(self) -> None:
+        """UIDNEXT未超过游标时跳过SELECT与UID查询，游标保持不变。"""
+        client = FakeSyncImapClient(MailboxStatus(100, 51, 50), uids=[50])
+
+        response = await self._sync_service.sync_mailboxes(client, self._account.id)
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.synced_count, 0)
+        self.assertEqual(client.selected, [])
+        self.assertEqual(client.fetched, [])
+        mailbox = await self._mailbox_crud.get_by_account_and_name(
+            self._account.id, "INBOX"
+        )
+        self.assertEqual(mailbox.last_uid, 50)
+
+    async def test_uidnext_ahead_of_cursor_fetches_new_uids(self) -> None:
+        """UIDNEXT领先于游标时选中文件夹，只抓取游标之后的UID。"""
+        client = FakeSyncImapClient(MailboxStatus(100, 53, 52), uids=[49, 50, 51, 52])
+
+        await self._sync_service.sync_mailboxes(client, self._account.id)
+
+        self.assertEqual(client.selected, ["INBOX"])
+        self.assertEqual(client.fetched, [[51, 52]])
+        self.assertEqual(self._detection.requests, [])
+
+    async def test_legacy_escaped_name_is_renamed(self) -> None:
+        """旧版解析保存的转义名称被迁移为实际名称，保留原有游标。"""
+        legacy, _ = await self._mailbox_crud.upsert_mailbox(
+            account_id=self._account.id,
+            name='a\\"b',
+            delimiter="/",
+            attributes=None,
+            uid_validity=100,
+        )
+        await self._mailbox_crud.update_sync_state(legacy.id, 7)
+        client = FakeSyncImapClient(
+            MailboxStatus(100, 8, 7), uids=[7], mailbox_name='a"b'
+        )
+
+        await self._sync_service.sync_mailboxes(client, self._account.id)
+
+        mailbox = await self._mailbox_crud.get_by_account_and_name(
+            self._account.id, 'a"b'
+        )
+        self.assertEqual(mailbox.id, legacy.id)
+        self.assertEqual(mailbox.last_uid, 7)
+        self.assertIsNone(
+            await self._mailbox_crud.get_by_account_and_name(
+                self._account.id, 'a\\"b'
+            )
+        )
@@ -0,0 +1,115 @@
+"""钓鱼检测事件推送服务的单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from app.services.phishing_event_service import PhishingEventService
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    """取出队列中的全部消息。"""
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+class PhishingEventCoalescingTest(unittest.IsolatedAsyncioTestCase):
+    """检测结果更新事件合并推送测试用例。"""
+
+    async def test_updates_in_one_window_arrive_as_one_message(self) -> None:
+        """合并间隔内的多条更新合并为一条队列消息，每条事件仍是独立的SSE帧。"""
+        service = PhishingEventService(flush_interval=0.01)
+        queue = await service.register(1)
+
+        for email_id in range(3):
+            await service.publish_detection_update(1, {"email_id": email_id})
+        self.assertTrue(queue.empty())
+
+        message = await asyncio.wait_for(queue.get(), timeout=1)
+
+        self.assertTrue(queue.empty())
+        self.assertEqual(message.count("event: phishing_update\n"), 3)
+        self.assertLess(message.index('"email_id":0'), message.index('"email_id":2'))
+
+    async def test_updates_are_grouped_per_user(self) -> None:
+        """不同用户的更新分别推送，互不混入。"""
+        service = PhishingEventService(flush_interval=0.01)
+        first = await service.register(1)
+        second = await service.register(2)
+
+        await service.publish_detection_update(1, {"email_id": 10})
+        await service.publish_detection_update(2, {"email_id": 20})
+        await asyncio.sleep(0.05)
+
+        first_messages = _drain(first)
+        self.assertEqual(len(first_messages), 1)
+        self.assertIn('"email_id":10', first_messages[0])
+        self.assertNotIn('"email_id":20', first_messages[0])
+        self.assertEqual(len(_drain(second)), 1)
+
+    async def test_batch_completed_flushes_pending_updates_first(self) -> None:
+        """批量完成事件推送前先下发缓冲中的更新，完成事件排在最后。"""
+        service = PhishingEventService(flush_interval=60)
+        first = await service.register(1)
+        second = await service.register(2)
+
+        await service.publish_detection_update(1, {"email_id": 1})
+        await service.publish_detection_update(2, {"email_id": 2})
+        await service.publish_batch_completed_many([1, 2], {"total": 2})
+
+        for queue in (first, second):
+            messages = _drain(queue)
+            self.assertEqual(len(messages), 2)
+            self.assertTrue(messages[0].startswith("event: phishing_update\n"))
+            self.assertTrue(
+                messages[1].startswith("event: phishing_batch_completed\n")
+            )
+
+    async def test_timer_after_early_flush_sends_nothing_twice(self) -> None:
+        """完成事件提前下发后，定时器到期不会重复推送同一批更新。"""
+        service = PhishingEventService(flush_interval=0.01)
+        queue = await service.register(1)
+
+        await service.publish_detection_update(1, {"email_id": 1})
+        await service.publish_batch_completed(1, {"total": 1})
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(_drain(queue)), 2)
+
+    async def test_unregister_with_pending_updates(self) -> None:
+        """缓冲期间注销连接是安全的，已注销的队列不再收到消息。"""
+        service = PhishingEventService(flush_interval=0.01)
+        kept = await service.register(1)
+        removed = await service.register(1)
+        gone = await service.register(2)
+
+        await service.publish_detection_update(1, {"email_id": 1})
+        await service.publish_detection_update(2, {"email_id": 2})
+        await service.unregister(1, removed)
+        await service.unregister(2, gone)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(_drain(kept)), 1)
+        self.assertTrue(removed.empty())
+        self.assertTrue(gone.empty())
+
+    async def test_unregister_concurrent_with_publish(self) -> None:
+        """注销与批量推送并发执行时不抛出异常。"""
+        service = PhishingEventService(flush_interval=0.01)
+        queues = [await service.register(user_id) for user_id in range(20)]
+
+        for user_id in range(20):
+            await service.publish_detection_update(user_id, {"email_id": user_id})
+        await asyncio.gather(
+            service.publish_batch_completed_many(range(20), {"total": 20}),
+            *(
+                service.unregister(user_id, queue)
+                for user_id, queue in enumerate(queues)
+            ),
+        )
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(service._connections, {})
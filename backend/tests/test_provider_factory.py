@@ -0,0 +1,48 @@
+"""邮箱服务商工厂的单元测试。"""
+
+from __future__ import annotations
+
+import unittest
+
+from app.utils.imap.providers.default_provider import (
+    DefaultEmailProvider,
+    SchoolEmailProvider,
+)
+from app.utils.imap.providers.netease_provider import Netease126Provider
+from app.utils.imap.providers.provider_factory import ProviderFactory
+from app.utils.imap.providers.qq_provider import QQEmailProvider
+
+
+class GetProviderByEmailTest(unittest.TestCase):
+    """按邮箱地址识别服务商的测试用例。"""
+
+    def _assert_provider(self, email_address: str, expected: type) -> None:
+        provider = ProviderFactory.get_provider_by_email(email_address)
+        self.assertIs(type(provider), expected, email_address)
+
+    def test_exact_domain(self) -> None:
+        """已注册域名精确命中，域名大小写不敏感。"""
+        self._assert_provider("user@qq.com", QQEmailProvider)
+        self._assert_provider("User@QQ.COM", QQEmailProvider)
+        self._assert_provider("user@126.com", Netease126Provider)
+
+    def test_subdomain(self) -> None:
+        """已注册域名的子域名按后缀命中。"""
+        self._assert_provider("user@vip.qq.com", QQEmailProvider)
+        self._assert_provider("user@stu.hhstu.edu.cn", SchoolEmailProvider)
+
+    def test_lookalike_domain_is_not_matched(self) -> None:
+        """后缀按标签匹配，evilqq.com 与 qq.com.evil.com 不会识别为QQ邮箱。"""
+        self._assert_provider("user@evilqq.com", DefaultEmailProvider)
+        self._assert_provider("user@qq.com.evil.com", DefaultEmailProvider)
+        self._assert_provider("user@notqq.com", DefaultEmailProvider)
+
+    def test_last_at_sign_is_used(self) -> None:
+        """按最后一个@分割，本地部分中的域名不参与识别。"""
+        self._assert_provider('"qq.com@x"@evil.com', DefaultEmailProvider)
+        self._assert_provider("evil.com@qq.com", QQEmailProvider)
+
+    def test_invalid_address(self) -> None:
+        """不含@或域名为空时返回默认提供者。"""
+        self._assert_provider("qq.com", DefaultEmailProvider)
+        self._assert_provider("user@", DefaultEmailProvider)
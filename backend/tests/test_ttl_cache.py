@@ -0,0 +1,48 @@
+"""带过期时间的LRU缓存的单元测试。"""
+
+from __future__ import annotations
+
+import unittest
+
+from app.utils.ttl_cache import TtlLruCache
+
+
+class TtlLruCacheCostTest(unittest.TestCase):
+    """按条目开销限制缓存大小的测试用例。"""
+
+    def setUp(self) -> None:
+        """初始化总开销上限为10的缓存。"""
+        self._cache: TtlLruCache[str] = TtlLruCache(
+            maxsize=100, ttl=60, max_cost=10, cost=len
+        )
+
+    def test_evicts_least_recently_used_when_cost_exceeded(self) -> None:
+        """总开销超限时淘汰最久未使用的条目。"""
+        self._cache.set("a", "xxxx")
+        self._cache.set("b", "xxxx")
+        self._cache.get("a")
+        self._cache.set("c", "xxxx")
+
+        self.assertIn("a", self._cache)
+        self.assertNotIn("b", self._cache)
+        self.assertIn("c", self._cache)
+
+    def test_rejects_entry_larger_than_limit(self) -> None:
+        """单个条目超过总开销上限时不写入，也不挤掉已有条目。"""
+        self._cache.set("a", "xxxx")
+        self._cache.set("big", "x" * 11)
+
+        self.assertNotIn("big", self._cache)
+        self.assertIn("a", self._cache)
+
+    def test_overwrite_and_pop_release_cost(self) -> None:
+        """覆盖与删除条目后释放其占用的开销。"""
+        self._cache.set("a", "x" * 8)
+        self._cache.set("a", "xx")
+        self._cache.set("b", "x" * 8)
+        self.assertIn("a", self._cache)
+
+        self._cache.pop("b")
+        self._cache.set("c", "x" * 8)
+        self.assertIn("a", self._cache)
+        self.assertIn("c", self._cache)